@@ -0,0 +1,40 @@
+import hashlib
+from datetime import datetime
+from typing import Callable, Optional
+
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
+
+from .services.table_version_service import get_table_version
+
+
+def table_version_condition(*table_names: str) -> Callable:
+    """
+    Decorator adding ETag/Last-Modified support to a list view backed by the given tables.
+
+    Validators are derived from the trigger-maintained table versions, so a matching
+    conditional request gets a 304 before the queryset or serializer runs.
+
+    Usage:
+        @method_decorator(table_version_condition('species'), name='get')
+        class SpeciesListView(generics.ListAPIView):
+            ...
+    """
+    def etag_func(request, *args, **kwargs) -> str:
+        versions = ','.join(
+            f"{table_name}:{get_table_version(table_name).version}"
+            for table_name in table_names
+        )
+        # The same URL can render differently per query string and Accept header
+        fingerprint = f"{versions}|{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+        return quote_etag(hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+
+    def last_modified_func(request, *args, **kwargs) -> Optional[datetime]:
+        timestamps = [
+            get_table_version(table_name).updated_at
+            for table_name in table_names
+        ]
+        timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+        return max(timestamps) if timestamps else None
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
@@ -0,0 +1,179 @@
+import decimal
+from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .serializers import CachedReferenceField
+
+# Fields whose representation of a database value is the value itself
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+# Fields whose to_representation is self-contained and can be called on raw column values
+CONVERTED_FIELDS = (
+    serializers.DateTimeField,
+    serializers.DateField,
+    serializers.FloatField,
+    serializers.UUIDField,
+)
+
+
+class ReferenceMemo(dict):
+    """Per-page memo of cached reference representations, filled on first use of each id."""
+
+    def __init__(self, cache, serializer_class):
+        super().__init__()
+        self.cache = cache
+        self.serializer_class = serializer_class
+
+    def __missing__(self, pk):
+        representation = self[pk] = self.cache.representation(pk, self.serializer_class)
+        return representation
+
+
+class RowMapper:
+    """
+    Rows-to-dicts mapping built from a serializer's read contract.
+
+    `columns` are the names to pass to `QuerySet.values()`; `map_rows` turns
+    those rows into the same dicts `serializer.data` would, without
+    instantiating serializers or walking serializer fields per row.
+    Each of `fields` is (key, column, converter), the converter being None
+    for identity, a callable, or a (cache, serializer) reference.
+    """
+
+    def __init__(self, columns: Tuple[str, ...], fields: Tuple[Tuple[str, str, Optional[object]], ...]):
+        self.columns = columns
+        self.fields = fields
+
+    def map_rows(self, rows) -> List[dict]:
+        getters = []
+        for key, column, converter in self.fields:
+            if isinstance(converter, tuple):
+                converter = ReferenceMemo(*converter).__getitem__
+            getters.append((key, itemgetter(column), converter))
+
+        def map_row(row):
+            item = {}
+            for key, get, convert in getters:
+                value = get(row)
+                item[key] = value if value is None or convert is None else convert(value)
+            return item
+
+        return [map_row(row) for row in rows]
+
+
+def _decimal_converter(field: serializers.DecimalField) -> Callable:
+    """
+    Prebuilt equivalent of DecimalField.to_representation for the common
+    string-coerced case, with the quantize context built once instead of per value.
+    """
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.decimal_places is None:
+        return field.to_representation
+
+    quantum = Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def to_representation(value):
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(quantum, rounding=rounding, context=context))
+
+    return to_representation
+
+
+def _column_and_converter(field_name: str, field: serializers.Field) -> Tuple[str, Optional[object]]:
+    """
+    Work out the values() column and how to convert its value for one field:
+    None for identity, a (cache, serializer) reference, or a callable.
+    """
+    column = field.source.replace('.', '__')
+    if isinstance(field, CachedReferenceField):
+        return f'{column}_id', (field.cache, field.serializer_class)
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return f'{column}_id', None
+    if isinstance(field, serializers.DecimalField):
+        return column, _decimal_converter(field)
+    if isinstance(field, CONVERTED_FIELDS):
+        return column, field.to_representation
+    if isinstance(field, IDENTITY_FIELDS):
+        return column, None
+    raise ImproperlyConfigured(
+        f"Field '{field_name}' ({type(field).__name__}) is not supported by the fast read path"
+    )
+
+
+@lru_cache(maxsize=64)
+def build_row_mapper(serializer_class, fields: Optional[Tuple[str, ...]] = None) -> RowMapper:
+    """
+    Build a RowMapper for a serializer, optionally limited to a sparse fieldset.
+
+    Args:
+        serializer_class: Read serializer whose output must be reproduced
+        fields: Field names to keep (None for all), in any order
+
+    Returns:
+        RowMapper producing keys in the serializer's field order
+
+    Raises:
+        ImproperlyConfigured: If the serializer has a field the fast path cannot reproduce
+    """
+    context = {'fields': list(fields)} if fields is not None else {}
+    serializer = serializer_class(context=context)
+
+    columns: List[str] = []
+    mapped_fields = []
+    for field_name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        column, converter = _column_and_converter(field_name, field)
+        if column not in columns:
+            columns.append(column)
+        mapped_fields.append((field_name, column, converter))
+    return RowMapper(tuple(columns), tuple(mapped_fields))
+
+
+class FastListMixin:
+    """
+    List action that builds the response from `queryset.values()` rows through
+    a RowMapper instead of a ModelSerializer. The JSON is identical to
+    the serializer's; disable with FAST_READ_PATH = False to compare.
+    """
+
+    def get_list_serializer_class(self):
+        return self.get_serializer_class()
+
+    def get_list_fields(self) -> Optional[Sequence[str]]:
+        return self.get_serializer_context().get('fields')
+
+    def get_list_response(self, data: List[dict], paginated: bool) -> Response:
+        return self.get_paginated_response(data) if paginated else Response(data)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not settings.FAST_READ_PATH:
+            page = self.paginate_queryset(queryset)
+            serializer = self.get_list_serializer_class()(
+                queryset if page is None else page, many=True, context=self.get_serializer_context()
+            )
+            return self.get_list_response(serializer.data, paginated=page is not None)
+
+        fields = self.get_list_fields()
+        mapper = build_row_mapper(self.get_list_serializer_class(), None if fields is None else tuple(sorted(fields)))
+        # Cursor pagination reads its position from the ordering keys of the last row
+        ordering_keys = [key.lstrip('-') for key in getattr(self, 'cursor_ordering', None) or ()]
+        columns = [*mapper.columns, *(key for key in ordering_keys if key not in mapper.columns)]
+
+        rows = queryset.values(*columns)
+        page = self.paginate_queryset(rows)
+        data = mapper.map_rows(rows if page is None else page)
+        return self.get_list_response(data, paginated=page is not None)
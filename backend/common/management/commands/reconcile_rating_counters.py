@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from common.models import RatedContentModel, Rating
+
+
+def rating_count(model, rating: str) -> Coalesce:
+    """Number of `rating` ratings of each row of `model`, as an expression over OuterRef('pk')."""
+    counts = (
+        Rating.objects
+        .filter(content_type=ContentType.objects.get_for_model(model), object_id=OuterRef('pk'), rating=rating)
+        .order_by()
+        .values('object_id')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the rating_up/rating_down counters of rated content from the Rating table "
+        "and fix rows whose counters drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drifted rows without fixing them")
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not issubclass(model, RatedContentModel):
+                continue
+            expected = {'rating_up': rating_count(model, 'up'), 'rating_down': rating_count(model, 'down')}
+            drifted = (
+                model.objects
+                .annotate(expected_up=expected['rating_up'], expected_down=expected['rating_down'])
+                .exclude(rating_up=F('expected_up'), rating_down=F('expected_down'))
+            )
+            if options['dry_run']:
+                count = drifted.count()
+            else:
+                count = drifted.update(**expected)
+            self.stdout.write(
+                f"{model._meta.label}: {count} row(s) {'drifted' if options['dry_run'] else 'reconciled'}"
+            )
@@ -0,0 +1,41 @@
+import logging
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from common.models import RatedContentModel
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate fresh variants of cached AI results queued for regeneration because "
+        "their down-vote ratio crossed AI_RESULT_REGENERATE_DOWN_RATIO."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help="Maximum number of results to regenerate per model")
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not issubclass(model, RatedContentModel):
+                continue
+            queued = (
+                model.objects
+                .filter(regeneration_requested_at__isnull=False)
+                .order_by('regeneration_requested_at')[:options['limit']]
+            )
+            regenerated = failed = 0
+            for result in queued:
+                try:
+                    variant = result.regenerate()
+                except Exception as exc:
+                    # Stays queued for the next run
+                    logger.error("Regenerating %s %s failed: %s", model._meta.label, result.pk, exc)
+                    failed += 1
+                    continue
+                model.objects.filter(pk=result.pk).update(regeneration_requested_at=None)
+                logger.info("Regenerated %s %s as %s", model._meta.label, result.pk, variant.pk)
+                regenerated += 1
+            self.stdout.write(f"{model._meta.label}: {regenerated} regenerated, {failed} failed")
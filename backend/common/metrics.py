@@ -1,7 +1,7 @@
 import time
 import logging
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Optional
 from django.db import connection
 
 logger = logging.getLogger(__name__)
@@ -19,10 +19,11 @@ class MetricsCollector:
         self.start_time = time.perf_counter()
         self.query_count_start = len(connection.queries)
     
-    def collect_metrics(self, view_name: str, status_code: int) -> dict:
+    def collect_metrics(self, view_name: str, status_code: int, extra: Optional[Dict[str, Any]] = None) -> dict:
         """
         Collect metrics for the current request.
-        Returns a dictionary containing various performance metrics.
+        Returns a dictionary containing various performance metrics,
+        plus any view-specific `extra` metrics.
         """
         if not self.start_time:
             logger.warning("Metrics tracking was not started")
@@ -53,16 +54,25 @@ class MetricsCollector:
             "Query Time: %(query_time).3fs",
             metrics
         )
+        if extra:
+            metrics.update(extra)
+            logger.info(
+                "API Metrics - View: %s, %s",
+                view_name,
+                ", ".join(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}"
+                          for name, value in extra.items())
+            )
 
         return metrics
 
 
-def track_metrics(view_name: str) -> Callable:
+def track_metrics(view_name: str, extra_metrics: Optional[Callable[[], Dict[str, Any]]] = None) -> Callable:
     """
     Decorator for tracking metrics of API views.
     
     Args:
         view_name: Name of the view for identification in metrics
+        extra_metrics: Optional callable returning view-specific metrics to add
     
     Usage:
         @api_view(['GET'])
@@ -80,7 +90,8 @@ def track_metrics(view_name: str) -> Callable:
             
             collector.collect_metrics(
                 view_name=view_name,
-                status_code=response.status_code
+                status_code=response.status_code,
+                extra=extra_metrics() if extra_metrics else None
             )
             
             return response
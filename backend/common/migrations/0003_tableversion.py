@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+BUMP_TABLE_VERSION_SQL = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_version (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name) DO UPDATE
+        SET version = table_version.version + 1,
+            updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_BUMP_TABLE_VERSION_SQL = "DROP FUNCTION IF EXISTS bump_table_version();"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableVersion",
+            fields=[
+                (
+                    "table_name",
+                    models.CharField(max_length=63, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Table Version",
+                "verbose_name_plural": "Table Versions",
+                "db_table": "table_version",
+            },
+        ),
+        migrations.RunSQL(BUMP_TABLE_VERSION_SQL, DROP_BUMP_TABLE_VERSION_SQL),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0003_tableversion"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TRIGGER species_table_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON species
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+            """,
+            "DROP TRIGGER IF EXISTS species_table_version ON species;",
+        ),
+        migrations.RunSQL(
+            """
+            CREATE TRIGGER unit_table_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON unit
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+            """,
+            "DROP TRIGGER IF EXISTS unit_table_version ON unit;",
+        ),
+    ]
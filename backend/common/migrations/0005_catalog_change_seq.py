@@ -0,0 +1,107 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:25
+
+from django.db import migrations, models
+import django.utils.timezone
+
+CATALOG_CHANGE_SEQ_SQL = """
+CREATE SEQUENCE IF NOT EXISTS catalog_change_seq;
+
+CREATE OR REPLACE FUNCTION assign_catalog_change_seq() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := nextval('catalog_change_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_catalog_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO catalog_tombstone (table_name, object_id, change_seq, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, nextval('catalog_change_seq'), now());
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_CATALOG_CHANGE_SEQ_SQL = """
+DROP FUNCTION IF EXISTS record_catalog_tombstone();
+DROP FUNCTION IF EXISTS assign_catalog_change_seq();
+DROP SEQUENCE IF EXISTS catalog_change_seq;
+"""
+
+
+def catalog_triggers_sql(table_name: str) -> str:
+    # Existing rows are numbered by the new trigger through the final no-op update
+    return f"""
+    CREATE TRIGGER {table_name}_change_seq
+    BEFORE INSERT OR UPDATE ON {table_name}
+    FOR EACH ROW EXECUTE FUNCTION assign_catalog_change_seq();
+
+    CREATE TRIGGER {table_name}_tombstone
+    AFTER DELETE ON {table_name}
+    FOR EACH ROW EXECUTE FUNCTION record_catalog_tombstone();
+
+    UPDATE {table_name} SET change_seq = 0;
+    """
+
+
+def drop_catalog_triggers_sql(table_name: str) -> str:
+    return f"""
+    DROP TRIGGER IF EXISTS {table_name}_tombstone ON {table_name};
+    DROP TRIGGER IF EXISTS {table_name}_change_seq ON {table_name};
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0004_species_unit_table_version_triggers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table_name", models.CharField(max_length=63)),
+                ("object_id", models.BigIntegerField()),
+                ("change_seq", models.BigIntegerField(db_index=True)),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Catalog Tombstone",
+                "verbose_name_plural": "Catalog Tombstones",
+                "db_table": "catalog_tombstone",
+            },
+        ),
+        migrations.AddField(
+            model_name="species",
+            name="change_seq",
+            field=models.BigIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Catalog change sequence, assigned by a database trigger on every write",
+            ),
+        ),
+        migrations.AddField(
+            model_name="unit",
+            name="change_seq",
+            field=models.BigIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Catalog change sequence, assigned by a database trigger on every write",
+            ),
+        ),
+        migrations.RunSQL(CATALOG_CHANGE_SEQ_SQL, DROP_CATALOG_CHANGE_SEQ_SQL),
+        migrations.RunSQL(catalog_triggers_sql("species"), drop_catalog_triggers_sql("species")),
+        migrations.RunSQL(catalog_triggers_sql("unit"), drop_catalog_triggers_sql("unit")),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:31
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# Snapshot of the factors hard-coded in UnitConversionService at the time of this migration
+UNIT_DIMENSIONS = {
+    "mass": {
+        "ng": Decimal("0.000000001"),
+        "μg": Decimal("0.000001"),
+        "mg": Decimal("0.001"),
+        "g": Decimal("1"),
+        "kg": Decimal("1000"),
+    },
+    "volume": {
+        "μl": Decimal("0.000001"),
+        "ml": Decimal("0.001"),
+        "l": Decimal("1"),
+    },
+    "concentration": {
+        "ng/ml": Decimal("0.001"),
+        "μg/ml": Decimal("1"),
+        "mg/ml": Decimal("1000"),
+        "g/ml": Decimal("1000000"),
+    },
+}
+
+
+def populate_unit_dimensions(apps, schema_editor):
+    Unit = apps.get_model("common", "Unit")
+    factors = {
+        short_name.lower(): (dimension, factor)
+        for dimension, units in UNIT_DIMENSIONS.items()
+        for short_name, factor in units.items()
+    }
+    for unit in Unit.objects.filter(dimension__isnull=True):
+        if unit.short_name.lower() in factors:
+            unit.dimension, unit.base_factor = factors[unit.short_name.lower()]
+            unit.save(update_fields=["dimension", "base_factor"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0005_catalog_change_seq"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="unit",
+            name="base_factor",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=12,
+                help_text="Size of the unit in its dimension's base unit (g, l or μg/ml)",
+                max_digits=24,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="unit",
+            name="dimension",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("mass", "Mass"),
+                    ("volume", "Volume"),
+                    ("concentration", "Concentration"),
+                ],
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_unit_dimensions, migrations.RunPython.noop),
+    ]
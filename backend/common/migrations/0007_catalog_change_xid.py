@@ -0,0 +1,109 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+# Catalog rows and tombstones record the id of the transaction that wrote them
+# instead of a sequence value. A sequence value is taken when the row is written
+# but only becomes visible at commit, so a sync could report a version above a
+# transaction that was still open and never send its rows. Transaction ids let a
+# sync report the oldest transaction still in flight instead (see
+# drugs.services.catalog_sync_service). drugs 0007 moves the drug table across and
+# drops the sequence.
+CATALOG_CHANGE_XID_SQL = """
+CREATE FUNCTION assign_catalog_change_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_catalog_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO catalog_tombstone (table_name, object_id, change_xid, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, pg_current_xact_id()::text::bigint, now());
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+UPDATE catalog_tombstone SET change_xid = pg_current_xact_id()::text::bigint;
+"""
+
+REVERSE_CATALOG_CHANGE_XID_SQL = """
+CREATE OR REPLACE FUNCTION record_catalog_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO catalog_tombstone (table_name, object_id, change_seq, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, nextval('catalog_change_seq'), now());
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP FUNCTION assign_catalog_change_xid();
+"""
+
+
+def change_xid_trigger_sql(table_name: str) -> str:
+    # Existing rows take the migration's transaction id through the final no-op update
+    return f"""
+    DROP TRIGGER {table_name}_change_seq ON {table_name};
+    CREATE TRIGGER {table_name}_change_xid
+    BEFORE INSERT OR UPDATE ON {table_name}
+    FOR EACH ROW EXECUTE FUNCTION assign_catalog_change_xid();
+
+    UPDATE {table_name} SET change_xid = 0;
+    """
+
+
+def reverse_change_xid_trigger_sql(table_name: str) -> str:
+    return f"""
+    DROP TRIGGER {table_name}_change_xid ON {table_name};
+    CREATE TRIGGER {table_name}_change_seq
+    BEFORE INSERT OR UPDATE ON {table_name}
+    FOR EACH ROW EXECUTE FUNCTION assign_catalog_change_seq();
+    """
+
+
+def change_xid_field():
+    return models.BigIntegerField(
+        db_index=True,
+        default=0,
+        editable=False,
+        help_text="Id of the transaction that last wrote the row, assigned by a database trigger",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0006_unit_dimension"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="catalogtombstone",
+            old_name="change_seq",
+            new_name="change_xid",
+        ),
+        migrations.RenameField(
+            model_name="species",
+            old_name="change_seq",
+            new_name="change_xid",
+        ),
+        migrations.AlterField(
+            model_name="species",
+            name="change_xid",
+            field=change_xid_field(),
+        ),
+        migrations.RenameField(
+            model_name="unit",
+            old_name="change_seq",
+            new_name="change_xid",
+        ),
+        migrations.AlterField(
+            model_name="unit",
+            name="change_xid",
+            field=change_xid_field(),
+        ),
+        migrations.RunSQL(CATALOG_CHANGE_XID_SQL, REVERSE_CATALOG_CHANGE_XID_SQL),
+        migrations.RunSQL(change_xid_trigger_sql("species"), reverse_change_xid_trigger_sql("species")),
+        migrations.RunSQL(change_xid_trigger_sql("unit"), reverse_change_xid_trigger_sql("unit")),
+    ]
@@ -1,4 +1,7 @@
+import abc
+
 from django.db import models
+from django.db.models.signals import class_prepared
 from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -29,6 +32,12 @@ class Species(BaseAuditModel):
     """
     name = models.CharField(max_length=20, unique=True)
     description = models.TextField(null=True, blank=True)
+    change_xid = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Id of the transaction that last wrote the row, assigned by a database trigger"
+    )
 
     class Meta:
         db_table = 'species'
@@ -43,10 +52,34 @@ class Species(BaseAuditModel):
 class Unit(BaseAuditModel):
     """
     Model to store measurement units.
+    Units sharing a dimension convert into each other through their base factors.
     """
+    DIMENSION_MASS = 'mass'
+    DIMENSION_VOLUME = 'volume'
+    DIMENSION_CONCENTRATION = 'concentration'
+    DIMENSION_CHOICES = [
+        (DIMENSION_MASS, 'Mass'),
+        (DIMENSION_VOLUME, 'Volume'),
+        (DIMENSION_CONCENTRATION, 'Concentration'),
+    ]
+
     name = models.CharField(max_length=20, unique=True)
     short_name = models.CharField(max_length=5, unique=True)
     description = models.TextField(null=True, blank=True)
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES, null=True, blank=True)
+    base_factor = models.DecimalField(
+        max_digits=24,
+        decimal_places=12,
+        null=True,
+        blank=True,
+        help_text="Size of the unit in its dimension's base unit (g, l or μg/ml)"
+    )
+    change_xid = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Id of the transaction that last wrote the row, assigned by a database trigger"
+    )
 
     class Meta:
         db_table = 'unit'
@@ -58,6 +91,34 @@ class Unit(BaseAuditModel):
         return f"{self.name} ({self.short_name})"
 
 
+class RatedContentModel(models.Model):
+    """
+    Abstract base model for content rated through the rating service, with
+    up/down counters kept in step with its Rating rows.
+    """
+    rating_up = models.PositiveIntegerField(default=0, editable=False)
+    rating_down = models.PositiveIntegerField(default=0, editable=False)
+    # Set when this result is served despite being down-voted past the threshold;
+    # cleared once a fresh variant has been generated
+    regeneration_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @abc.abstractmethod
+    def regenerate(self) -> 'RatedContentModel':
+        """Generate a fresh variant of this result for the same input."""
+
+
+def _require_regenerate(sender, **kwargs):
+    # Django model classes are not ABCs, so enforce the abstract method when a concrete model is defined
+    if issubclass(sender, RatedContentModel) and getattr(sender.regenerate, '__isabstractmethod__', False):
+        raise TypeError(f"{sender.__name__} must implement RatedContentModel.regenerate()")
+
+
+class_prepared.connect(_require_regenerate)
+
+
 class Rating(BaseAuditModel):
     """
     Generic model for storing user ratings for different types of content (drug interactions, diagnoses, etc.).
@@ -116,4 +177,45 @@ class SystemLog(models.Model):
 
     def __str__(self) -> str:
         message_text = str(self.message)
-        return str(f"{self.timestamp} - {self.log_level}: {message_text[:50]}...")
\ No newline at end of file
+        return str(f"{self.timestamp} - {self.log_level}: {message_text[:50]}...")
+
+class TableVersion(models.Model):
+    """
+    Model to store a change counter per database table.
+    Rows are bumped by statement-level triggers, so every write path
+    (ORM, raw SQL, COPY) advances the version.
+    """
+    table_name = models.CharField(max_length=63, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'table_version'
+        verbose_name = 'Table Version'
+        verbose_name_plural = 'Table Versions'
+
+    def __str__(self) -> str:
+        return f"{self.table_name} v{self.version}"
+
+
+class CatalogTombstone(models.Model):
+    """
+    Model to record deletions from the synced catalog tables (drug, species, unit).
+    Rows are written by a delete trigger with the id of the deleting transaction,
+    so delta syncs can report removed rows. Pruning leaves a HORIZON_TABLE row
+    whose change_xid is the oldest transaction id deltas are still complete from.
+    """
+    HORIZON_TABLE = 'catalog_sync_horizon'
+
+    table_name = models.CharField(max_length=63)
+    object_id = models.BigIntegerField()
+    change_xid = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'catalog_tombstone'
+        verbose_name = 'Catalog Tombstone'
+        verbose_name_plural = 'Catalog Tombstones'
+
+    def __str__(self) -> str:
+        return f"{self.table_name} {self.object_id} deleted in transaction {self.change_xid}"
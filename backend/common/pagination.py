@@ -0,0 +1,121 @@
+from typing import Optional, Sequence
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CountOptionalPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination that can skip the COUNT(*) query.
+
+    With `?count=false` the page is fetched with LIMIT page_size + 1 to detect
+    a next page, and the response omits `count`.
+    """
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.include_count = request.query_params.get(self.count_query_param, 'true').lower() not in ('false', '0')
+        if self.include_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        raw_page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            self.page_number = int(raw_page_number)
+            if self.page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(
+                page_number=raw_page_number, message='That page number is not a positive integer'
+            ))
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.include_count:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if self.include_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.include_count:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a view-specific ordering on indexed keys.
+    Each page is a range scan from the previous position, with no COUNT(*) or OFFSET.
+    """
+
+    def __init__(self, ordering: Sequence[str]):
+        self.ordering = tuple(ordering)
+
+
+class CursorOrPageNumberPagination(BasePagination):
+    """
+    Default list pagination.
+
+    Views that declare `cursor_ordering` (e.g. ('-created_at', '-id')) switch to keyset
+    cursor pagination when the request carries `?pagination=cursor` or a `cursor`
+    parameter; otherwise page numbers are used, with `?count=false` to skip the total.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.paginator: Optional[BasePagination] = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, 'cursor_ordering', None)
+        use_cursor = bool(ordering) and (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+        self.paginator = KeysetCursorPagination(ordering) if use_cursor else CountOptionalPageNumberPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return CountOptionalPageNumberPagination().get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self) -> bool:
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_fields(self, view):
+        return CountOptionalPageNumberPagination().get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return CountOptionalPageNumberPagination().get_schema_operation_parameters(view)
@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    JSON renderer selected with `?format=compact`.
+    Views check `request.accepted_renderer.format` to emit foreign keys as ids
+    with the referenced objects side-loaded once per response.
+    """
+    format = 'compact'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON renderer (`?format=ndjson`).
+    Export views stream their own body; this renders ordinary responses such as errors.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(row, cls=encoders.JSONEncoder) + '\n' for row in rows).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV renderer (`?format=csv`).
+    Export views stream their own body; this renders ordinary responses such as errors.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        output = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return output.getvalue().encode(self.charset)
@@ -1,8 +1,21 @@
 from rest_framework import serializers
 
 from common.services import rating_service
+from common.services.reference_cache import species_cache, unit_cache
 from .models import Rating, Species, Unit
 
+class SparseFieldsetMixin:
+    """
+    Serializer mixin limiting the output to the field names listed in context['fields'].
+    Used for `?fields=` sparse fieldsets on list endpoints.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested is not None:
+            for field_name in set(self.fields) - set(requested):
+                self.fields.pop(field_name)
+
 class SpeciesSerializer(serializers.ModelSerializer):
     """Serializer for Species model"""
     class Meta:
@@ -15,6 +28,53 @@ class UnitSerializer(serializers.ModelSerializer):
         model = Unit
         fields = ['id', 'name', 'short_name']
 
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for Species/Unit that resolves input through the
+    in-process reference cache instead of querying the database.
+    """
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        if not kwargs.get('read_only'):
+            kwargs.setdefault('queryset', cache.model.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.cache.get(int(data))
+        except self.cache.model.DoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class CachedReferenceField(serializers.Field):
+    """
+    Read-only nested Species/Unit representation built from the foreign key id
+    and the reference cache, so listings need neither joins nor extra queries.
+    """
+    def __init__(self, cache, serializer_class, **kwargs):
+        self.cache = cache
+        self.serializer_class = serializer_class
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return getattr(instance, f'{self.source}_id')
+
+    def to_representation(self, value):
+        return self.cache.representation(value, self.serializer_class)
+
+
+def cached_species_field(**kwargs) -> CachedReferenceField:
+    return CachedReferenceField(species_cache, SpeciesSerializer, **kwargs)
+
+
+def cached_unit_field(**kwargs) -> CachedReferenceField:
+    return CachedReferenceField(unit_cache, UnitSerializer, **kwargs)
+
 class RatingSerializer(serializers.Serializer):
     rating = serializers.ChoiceField(
         choices=[('up', 'up'), ('down', 'down')],
@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from ..models import RatedContentModel
+
+logger = logging.getLogger(__name__)
+
+
+def best_variant(variants: QuerySet) -> Optional[RatedContentModel]:
+    """
+    Pick the best-rated of the cached results generated for the same input:
+    highest net score (up minus down votes), newest first among equals, so a
+    fresh regeneration replaces a down-voted result until it is rated itself.
+    """
+    return (
+        variants
+        .annotate(net_rating=F('rating_up') - F('rating_down'))
+        .order_by('-net_rating', '-created_at', '-id')
+        .first()
+    )
+
+
+def needs_regeneration(result: RatedContentModel) -> bool:
+    """Whether enough users rated the result and the down-vote ratio crossed the threshold."""
+    votes = result.rating_up + result.rating_down
+    if votes < settings.AI_RESULT_MIN_VOTES:
+        return False
+    return result.rating_down / votes >= settings.AI_RESULT_REGENERATE_DOWN_RATIO
+
+
+def request_regeneration(result: RatedContentModel) -> bool:
+    """
+    Queue a result for regeneration by the regenerate_ai_results command.
+
+    Returns:
+        True if the result was newly queued, False if it already was
+    """
+    queued = type(result).objects.filter(
+        pk=result.pk, regeneration_requested_at__isnull=True
+    ).update(regeneration_requested_at=timezone.now())
+    if queued:
+        logger.info("Queued %s %s for regeneration", result._meta.label, result.pk)
+    return bool(queued)
+
+
+def select_cached_result(variants: QuerySet) -> Optional[RatedContentModel]:
+    """
+    Choose which cached AI result to serve for an input, if any.
+
+    The best-rated variant is served even when it is down-voted, so users are
+    never blocked on a new LLM call; if even the best variant has crossed the
+    down-vote threshold it is queued for background regeneration instead.
+
+    Args:
+        variants: All cached results generated for the requested input
+
+    Returns:
+        The variant to serve, or None if nothing is cached
+    """
+    result = best_variant(variants)
+    if result is not None and needs_regeneration(result):
+        request_regeneration(result)
+    return result
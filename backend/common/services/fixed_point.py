@@ -0,0 +1,215 @@
+"""
+Fixed-point integer engine for dose and unit conversion arithmetic.
+
+Results are integer counts of 0.00001 units (`SCALE`), rounded half up, and
+are identical to the Decimal pipeline in DosageCalculatorService and
+UnitConversionService:
+
+    quantize(R(R(R(weight / per_weight) * base) * factor), 0.00001, ROUND_HALF_UP)
+
+where R rounds to the Decimal context precision (28 significant digits,
+half even). Every input is turned into an exact integer ratio and the result
+is computed exactly. The intermediate roundings move the value by at most
+about 1e-27 relative, so they only matter when the exact value lies on a
+rounding boundary (a tie, e.g. 0.00035 * 0.71 / 0.7 = 0.000355) or when it is
+too large for that bound to hold; only then are they replayed in integers.
+"""
+import decimal
+from decimal import Decimal
+from typing import Iterable, List, Tuple
+
+# Results are scaled integers with 5 decimal places
+PLACES = 5
+SCALE = 10 ** PLACES
+
+ONE = Decimal('1')
+
+
+class FixedPointOverflowError(ArithmeticError):
+    """The result does not fit the Decimal context precision."""
+
+
+def _precision() -> int:
+    return decimal.getcontext().prec
+
+
+def to_decimal(value: int) -> Decimal:
+    """Scaled integer -> Decimal with 5 decimal places, equal to the quantized Decimal result."""
+    return Decimal(value).scaleb(-PLACES)
+
+
+def _round_half_up(numerator: int, denominator: int) -> Tuple[int, bool]:
+    """Non-negative numerator / denominator rounded half up, and whether it was an exact tie."""
+    quotient, remainder = divmod(2 * numerator + denominator, 2 * denominator)
+    return quotient, remainder == 0
+
+
+def _digits(value: int) -> int:
+    return len(str(value))
+
+
+def _round_significant(numerator: int, denominator: int, exponent: int, precision: int) -> Tuple[int, int]:
+    """
+    numerator / denominator * 10**exponent rounded half even to `precision`
+    significant digits, as (coefficient, exponent). Mirrors a Decimal operation
+    on positive operands.
+    """
+    shift = precision - 1 - (_digits(numerator) - _digits(denominator))
+    lower, upper = 10 ** (precision - 1), 10 ** precision
+
+    def scaled(shift):
+        if shift >= 0:
+            return numerator * 10 ** shift, denominator
+        return numerator, denominator * 10 ** -shift
+
+    scaled_numerator, scaled_denominator = scaled(shift)
+    if scaled_numerator < lower * scaled_denominator:
+        shift += 1
+    elif scaled_numerator >= upper * scaled_denominator:
+        shift -= 1
+    scaled_numerator, scaled_denominator = scaled(shift)
+
+    coefficient, remainder = divmod(scaled_numerator, scaled_denominator)
+    if 2 * remainder > scaled_denominator or (2 * remainder == scaled_denominator and coefficient % 2):
+        coefficient += 1
+        if coefficient == upper:
+            coefficient //= 10
+            shift -= 1
+    return coefficient, exponent - shift
+
+
+def _parts(value: Decimal) -> Tuple[int, int]:
+    """Positive Decimal -> (coefficient, exponent)."""
+    _, digits, exponent = Decimal(value).as_tuple()
+    return int(''.join(map(str, digits))), exponent
+
+
+def _quantize(coefficient: int, exponent: int, precision: int) -> int:
+    """coefficient * 10**exponent rounded half up to a scaled integer, like Decimal.quantize."""
+    if exponent >= -PLACES:
+        result = coefficient * 10 ** (exponent + PLACES)
+    else:
+        result, _ = _round_half_up(coefficient, 10 ** (-PLACES - exponent))
+    if result >= 10 ** precision:
+        raise FixedPointOverflowError("Result exceeds the available precision")
+    return result
+
+
+def _replay_dose(base: Decimal, per_weight: Decimal, weight: Decimal, factor: Decimal, precision: int) -> int:
+    """The Decimal dose pipeline step by step, with every intermediate rounding."""
+    weight_coefficient, weight_exponent = _parts(weight)
+    per_weight_coefficient, per_weight_exponent = _parts(per_weight)
+    base_coefficient, base_exponent = _parts(base)
+
+    coefficient, exponent = _round_significant(
+        weight_coefficient, per_weight_coefficient, weight_exponent - per_weight_exponent, precision
+    )
+    coefficient, exponent = _round_significant(coefficient * base_coefficient, 1, exponent + base_exponent, precision)
+    if factor != ONE:
+        factor_coefficient, factor_exponent = _parts(factor)
+        coefficient, exponent = _round_significant(
+            coefficient * factor_coefficient, 1, exponent + factor_exponent, precision
+        )
+    return _quantize(coefficient, exponent, precision)
+
+
+class DoseFormula:
+    """
+    Dose of one drug converted by one factor, prepared for many weights.
+
+    base / per_weight * factor is folded into one exact integer ratio up front,
+    so each weight costs a multiply and a floor division.
+    """
+
+    def __init__(self, base: Decimal, per_weight: Decimal, factor: Decimal = ONE):
+        self.base = base
+        self.per_weight = per_weight
+        self.factor = factor
+        base_numerator, base_denominator = base.as_integer_ratio()
+        per_weight_numerator, per_weight_denominator = per_weight.as_integer_ratio()
+        factor_numerator, factor_denominator = factor.as_integer_ratio()
+        self.numerator = base_numerator * per_weight_denominator * factor_numerator * SCALE
+        self.denominator = base_denominator * per_weight_numerator * factor_denominator
+
+    def _replay(self, weight: Decimal, precision: int) -> int:
+        return _replay_dose(self.base, self.per_weight, weight, self.factor, precision)
+
+    def dose(self, weight: Decimal) -> int:
+        """
+        Dose for a positive weight, in 0.00001 units.
+
+        Raises:
+            FixedPointOverflowError: If the dose does not fit the Decimal context precision
+        """
+        weight_numerator, weight_denominator = weight.as_integer_ratio()
+        numerator = weight_numerator * self.numerator
+        precision = _precision()
+        result, tie = _round_half_up(numerator, weight_denominator * self.denominator)
+        # Off a tie the exact value is at least 1 / (2 * denominator) from a boundary,
+        # further than the intermediate roundings can move it while 4 * numerator < 10**(prec - 1)
+        if tie or 4 * numerator >= 10 ** (precision - 1):
+            return self._replay(weight, precision)
+        return result
+
+    def doses(self, weights: Iterable[int], places: int) -> List[int]:
+        """
+        Doses for positive weights given as integers with `places` decimal places
+        (e.g. hundredths of a kilogram for places=2), in 0.00001 units.
+
+        Raises:
+            FixedPointOverflowError: If a dose does not fit the Decimal context precision
+        """
+        precision = _precision()
+        limit = 10 ** (precision - 1)
+        numerator = self.numerator
+        denominator = self.denominator * 10 ** places
+        divisor = 2 * denominator
+
+        results = []
+        for weight in weights:
+            scaled = weight * numerator
+            result, remainder = divmod(2 * scaled + denominator, divisor)
+            if not remainder or 4 * scaled >= limit:
+                result = self._replay(Decimal(weight).scaleb(-places), precision)
+            results.append(result)
+        return results
+
+
+def dose(base: Decimal, per_weight: Decimal, weight: Decimal, factor: Decimal = ONE) -> int:
+    """
+    Dose of `base` per `per_weight` for `weight`, converted by `factor`, in 0.00001 units.
+
+    All arguments must be positive.
+
+    Raises:
+        FixedPointOverflowError: If the dose does not fit the Decimal context precision
+    """
+    return DoseFormula(base, per_weight, factor).dose(weight)
+
+
+def convert(value: Decimal, factor: Decimal) -> int:
+    """
+    `value` converted by `factor`, in 0.00001 units.
+
+    Raises:
+        FixedPointOverflowError: If the result does not fit the Decimal context precision
+    """
+    if not value:
+        return 0
+    if value < 0:
+        return -convert(-value, factor)
+
+    value_numerator, value_denominator = value.as_integer_ratio()
+    factor_numerator, factor_denominator = factor.as_integer_ratio()
+    numerator = value_numerator * factor_numerator * SCALE
+    denominator = value_denominator * factor_denominator
+    precision = _precision()
+    result, tie = _round_half_up(numerator, denominator)
+    if tie or 4 * numerator >= 10 ** (precision - 1):
+        value_coefficient, value_exponent = _parts(value)
+        factor_coefficient, factor_exponent = _parts(factor)
+        coefficient, exponent = _round_significant(
+            value_coefficient * factor_coefficient, 1, value_exponent + factor_exponent, precision
+        )
+        return _quantize(coefficient, exponent, precision)
+    return result
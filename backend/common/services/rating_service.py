@@ -1,8 +1,10 @@
-from typing import Literal
+from typing import Literal, Optional
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
 
-from ..models import Rating
+from ..models import RatedContentModel, Rating
 
 from django.contrib.auth.models import AbstractUser
 from django.db.models import Model
@@ -12,43 +14,99 @@ from django.db.models import Model
 class RatingValidationError(Exception):
     """Custom exception for rating validation errors."""
 
+
+OPPOSITE_RATING = {'up': 'down', 'down': 'up'}
+
+# One round trip: insert the rating or update the user's previous rating of the same object.
+# ON CONFLICT matches the (created_by, content_type, object_id) unique_together constraint
+# and always returns the row. updated_at only takes this call's timestamp when the old
+# rating differs, so `changed` tells a flip from a repeat, and xmax is 0 only for a freshly
+# inserted row, without reading the old row first.
+UPSERT_RATING_SQL = f"""
+    INSERT INTO {Rating._meta.db_table} AS rating (content_type_id, object_id, rating, created_by_id, created_at, updated_at)
+    VALUES (%(content_type)s, %(object_id)s, %(rating)s, %(user)s, %(now)s, %(now)s)
+    ON CONFLICT (created_by_id, content_type_id, object_id)
+    DO UPDATE SET
+        rating = EXCLUDED.rating,
+        updated_at = CASE WHEN rating.rating <> EXCLUDED.rating THEN EXCLUDED.updated_at ELSE rating.updated_at END
+    RETURNING *, (xmax = 0) AS inserted, (updated_at = %(now)s) AS changed
+"""
+
+DELETE_RATING_SQL = f"""
+    DELETE FROM {Rating._meta.db_table}
+    WHERE created_by_id = %s AND content_type_id = %s AND object_id = %s
+    RETURNING rating
+"""
+
+
+def _update_counters(content_object: 'Model', increment: Optional[str] = None, decrement: Optional[str] = None) -> None:
+    """Move the denormalized rating counters of a RatedContentModel with F-expressions."""
+    if not isinstance(content_object, RatedContentModel):
+        return
+    changes = {}
+    if increment:
+        changes[f'rating_{increment}'] = F(f'rating_{increment}') + 1
+    if decrement:
+        changes[f'rating_{decrement}'] = F(f'rating_{decrement}') - 1
+    type(content_object).objects.filter(pk=content_object.pk).update(**changes)
+
+
 def rate_content(*, content_object: 'Model', rating: Literal['up', 'down'], user: 'AbstractUser') -> Rating:
     """
     Rate any content object that should support ratings.
-    
+
+    Inserts the rating, or replaces the user's earlier rating of the object,
+    in a single INSERT ... ON CONFLICT DO UPDATE statement, so concurrent
+    clicks never race into an IntegrityError. Rating counters of
+    RatedContentModel content move in the same transaction.
+
     Args:
         content_object: The object being rated (DrugInteraction, TreatmentGuide etc.)
         rating: Either 'up' or 'down'
         user: User performing the rating
-        
+
     Returns:
-        Rating: The created rating instance
-        
+        Rating: The created or updated rating instance
+
     Raises:
-        RatingValidationError: If validation fails or user already rated
-        ObjectDoesNotExist: If content object doesn't exist
+        RatingValidationError: If the rating value is invalid
     """
+    if rating not in OPPOSITE_RATING:
+        raise RatingValidationError(f"Invalid rating: {rating}")
+
     content_type = ContentType.objects.get_for_model(content_object)
+    with transaction.atomic():
+        instance = next(iter(Rating.objects.raw(UPSERT_RATING_SQL, {
+            'content_type': content_type.id,
+            'object_id': content_object.id,
+            'rating': rating,
+            'user': user.id,
+            'now': timezone.now(),
+        })))
+        if not instance.changed:
+            # The user already gave this rating; nothing changed
+            return instance
+        _update_counters(
+            content_object,
+            increment=rating,
+            decrement=None if instance.inserted else OPPOSITE_RATING[rating]
+        )
+    return instance
 
-    # Check if user already rated this content
-    if Rating.objects.filter(
-        content_type=content_type,
-        object_id=content_object.id,
-        created_by=user
-    ).exists():
-        rating = Rating.objects.filter(
-        content_type=content_type,
-        object_id=content_object.id,
-        created_by=user).update(rating=rating)
 
-        return rating
+def remove_rating(*, content_object: 'Model', user: 'AbstractUser') -> Optional[str]:
+    """
+    Remove the user's rating of a content object, if any.
 
-    # Create rating record in a transaction
+    Returns:
+        The removed rating ('up' or 'down'), or None if the user had not rated the object
+    """
+    content_type = ContentType.objects.get_for_model(content_object)
     with transaction.atomic():
-        instance = Rating.objects.create(
-            content_type=content_type,
-            object_id=content_object.id,
-            rating=rating,
-            created_by=user
-        )
-    return instance
\ No newline at end of file
+        with connection.cursor() as cursor:
+            cursor.execute(DELETE_RATING_SQL, [user.id, content_type.id, content_object.id])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        _update_counters(content_object, decrement=row[0])
+    return row[0]
@@ -0,0 +1,114 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+
+from django.db import models
+
+from .table_version_service import get_table_version
+from ..models import Species, Unit
+
+logger = logging.getLogger('common')
+
+
+class ReferenceCache:
+    """
+    In-process, read-through cache of a small reference table (species, units).
+
+    The whole table is loaded into a dict keyed by primary key and reloaded
+    whenever its table version changes, so processes pick up writes made
+    elsewhere within TABLE_VERSION_CHECK_INTERVAL. Local model signals
+    invalidate it immediately. Cached instances are shared between requests
+    and must be treated as read-only.
+    """
+
+    def __init__(self, model: Type[models.Model]):
+        self.model = model
+        # (instances by pk, serialized representations by (serializer, pk), derived structures by builder),
+        # swapped as one unit on reload
+        self._snapshot: Tuple[Dict[int, models.Model], Dict[Tuple[type, int], dict], Dict[Callable, Any]] = ({}, {}, {})
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        # Serializer fields are deep-copied per instance; they must keep sharing the process-wide cache
+        return self
+
+    def invalidate(self) -> None:
+        """Mark the cache as stale so the next lookup reloads it."""
+        self._version = None
+
+    def reload(self) -> None:
+        """Load every row of the table."""
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        # Called with the lock held
+        version = get_table_version(self.model._meta.db_table).version
+        instances = {instance.pk: instance for instance in self.model.objects.all()}
+        self._snapshot = (instances, {}, {})
+        self._version = version
+        logger.debug("Reloaded %s reference cache: %d rows (version %d)", self.model.__name__, len(instances), version)
+
+    def _is_stale(self) -> bool:
+        return self._version is None or self._version != get_table_version(self.model._meta.db_table).version
+
+    def _instances(self) -> Dict[int, models.Model]:
+        if self._is_stale():
+            with self._lock:
+                # Requests that saw the same stale version queue on the lock; only the first reloads
+                if self._is_stale():
+                    self._load()
+        return self._snapshot[0]
+
+    def get(self, pk) -> models.Model:
+        """
+        Resolve a primary key to a cached instance.
+
+        Inserts bump the table version, so a row created since the last version
+        check is picked up by that check; a miss does not reload the table.
+
+        Raises:
+            DoesNotExist: The model's DoesNotExist if no row has this primary key
+        """
+        instance = self._instances().get(pk)
+        if instance is None:
+            raise self.model.DoesNotExist(f"{self.model.__name__} with id {pk} does not exist")
+        return instance
+
+    def get_many(self, pks: Iterable[int]) -> Dict[int, models.Model]:
+        """Resolve several primary keys at once, skipping unknown ones."""
+        instances = self._instances()
+        return {pk: instances[pk] for pk in pks if pk in instances}
+
+    def all(self) -> Iterable[models.Model]:
+        return self._instances().values()
+
+    def representation(self, pk: int, serializer_class) -> dict:
+        """
+        Serialized form of a cached instance, computed once per table version.
+
+        Returns:
+            A copy of the serializer's data, safe for the caller to modify
+        """
+        instance = self.get(pk)
+        representations = self._snapshot[1]
+        key = (serializer_class, pk)
+        if key not in representations:
+            representations[key] = dict(serializer_class(instance).data)
+        return dict(representations[key])
+
+    def derived(self, builder: Callable[[Dict[int, models.Model]], Any]) -> Any:
+        """
+        Structure built from all cached instances (e.g. a lookup matrix), computed
+        once per table version by `builder(instances_by_pk)`.
+        """
+        instances = self._instances()
+        derived = self._snapshot[2]
+        if builder not in derived:
+            derived[builder] = builder(instances)
+        return derived[builder]
+
+
+species_cache = ReferenceCache(Species)
+unit_cache = ReferenceCache(Unit)
@@ -0,0 +1,47 @@
+import logging
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+
+from ..models import TableVersion
+
+logger = logging.getLogger('common')
+
+# table_name -> (checked_at, TableVersion)
+_version_memo: Dict[str, Tuple[float, TableVersion]] = {}
+
+
+def get_table_version(table_name: str) -> TableVersion:
+    """
+    Get the current change version of a database table.
+
+    Versions are bumped by database triggers on every write statement, so they
+    are consistent across processes. The value is memoized in-process for
+    TABLE_VERSION_CHECK_INTERVAL seconds to keep hot paths off the database.
+
+    Args:
+        table_name: Database table name (e.g., 'drug', 'species', 'unit')
+
+    Returns:
+        TableVersion: The version row (unsaved with version 0 if the table was never written)
+    """
+    now = time.monotonic()
+    memo = _version_memo.get(table_name)
+    if memo and now - memo[0] < settings.TABLE_VERSION_CHECK_INTERVAL:
+        return memo[1]
+
+    table_version = (
+        TableVersion.objects.filter(table_name=table_name).first()
+        or TableVersion(table_name=table_name, version=0)
+    )
+    _version_memo[table_name] = (now, table_version)
+    return table_version
+
+
+def invalidate_table_version(table_name: str) -> None:
+    """
+    Drop the memoized version of a table, forcing the next read to hit the database.
+    Called from model signals so writes are visible in-process immediately.
+    """
+    _version_memo.pop(table_name, None)
@@ -0,0 +1,135 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Tuple
+
+from .reference_cache import unit_cache
+from .unit_conversion_service import UnitConversionError, UnitConversionService
+from ..models import Unit
+
+# A concentration in mg/ml is the same ratio as the mass base unit (g) per volume base unit (l)
+MG_PER_ML_IN_BASE_UNITS = Decimal('1')
+
+
+def _unit_dimension(unit: Unit) -> Tuple[Optional[str], Optional[Decimal]]:
+    """Dimension and base factor of a unit, falling back to the built-in tables for unmigrated rows."""
+    if unit.dimension and unit.base_factor:
+        return unit.dimension, unit.base_factor
+    for dimension in (Unit.DIMENSION_MASS, Unit.DIMENSION_VOLUME, Unit.DIMENSION_CONCENTRATION):
+        factor = UnitConversionService.get_conversion_map(dimension).get(unit.short_name)
+        if factor is not None:
+            return dimension, factor
+    return None, None
+
+
+class UnitConversionMatrix:
+    """
+    Dense conversion factor matrix over Unit ids.
+
+    Built once per unit table version from each unit's dimension and base
+    factor, so a conversion is an index lookup and a multiply. Units of
+    different dimensions have no factor; mass and volume convert into each
+    other only through a drug concentration.
+    """
+
+    def __init__(self, units: Dict[int, Unit]):
+        self.index: Dict[int, int] = {}
+        self.dimensions: List[Optional[str]] = []
+        self.base_factors: List[Optional[Decimal]] = []
+        for position, (unit_id, unit) in enumerate(sorted(units.items())):
+            dimension, base_factor = _unit_dimension(unit)
+            self.index[unit_id] = position
+            self.dimensions.append(dimension)
+            self.base_factors.append(base_factor)
+
+        self.factors: List[List[Optional[Decimal]]] = [
+            [
+                from_factor / to_factor
+                if from_dimension is not None and from_dimension == to_dimension
+                else None
+                for to_dimension, to_factor in zip(self.dimensions, self.base_factors)
+            ]
+            for from_dimension, from_factor in zip(self.dimensions, self.base_factors)
+        ]
+
+    def _position(self, unit_id: int) -> int:
+        try:
+            return self.index[unit_id]
+        except KeyError:
+            raise UnitConversionError(f"Unknown unit id {unit_id}")
+
+    def dimension(self, unit_id: int) -> Optional[str]:
+        return self.dimensions[self._position(unit_id)]
+
+    def factor(self, from_unit_id: int, to_unit_id: int, concentration: Optional[Decimal] = None) -> Decimal:
+        """
+        Factor converting a value in one unit to another.
+
+        Units of the same dimension convert through the precomputed matrix.
+        Mass and volume units convert into each other through `concentration`,
+        in mg/ml, e.g. 10 mg of a 5 mg/ml solution is 2 ml.
+
+        Raises:
+            UnitConversionError: If a unit is unknown, the dimensions differ without
+                a mass/volume concentration, or the concentration is not positive
+        """
+        if from_unit_id == to_unit_id:
+            self._position(from_unit_id)
+            return Decimal('1')
+        from_position, to_position = self._position(from_unit_id), self._position(to_unit_id)
+        factor = self.factors[from_position][to_position]
+        if factor is not None:
+            return factor
+        if concentration is not None:
+            dimensions = (self.dimensions[from_position], self.dimensions[to_position])
+            if dimensions in (
+                (Unit.DIMENSION_MASS, Unit.DIMENSION_VOLUME), (Unit.DIMENSION_VOLUME, Unit.DIMENSION_MASS)
+            ):
+                return self._concentration_factor(from_position, to_position, concentration)
+        raise UnitConversionError(
+            f"Cannot convert from {unit_cache.get(from_unit_id).short_name} "
+            f"to {unit_cache.get(to_unit_id).short_name}"
+        )
+
+    def _concentration_factor(self, from_position: int, to_position: int, concentration: Decimal) -> Decimal:
+        """Mass <-> volume factor: base mass / concentration = base volume, and back."""
+        if concentration <= 0:
+            raise UnitConversionError("Concentration must be positive")
+        mass_per_volume = concentration * MG_PER_ML_IN_BASE_UNITS
+        from_base, to_base = self.base_factors[from_position], self.base_factors[to_position]
+        if self.dimensions[from_position] == Unit.DIMENSION_MASS:
+            return from_base / mass_per_volume / to_base
+        return from_base * mass_per_volume / to_base
+
+    def is_compatible(self, from_unit_id: int, to_unit_id: int, concentration: Optional[Decimal] = None) -> bool:
+        """Check whether a value converts from one unit to the other, optionally through a concentration."""
+        try:
+            self.factor(from_unit_id, to_unit_id, concentration)
+            return True
+        except UnitConversionError:
+            return False
+
+    def convert(
+        self,
+        value: Decimal,
+        from_unit_id: int,
+        to_unit_id: int,
+        concentration: Optional[Decimal] = None,
+    ) -> Decimal:
+        """
+        Convert a value between units by id, rounded like UnitConversionService.convert.
+
+        Args:
+            value: The value to convert
+            from_unit_id: Source unit id
+            to_unit_id: Target unit id
+            concentration: Drug concentration in mg/ml, for mass <-> volume conversions
+
+        Raises:
+            UnitConversionError: If the conversion is not possible
+        """
+        factor = self.factor(from_unit_id, to_unit_id, concentration)
+        return (value * factor).quantize(Decimal('0.00001'), rounding=ROUND_HALF_UP)
+
+
+def get_conversion_matrix() -> UnitConversionMatrix:
+    """Conversion matrix for the current unit table, rebuilt only when units change."""
+    return unit_cache.derived(UnitConversionMatrix)
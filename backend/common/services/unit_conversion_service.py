@@ -1,5 +1,9 @@
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict
+from typing import Dict, Tuple
+
+from django.conf import settings
+
+from . import fixed_point
 
 class UnitConversionError(Exception):
     """Custom exception for unit conversion errors."""
@@ -54,37 +58,56 @@ class UnitConversionService:
         Raises:
             UnitConversionError: If units are incompatible or unknown
         """
-        # First, determine the unit type
-        unit_type = cls._determine_unit_type(from_unit, to_unit)
-        conversion_map = cls.get_conversion_map(unit_type)
-        
-        if from_unit not in conversion_map or to_unit not in conversion_map:
-            raise UnitConversionError(f"Cannot convert from {from_unit} to {to_unit}")
-        
-        # Convert to base unit first, then to target unit
-        base_value = value * conversion_map[from_unit]
-        result = base_value / conversion_map[to_unit]
-        
+        factor = cls.get_factor(from_unit, to_unit)
+        if settings.DOSAGE_FIXED_POINT:
+            # Factors are positive; copy the sign so negative values rounding to zero stay -0.00000
+            return fixed_point.to_decimal(fixed_point.convert(value, factor)).copy_sign(value)
+
+        # Factors are exact ratios of the base-unit factors, so one multiply equals
+        # converting to the base unit and back
+        result = value * factor
+
         # Round to 5 decimal places using ROUND_HALF_UP
         return result.quantize(Decimal('0.00001'), rounding=ROUND_HALF_UP)
 
+    @classmethod
+    def get_factor(cls, from_unit: str, to_unit: str) -> Decimal:
+        """
+        Get the factor converting a value from one unit to another
+
+        Raises:
+            UnitConversionError: If units are incompatible or unknown
+        """
+        factor = _FACTORS.get((from_unit, to_unit))
+        if factor is None:
+            # Raises the unknown-type error first, like the original two-step lookup
+            cls._determine_unit_type(from_unit, to_unit)
+            raise UnitConversionError(f"Cannot convert from {from_unit} to {to_unit}")
+        return factor
+
     @classmethod
     def _determine_unit_type(cls, unit1: str, unit2: str) -> str:
         """Determine the type of units (mass, volume, or concentration)"""
-        for unit in (unit1, unit2):
-            if unit in cls.MASS_CONVERSIONS:
-                return 'mass'
-            elif unit in cls.VOLUME_CONVERSIONS:
-                return 'volume'
-            elif unit in cls.CONCENTRATION_CONVERSIONS:
-                return 'concentration'
-        raise UnitConversionError(f"Cannot determine unit type for {unit1} and {unit2}")
+        unit_type = _UNIT_TYPES.get(unit1) or _UNIT_TYPES.get(unit2)
+        if unit_type is None:
+            raise UnitConversionError(f"Cannot determine unit type for {unit1} and {unit2}")
+        return unit_type
 
     @classmethod
     def is_compatible(cls, unit1: str, unit2: str) -> bool:
         """Check if two units are compatible for conversion"""
-        try:
-            cls._determine_unit_type(unit1, unit2)
-            return True
-        except UnitConversionError:
-            return False
\ No newline at end of file
+        return unit1 in _UNIT_TYPES or unit2 in _UNIT_TYPES
+
+
+# Precomputed once at import: unit -> type and (from, to) -> factor for every same-type pair
+_UNIT_TYPES: Dict[str, str] = {
+    unit: unit_type
+    for unit_type in ('mass', 'volume', 'concentration')
+    for unit in UnitConversionService.get_conversion_map(unit_type)
+}
+_FACTORS: Dict[Tuple[str, str], Decimal] = {
+    (from_unit, to_unit): from_factor / to_factor
+    for unit_type in ('mass', 'volume', 'concentration')
+    for from_unit, from_factor in UnitConversionService.get_conversion_map(unit_type).items()
+    for to_unit, to_factor in UnitConversionService.get_conversion_map(unit_type).items()
+}
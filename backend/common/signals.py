@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Species, Unit
+from .services.reference_cache import species_cache, unit_cache
+from .services.table_version_service import invalidate_table_version
+
+
+@receiver(post_save, sender=Species)
+@receiver(post_delete, sender=Species)
+@receiver(post_save, sender=Unit)
+@receiver(post_delete, sender=Unit)
+def reference_data_changed(sender, **kwargs) -> None:
+    """Make reference data changes visible in-process without waiting for the version check."""
+    invalidate_table_version(sender._meta.db_table)
+    (species_cache if sender is Species else unit_cache).invalidate()
@@ -1,3 +1,331 @@
-from django.test import TestCase
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from decimal import Decimal
+from common.models import RatedContentModel, Rating, Species, Unit
+from common.services import rating_service
+from common.services.reference_cache import species_cache
+from common.services.unit_conversion_matrix import get_conversion_matrix
+from common.services.unit_conversion_service import UnitConversionError
+from users.tests.factories import UserFactory
+from unittest.mock import patch
 
-# Create your tests here.
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_list_returns_etag_and_last_modified(self, authenticated_client, species):
+        """Test that reference endpoints expose cache validators."""
+        response = authenticated_client.get(reverse('species-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+
+    def test_matching_etag_returns_not_modified(self, authenticated_client, species, django_assert_max_num_queries):
+        """Test that a matching If-None-Match short-circuits before the queryset runs."""
+        url = reverse('species-list')
+        etag = authenticated_client.get(url)['ETag']
+
+        with django_assert_max_num_queries(0):
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_etag_changes_after_write(self, authenticated_client, species, user):
+        """Test that a write to the table invalidates the previous ETag."""
+        url = reverse('species-list')
+        etag = authenticated_client.get(url)['ETag']
+
+        Species.objects.create(name="Cat", created_by=user)
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_etag_varies_by_query_string(self, authenticated_client, species):
+        """Test that different pages of the same list get different ETags."""
+        url = reverse('unit-list')
+
+        first = authenticated_client.get(url)
+        second = authenticated_client.get(url, {'page': 1})
+
+        assert first['ETag'] != second['ETag']
+
+
+@pytest.mark.django_db
+class TestReferenceCache:
+    def test_lookups_after_first_load_do_not_query(self, species, django_assert_max_num_queries):
+        """Test that resolved ids are served from memory once the table is loaded."""
+        species_cache.get(species.id)
+
+        with django_assert_max_num_queries(0):
+            assert species_cache.get(species.id).name == "Dog"
+
+    def test_save_signal_refreshes_cached_rows(self, species):
+        """Test that a local write is visible on the next lookup."""
+        species_cache.get(species.id)
+
+        species.name = "Canine"
+        species.save()
+
+        assert species_cache.get(species.id).name == "Canine"
+
+    def test_unknown_id_raises_does_not_exist(self, species):
+        """Test that a miss raises the model's DoesNotExist like a queryset lookup."""
+        with pytest.raises(Species.DoesNotExist):
+            species_cache.get(species.id + 1000)
+
+    def test_unknown_id_does_not_reload_table(self, species, django_assert_max_num_queries):
+        """Test that repeated lookups of an unknown id are answered from memory."""
+        species_cache.get(species.id)
+
+        with django_assert_max_num_queries(0):
+            for _ in range(3):
+                with pytest.raises(Species.DoesNotExist):
+                    species_cache.get(species.id + 1000)
+
+    def test_created_row_is_found_after_version_bump(self, species, user):
+        """Test that a row inserted after the cache was loaded is found through the table version."""
+        species_cache.get(species.id)
+
+        cat = Species.objects.create(name="Cat", created_by=user)
+
+        assert species_cache.get(cat.id).name == "Cat"
+
+
+@pytest.mark.django_db
+class TestUnitConversionMatrix:
+    @pytest.fixture
+    def units(self, user):
+        return {
+            short_name: Unit.objects.create(name=short_name, short_name=short_name, created_by=user)
+            for short_name in ("mg", "g", "ml")
+        }
+
+    def test_same_dimension_conversion(self, units):
+        """Test that units of one dimension convert through the precomputed factor."""
+        matrix = get_conversion_matrix()
+
+        assert matrix.convert(Decimal("2500"), units["mg"].id, units["g"].id) == Decimal("2.50000")
+
+    def test_dimension_metadata_from_unit_table(self, units, user):
+        """Test that units carry their own dimension and factor, without a hard-coded entry."""
+        pound = Unit.objects.create(
+            name="Pound", short_name="lb", dimension=Unit.DIMENSION_MASS,
+            base_factor=Decimal("453.59237"), created_by=user
+        )
+
+        assert get_conversion_matrix().convert(Decimal("1"), pound.id, units["g"].id) == Decimal("453.59237")
+
+    def test_mass_volume_conversion_needs_concentration(self, units):
+        """Test that mg and ml have no factor without a concentration."""
+        matrix = get_conversion_matrix()
+
+        assert not matrix.is_compatible(units["mg"].id, units["ml"].id)
+        with pytest.raises(UnitConversionError):
+            matrix.convert(Decimal("10"), units["mg"].id, units["ml"].id)
+
+    def test_mass_to_volume_through_concentration(self, units):
+        """Test that 10 mg of a 5 mg/ml solution is 2 ml, and 2500 mg of it is 0.5 l."""
+        liter = Unit.objects.create(name="l", short_name="l", created_by=units["mg"].created_by)
+        matrix = get_conversion_matrix()
+
+        assert matrix.is_compatible(units["mg"].id, units["ml"].id, concentration=Decimal("5"))
+        assert matrix.convert(Decimal("10"), units["mg"].id, units["ml"].id, concentration=Decimal("5")) == Decimal("2.00000")
+        assert matrix.convert(Decimal("2500"), units["mg"].id, liter.id, concentration=Decimal("5")) == Decimal("0.50000")
+
+    def test_volume_to_mass_through_concentration(self, units):
+        """Test that 2 ml of a 5 mg/ml solution is 10 mg, or 0.01 g."""
+        matrix = get_conversion_matrix()
+
+        assert matrix.convert(Decimal("2"), units["ml"].id, units["mg"].id, concentration=Decimal("5")) == Decimal("10.00000")
+        assert matrix.convert(Decimal("2"), units["ml"].id, units["g"].id, concentration=Decimal("5")) == Decimal("0.01000")
+
+    @pytest.mark.parametrize('concentration', [Decimal("0"), Decimal("-5")])
+    def test_concentration_must_be_positive(self, units, concentration):
+        """Test that a zero or negative concentration is rejected."""
+        with pytest.raises(UnitConversionError, match="positive"):
+            get_conversion_matrix().factor(units["mg"].id, units["ml"].id, concentration)
+
+    def test_concentration_does_not_bridge_other_dimensions(self, units, user):
+        """Test that a concentration only converts between mass and volume."""
+        per_ml = Unit.objects.create(name="mg/ml", short_name="mg/ml", created_by=user)
+
+        with pytest.raises(UnitConversionError):
+            get_conversion_matrix().factor(units["mg"].id, per_ml.id, Decimal("5"))
+
+
+@pytest.fixture
+def interaction(user):
+    from interactions.models import DrugInteraction
+    return DrugInteraction.objects.create(query="Rimadyl + Metacam", result="Avoid", created_by=user)
+
+
+def statements(queries):
+    """Executed SQL statements, without the savepoints of nested atomic blocks."""
+    return [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+
+
+@pytest.mark.django_db
+class TestRateContent:
+    def test_rating_is_one_upsert_and_one_counter_update(self, interaction, user):
+        """Test that a rating click is a single upsert returning the row, plus the counter update."""
+        rating_service.rate_content(content_object=interaction, rating='down', user=user)
+        rating_service.remove_rating(content_object=interaction, user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            rating = rating_service.rate_content(content_object=interaction, rating='up', user=user)
+
+        executed = statements(queries.captured_queries)
+        assert len(executed) == 2
+        assert executed[0].lstrip().startswith('INSERT')
+        assert executed[1].startswith('UPDATE "drug_interaction"')
+        assert rating.pk is not None
+        assert rating.rating == 'up'
+        assert rating.content_object == interaction
+
+    def test_repeated_rating_is_one_upsert(self, interaction, user):
+        """Test that giving the same rating again returns the row from the upsert and leaves the counters alone."""
+        first = rating_service.rate_content(content_object=interaction, rating='up', user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            again = rating_service.rate_content(content_object=interaction, rating='up', user=user)
+
+        executed = statements(queries.captured_queries)
+        assert len(executed) == 1
+        assert executed[0].lstrip().startswith('INSERT')
+        assert again.pk == first.pk
+        assert again.updated_at == first.updated_at
+
+    def test_rerating_replaces_previous_rating(self, interaction, user):
+        """Test that rating again updates the same row instead of raising IntegrityError."""
+        first = rating_service.rate_content(content_object=interaction, rating='up', user=user)
+        second = rating_service.rate_content(content_object=interaction, rating='down', user=user)
+
+        assert second.pk == first.pk
+        assert list(Rating.objects.values_list('rating', flat=True)) == ['down']
+
+    def test_counters_follow_insert_flip_repeat_and_removal(self, interaction, user):
+        """Test that rating counters move with every change of a user's rating."""
+        other_user = UserFactory()
+
+        def counters():
+            interaction.refresh_from_db()
+            return interaction.rating_up, interaction.rating_down
+
+        rating_service.rate_content(content_object=interaction, rating='up', user=user)
+        rating_service.rate_content(content_object=interaction, rating='up', user=other_user)
+        assert counters() == (2, 0)
+
+        rating_service.rate_content(content_object=interaction, rating='down', user=user)
+        rating_service.rate_content(content_object=interaction, rating='down', user=user)
+        assert counters() == (1, 1)
+
+        assert rating_service.remove_rating(content_object=interaction, user=user) == 'down'
+        assert rating_service.remove_rating(content_object=interaction, user=user) is None
+        assert counters() == (1, 0)
+
+    def test_delete_on_rate_endpoint_removes_rating(self, authenticated_client, interaction, user):
+        """Test that DELETE on the rate action removes the user's rating."""
+        url = reverse('drug-interaction-create-rate', args=[interaction.id])
+        assert authenticated_client.patch(url, {'rating': 'up'}, format='json').status_code == status.HTTP_200_OK
+
+        response = authenticated_client.delete(url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not Rating.objects.exists()
+        interaction.refresh_from_db()
+        assert interaction.rating_up == 0
+
+    def test_reconcile_command_recomputes_counters(self, interaction, user):
+        """Test that reconcile_rating_counters fixes drifted counters from the Rating rows."""
+        rating_service.rate_content(content_object=interaction, rating='up', user=user)
+        type(interaction).objects.filter(pk=interaction.pk).update(rating_up=7, rating_down=3)
+
+        out = StringIO()
+        call_command('reconcile_rating_counters', stdout=out)
+
+        interaction.refresh_from_db()
+        assert (interaction.rating_up, interaction.rating_down) == (1, 0)
+        assert "interactions.DrugInteraction: 1 row(s) reconciled" in out.getvalue()
+
+
+@pytest.fixture
+def interaction_drugs(drug_factory):
+    return [drug_factory(name=name, active_ingredient=name) for name in ("Rimadyl", "Metacam")]
+
+
+@pytest.mark.django_db
+class TestAiResultPolicy:
+    def create_variant(self, drugs, user, rating_up=0, rating_down=0):
+        from interactions.models import DrugInteraction
+        interaction = DrugInteraction.objects.create(
+            query="Metacam, Rimadyl", result="{}", created_by=user, rating_up=rating_up, rating_down=rating_down
+        )
+        interaction.drugs.set(drugs)
+        return interaction
+
+    def test_best_rated_variant_is_served(self, interaction_drugs, user):
+        """Test that the cached lookup prefers the best-rated variant over the first one."""
+        from interactions.services.drug_interaction_service import find_interaction_with_same_drugs
+        self.create_variant(interaction_drugs, user, rating_up=1, rating_down=3)
+        best = self.create_variant(interaction_drugs, user, rating_up=4, rating_down=1)
+        self.create_variant(interaction_drugs[:1], user, rating_up=9)
+
+        assert find_interaction_with_same_drugs([drug.id for drug in reversed(interaction_drugs)]) == best
+
+    @pytest.mark.parametrize('rating_down, queued', [(2, False), (4, True)])
+    def test_down_voted_result_is_queued_past_threshold(self, interaction_drugs, user, rating_down, queued, settings):
+        """Test that a served result is queued for regeneration only once the down-vote ratio crosses the threshold."""
+        from interactions.services.drug_interaction_service import find_interaction_with_same_drugs
+        settings.AI_RESULT_MIN_VOTES = 5
+        settings.AI_RESULT_REGENERATE_DOWN_RATIO = 0.6
+        interaction = self.create_variant(interaction_drugs, user, rating_up=5 - rating_down, rating_down=rating_down)
+
+        assert find_interaction_with_same_drugs([drug.id for drug in interaction_drugs]) == interaction
+
+        interaction.refresh_from_db()
+        assert (interaction.regeneration_requested_at is not None) == queued
+
+    def test_regenerate_command_creates_fresh_variant(self, interaction_drugs, user):
+        """Test that regenerate_ai_results replaces a queued result with a new variant that is then served."""
+        from interactions.services.drug_interaction_service import find_interaction_with_same_drugs
+        interaction = self.create_variant(interaction_drugs, user, rating_up=1, rating_down=4)
+        find_interaction_with_same_drugs([drug.id for drug in interaction_drugs])
+
+        with patch(
+            'common.services.openrouter_service.OpenRouterService.send_openrouter_request',
+            return_value={'severity': 'niski', 'summary': '', 'mechanism': '', 'recommendations': ''}
+        ):
+            call_command('regenerate_ai_results', stdout=StringIO())
+
+        interaction.refresh_from_db()
+        assert interaction.regeneration_requested_at is None
+        served = find_interaction_with_same_drugs([drug.id for drug in interaction_drugs])
+        assert served != interaction
+        assert set(served.drugs.all()) == set(interaction_drugs)
+
+    def test_treatment_guide_variants_ignore_factor_order(self, user):
+        """Test that treatment guide lookup matches factors in any order and prefers the best-rated guide."""
+        from treatments.models import TreatmentGuide
+        from treatments.services.treatment_guide_service import find_existing_treatment_guide
+        TreatmentGuide.objects.create(query="", result="a", factors={"temp": "39", "hr": "110"}, created_by=user)
+        best = TreatmentGuide.objects.create(
+            query="", result="b", factors={"hr": "110", "temp": "39"}, created_by=user, rating_up=2
+        )
+        TreatmentGuide.objects.create(query="", result="c", factors={"temp": "39"}, created_by=user, rating_up=5)
+
+        assert find_existing_treatment_guide({"temp": "39", "hr": "110"}) == best
+
+    def test_rated_model_without_regenerate_is_rejected(self):
+        """Test that a concrete rated model must implement regenerate when the class is defined."""
+        with pytest.raises(TypeError, match="must implement"):
+            class UnregeneratableResult(RatedContentModel):
+                class Meta:
+                    app_label = 'common'
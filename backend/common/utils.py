@@ -290,6 +290,9 @@ class PaginatedResponse(Generic[T]):
             queryset: The queryset to paginate
             serializer_class: The serializer class to use for the queryset
             search_function: Optional function to filter queryset based on search parameter
+
+        Pass `count=false` in the query string to skip the total count; the response
+        then reports `has_next` instead of `total` and `total_pages`.
         """
         try:
             # Get and validate pagination parameters
@@ -317,6 +320,20 @@ class PaginatedResponse(Generic[T]):
                 queryset = search_function(queryset, search)
                 logger.info("Applied search filter with term: %s", search)
 
+            # Skip COUNT(*) when the caller opts out of totals
+            if request.query_params.get('count', 'true').lower() in ('false', '0'):
+                offset = (page - 1) * limit
+                rows = list(queryset[offset:offset + limit + 1])
+                serializer = serializer_class(rows[:limit], many=True)
+                return Response({
+                    "results": serializer.data,
+                    "pagination": {
+                        "page": page,
+                        "limit": limit,
+                        "has_next": len(rows) > limit
+                    }
+                })
+
             # Apply pagination
             paginator = Paginator(queryset, limit)
 
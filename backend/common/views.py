@@ -1,15 +1,20 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import QuerySet
+from django.utils.decorators import method_decorator
+from .conditional import table_version_condition
 from .models import Species, Unit
 from .serializers import SpeciesSerializer, UnitSerializer
 
+@method_decorator(table_version_condition('species'), name='get')
 class SpeciesListView(generics.ListAPIView):
     """API view to list all animal species"""
     queryset: QuerySet[Species] = Species.objects.all()
     serializer_class = SpeciesSerializer
     permission_classes = [IsAuthenticated]
-    
+
+
+@method_decorator(table_version_condition('unit'), name='get')
 class UnitListView(generics.ListAPIView):
     """API view to list all measurement units"""
     queryset: QuerySet[Unit] = Unit.objects.all()
@@ -1,6 +1,6 @@
 from rest_framework.routers import DefaultRouter
 
-from drugs.views import CustomDrugDetailView, DosageCalculatorView, DrugListView
+from drugs.views import CatalogSyncView, CustomDrugDetailView, DosageCalculatorView, DrugListView
 from interactions.views import DrugInteractionView
 from treatments.views import TreatmentGuideCreateView
 from users.views import SearchHistoryListView
@@ -9,6 +9,7 @@ from users.views import SearchHistoryListView
 router = DefaultRouter()
 router.register(r'drugs', DrugListView, basename='drug')
 router.register(r'custom-drugs', CustomDrugDetailView, basename='custom-drug')
+router.register(r'catalog', CatalogSyncView, basename='catalog')
 router.register(r'drug-interactions', DrugInteractionView, basename='drug-interaction-create')
 router.register(r'custom-drug-interactions', DosageCalculatorView, basename='drug-calculation')
 router.register(r'dosage-calc', DosageCalculatorView, basename='calculate-dosage')
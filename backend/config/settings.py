@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'corsheaders',
     'django_filters',
@@ -212,7 +213,7 @@ LOGGING = {
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.CursorOrPageNumberPagination',
     'PAGE_SIZE': 20,
     'EXCEPTION_HANDLER': 'common.utils.custom_exception_handler',
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -311,6 +312,51 @@ OPENROUTER_DEFAULT_PARAMS = {
     "presence_penalty": 0
 }
 
+# Catalog caching settings
+# How long (in seconds) a process trusts its memoized table versions before re-checking the database
+TABLE_VERSION_CHECK_INTERVAL = float(os.getenv('TABLE_VERSION_CHECK_INTERVAL', '1.0'))
+DRUG_AUTOCOMPLETE_DEFAULT_LIMIT = 10
+DRUG_AUTOCOMPLETE_MAX_LIMIT = 50
+# Maximum number of items in one POST /api/dosage-calc/batch/ request
+DOSAGE_BATCH_MAX_ITEMS = 100
+# Maximum number of weight rows in one POST /api/dosage-calc/chart/ request
+DOSAGE_CHART_MAX_ROWS = 2000
+# Maximum number of drugs and of target units in one chart request
+DOSAGE_CHART_MAX_DRUGS = 20
+DOSAGE_CHART_MAX_UNITS = 10
+# Maximum number of doses (weight rows x drug/unit columns) in one chart
+DOSAGE_CHART_MAX_CELLS = 20000
+# Build hot list responses from values() rows instead of ModelSerializers (identical JSON)
+FAST_READ_PATH = os.getenv('FAST_READ_PATH', 'True') == 'True'
+# Compute single doses and conversions with the fixed-point integer engine instead of Decimal
+# (identical results; dosage charts always use it)
+DOSAGE_FIXED_POINT = os.getenv('DOSAGE_FIXED_POINT', 'False') == 'True'
+# Entries in the per-process LRU memo of dosage results
+DOSAGE_MEMO_SIZE = int(os.getenv('DOSAGE_MEMO_SIZE', '4096'))
+
+# Search history is written behind the request in bulk inserts of up to SEARCH_HISTORY_BUFFER_SIZE
+# entries, at the latest SEARCH_HISTORY_FLUSH_INTERVAL seconds after an entry was queued
+SEARCH_HISTORY_BUFFER_SIZE = int(os.getenv('SEARCH_HISTORY_BUFFER_SIZE', '50'))
+SEARCH_HISTORY_FLUSH_INTERVAL = float(os.getenv('SEARCH_HISTORY_FLUSH_INTERVAL', '2.0'))
+# A query repeated within SEARCH_HISTORY_COALESCE_WINDOW seconds of the entry that first recorded it
+# bumps that entry's hit_count and last_seen instead of adding a new row; 0 records every repeat
+SEARCH_HISTORY_COALESCE_WINDOW = int(os.getenv('SEARCH_HISTORY_COALESCE_WINDOW', '3600'))
+# Whole months of search history kept before the current one; older monthly partitions are dropped
+SEARCH_HISTORY_RETENTION_MONTHS = int(os.getenv('SEARCH_HISTORY_RETENTION_MONTHS', '12'))
+# Frequent queries (/api/search-history/top/); global ones need at least
+# SEARCH_POPULARITY_GLOBAL_MIN_USERS distinct users
+SEARCH_POPULARITY_DEFAULT_LIMIT = 10
+SEARCH_POPULARITY_MAX_LIMIT = 50
+SEARCH_POPULARITY_GLOBAL_MIN_USERS = int(os.getenv('SEARCH_POPULARITY_GLOBAL_MIN_USERS', '3'))
+
+# Catalog tombstones are kept this long; clients whose sync version is older get a full snapshot
+CATALOG_TOMBSTONE_RETENTION_DAYS = int(os.getenv('CATALOG_TOMBSTONE_RETENTION_DAYS', '90'))
+
+# Cached AI results: a served variant with at least AI_RESULT_MIN_VOTES ratings, of which
+# at least AI_RESULT_REGENERATE_DOWN_RATIO are down-votes, is queued for regeneration
+AI_RESULT_MIN_VOTES = int(os.getenv('AI_RESULT_MIN_VOTES', '5'))
+AI_RESULT_REGENERATE_DOWN_RATIO = float(os.getenv('AI_RESULT_REGENERATE_DOWN_RATIO', '0.6'))
+
 # Add OpenRouter errors to exception handlers in common.utils
 EXCEPTION_HANDLERS = {
     # Django and DRF exceptions
@@ -14,3 +14,18 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Warm up in-process indexes and caches so the first request does not pay for building them
+try:
+    from common.services.reference_cache import species_cache, unit_cache
+    from common.services.unit_conversion_matrix import get_conversion_matrix
+    from drugs.services.drug_autocomplete_service import drug_autocomplete_index
+
+    species_cache.reload()
+    unit_cache.reload()
+    get_conversion_matrix()
+    drug_autocomplete_index.rebuild()
+except Exception:  # pragma: no cover - database may not be ready yet
+    import logging
+
+    logging.getLogger('drugs').warning("In-process cache warm-up failed", exc_info=True)
@@ -3,7 +3,23 @@ from decimal import Decimal
 from rest_framework.test import APIClient
 from users.tests.factories import UserFactory
 from common.models import Species, Unit
-from drugs.models import CustomDrug
+from common.services.reference_cache import species_cache, unit_cache
+from drugs.models import CustomDrug, Drug
+from users.services.search_history_buffer import search_history_buffer
+
+
+@pytest.fixture(autouse=True)
+def reset_reference_caches():
+    """Drop cached species/units so rows rolled back by earlier tests are not served."""
+    species_cache.invalidate()
+    unit_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def discard_search_history_buffer():
+    """Drop buffered history entries so no timer flushes them after the test's transaction."""
+    yield
+    search_history_buffer.clear()
 
 
 @pytest.fixture
@@ -71,6 +87,31 @@ def weight_unit(user):
     )
 
 
+@pytest.fixture
+def drug_factory(species, measurement_unit, weight_unit, user):
+    """
+    Return a function creating a Drug, or a CustomDrug with model=CustomDrug,
+    from the common fixtures. Keyword arguments override the defaults; custom
+    drugs belong to `user` unless `user=` is given.
+    """
+    def create(model=Drug, **fields):
+        owner = fields.get('user', user)
+        defaults = {
+            'name': 'Rimadyl',
+            'active_ingredient': 'Carprofen',
+            'species': species,
+            'measurement_value': Decimal('100.00'),
+            'measurement_unit': measurement_unit,
+            'per_weight_value': Decimal('10.00'),
+            'per_weight_unit': weight_unit,
+            'created_by': owner,
+        }
+        if model is CustomDrug:
+            defaults['user'] = owner
+        return model.objects.create(**{**defaults, **fields})
+    return create
+
+
 @pytest.fixture
 def valid_drug_data(species, measurement_unit, weight_unit):
     """Return valid drug data for testing."""
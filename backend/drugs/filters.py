@@ -0,0 +1,16 @@
+from django_filters import rest_framework as filters
+from .models import CustomDrug, Drug
+
+class DrugFilter(filters.FilterSet):
+    # Filter on the foreign key ids directly, without loading the referenced rows
+    species = filters.NumberFilter(field_name='species')
+    measurement_unit = filters.NumberFilter(field_name='measurement_unit')
+
+    class Meta:
+        model = Drug
+        fields = ['species', 'measurement_unit']
+
+class CustomDrugFilter(DrugFilter):
+    class Meta:
+        model = CustomDrug
+        fields = ['species', 'measurement_unit']
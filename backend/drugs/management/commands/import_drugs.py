@@ -0,0 +1,286 @@
+import csv
+import io
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from common.services.table_version_service import invalidate_table_version
+from drugs.services.drug_autocomplete_service import drug_autocomplete_index
+
+IMPORT_COLUMNS = [
+    'name',
+    'active_ingredient',
+    'species',
+    'contraindications',
+    'measurement_value',
+    'measurement_unit',
+    'per_weight_value',
+    'per_weight_unit',
+]
+REQUIRED_COLUMNS = set(IMPORT_COLUMNS) - {'contraindications'}
+# Columns accepted in the header but not imported (e.g. ids from a drug export)
+IGNORED_COLUMNS = {'id': 'source_id'}
+
+STAGING_TABLE = 'drug_import_staging'
+
+CREATE_STAGING_SQL = f"""
+DROP TABLE IF EXISTS {STAGING_TABLE};
+CREATE TEMP TABLE {STAGING_TABLE} (
+    row_no bigserial,
+    source_id text,
+    name text,
+    active_ingredient text,
+    species text,
+    contraindications text,
+    measurement_value text,
+    measurement_unit text,
+    per_weight_value text,
+    per_weight_unit text,
+    species_id bigint,
+    measurement_unit_id bigint,
+    per_weight_unit_id bigint,
+    error text
+) ON COMMIT DROP;
+"""
+
+# Species may be given by id or name, units by id, short name or name
+RESOLVE_REFERENCES_SQL = f"""
+UPDATE {STAGING_TABLE} st SET
+    species_id = (
+        SELECT sp.id FROM species sp
+        WHERE sp.id::text = btrim(st.species) OR lower(sp.name) = lower(btrim(st.species))
+        ORDER BY sp.id LIMIT 1
+    ),
+    measurement_unit_id = (
+        SELECT u.id FROM unit u
+        WHERE u.id::text = btrim(st.measurement_unit)
+           OR lower(u.short_name) = lower(btrim(st.measurement_unit))
+           OR lower(u.name) = lower(btrim(st.measurement_unit))
+        ORDER BY u.id LIMIT 1
+    ),
+    per_weight_unit_id = (
+        SELECT u.id FROM unit u
+        WHERE u.id::text = btrim(st.per_weight_unit)
+           OR lower(u.short_name) = lower(btrim(st.per_weight_unit))
+           OR lower(u.name) = lower(btrim(st.per_weight_unit))
+        ORDER BY u.id LIMIT 1
+    );
+"""
+
+# Mirrors BaseDrugModel validation: field lengths, positive numeric(10, 5) values
+VALIDATE_SQL = rf"""
+UPDATE {STAGING_TABLE} SET error = CASE
+    WHEN coalesce(btrim(name), '') = '' THEN 'Name cannot be empty'
+    WHEN length(btrim(name)) > 20 THEN 'Name cannot exceed 20 characters'
+    WHEN coalesce(btrim(active_ingredient), '') = '' THEN 'Active ingredient cannot be empty'
+    WHEN length(btrim(active_ingredient)) > 20 THEN 'Active ingredient cannot exceed 20 characters'
+    WHEN length(contraindications) > 100 THEN 'Contraindications cannot exceed 100 characters'
+    WHEN species_id IS NULL THEN 'Invalid species: ' || coalesce(species, '')
+    WHEN measurement_unit_id IS NULL THEN 'Invalid measurement unit: ' || coalesce(measurement_unit, '')
+    WHEN per_weight_unit_id IS NULL THEN 'Invalid per weight unit: ' || coalesce(per_weight_unit, '')
+    WHEN coalesce(measurement_value, '') !~ '^\s*[+-]?[0-9]{{1,5}}(\.[0-9]{{1,5}})?\s*$'
+        THEN 'Measurement value must be a number below 100000 with up to 5 decimals'
+    WHEN measurement_value::numeric <= 0 THEN 'Measurement value must be positive'
+    WHEN coalesce(per_weight_value, '') !~ '^\s*[+-]?[0-9]{{1,5}}(\.[0-9]{{1,5}})?\s*$'
+        THEN 'Per weight value must be a number below 100000 with up to 5 decimals'
+    WHEN per_weight_value::numeric <= 0 THEN 'Per weight value must be positive'
+END;
+
+UPDATE {STAGING_TABLE} st SET error = 'Duplicate of a later row in the file'
+WHERE st.error IS NULL AND EXISTS (
+    SELECT 1 FROM {STAGING_TABLE} later
+    WHERE later.error IS NULL
+      AND later.row_no > st.row_no
+      AND btrim(later.name) = btrim(st.name)
+      AND btrim(later.active_ingredient) = btrim(st.active_ingredient)
+      AND later.species_id = st.species_id
+);
+"""
+
+# Drugs are matched on (name, active_ingredient, species)
+UPDATE_EXISTING_SQL = f"""
+UPDATE drug d SET
+    contraindications = nullif(st.contraindications, ''),
+    measurement_value = st.measurement_value::numeric,
+    measurement_unit_id = st.measurement_unit_id,
+    per_weight_value = st.per_weight_value::numeric,
+    per_weight_unit_id = st.per_weight_unit_id,
+    updated_at = now()
+FROM {STAGING_TABLE} st
+WHERE st.error IS NULL
+  AND d.name = btrim(st.name)
+  AND d.active_ingredient = btrim(st.active_ingredient)
+  AND d.species_id = st.species_id;
+"""
+
+INSERT_NEW_SQL = f"""
+INSERT INTO drug (
+    name, active_ingredient, species_id, contraindications,
+    measurement_value, measurement_unit_id, per_weight_value, per_weight_unit_id,
+    created_at, updated_at, created_by_id
+)
+SELECT
+    btrim(st.name), btrim(st.active_ingredient), st.species_id, nullif(st.contraindications, ''),
+    st.measurement_value::numeric, st.measurement_unit_id, st.per_weight_value::numeric, st.per_weight_unit_id,
+    now(), now(), %s
+FROM {STAGING_TABLE} st
+WHERE st.error IS NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM drug d
+      WHERE d.name = btrim(st.name)
+        AND d.active_ingredient = btrim(st.active_ingredient)
+        AND d.species_id = st.species_id
+  );
+"""
+
+
+class NdjsonCsvReader(io.TextIOBase):
+    """
+    File-like adapter streaming NDJSON records as CSV text for COPY FROM STDIN.
+    Only the buffered tail of the input is held in memory.
+    """
+
+    def __init__(self, source, columns):
+        self._lines = iter(source)
+        self._columns = columns
+        self._buffer = ''
+        self._line_no = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._line_no += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"Invalid JSON on line {self._line_no}: {exc}") from exc
+
+            row = io.StringIO()
+            csv.writer(row).writerow([
+                None if record.get(column) is None else str(record[column])
+                for column in self._columns
+            ])
+            self._buffer += row.getvalue()
+
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import a drug catalog from CSV or NDJSON. Rows are streamed into a staging "
+        "table with COPY, validated in SQL and upserted into the drug table in one transaction. "
+        "Drugs are matched on (name, active_ingredient, species)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to a .csv or .ndjson catalog file")
+        parser.add_argument('--created-by', required=True, help="Email of the user recorded as creator of new drugs")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Input format (defaults to the file extension)")
+        parser.add_argument('--dry-run', action='store_true', help="Validate and report without writing to the drug table")
+        parser.add_argument('--show-errors', type=int, default=20, help="Number of rejected rows to print")
+        parser.add_argument('--error-report', help="Write every rejected row with its reason to this CSV file")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        input_format = options['format'] or ('ndjson' if path.suffix.lower() in ('.ndjson', '.jsonl') else 'csv')
+
+        try:
+            user = get_user_model().objects.get(email=options['created_by'])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"User {options['created_by']} does not exist") from exc
+
+        started = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(CREATE_STAGING_SQL)
+
+            with path.open(encoding='utf-8', newline='') as source:
+                staged = self._copy_into_staging(cursor, source, input_format)
+            self._progress(started, f"Staged {staged} rows")
+
+            cursor.execute(RESOLVE_REFERENCES_SQL)
+            cursor.execute(VALIDATE_SQL)
+            cursor.execute(f"SELECT count(*) FROM {STAGING_TABLE} WHERE error IS NOT NULL")
+            rejected = cursor.fetchone()[0]
+            self._progress(started, f"Validated rows, {rejected} rejected")
+
+            self._report_errors(cursor, options['show_errors'], options['error_report'])
+
+            if options['dry_run']:
+                transaction.set_rollback(True)
+                self.stdout.write(self.style.WARNING("Dry run: no changes written"))
+                return
+
+            cursor.execute("LOCK TABLE drug IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute(UPDATE_EXISTING_SQL)
+            updated = cursor.rowcount
+            cursor.execute(INSERT_NEW_SQL, [user.id])
+            inserted = cursor.rowcount
+
+        invalidate_table_version('drug')
+        drug_autocomplete_index.invalidate()
+
+        self._progress(started, "Import committed")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {staged} rows: {inserted} inserted, {updated} updated, {rejected} rejected"
+        ))
+
+    def _copy_into_staging(self, cursor, source, input_format: str) -> int:
+        """Stream the file into the staging table and return the number of staged rows."""
+        if input_format == 'ndjson':
+            columns = IMPORT_COLUMNS
+            stream = NdjsonCsvReader(source, columns)
+        else:
+            header = next(csv.reader([source.readline()]), [])
+            columns = [column.strip().lower() for column in header]
+            unknown = set(columns) - set(IMPORT_COLUMNS) - set(IGNORED_COLUMNS)
+            missing = REQUIRED_COLUMNS - set(columns)
+            if unknown or missing:
+                raise CommandError(
+                    f"Invalid CSV header. Unknown columns: {sorted(unknown)}, missing columns: {sorted(missing)}"
+                )
+            columns = [IGNORED_COLUMNS.get(column, column) for column in columns]
+            stream = source
+
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            stream
+        )
+        return cursor.rowcount
+
+    def _report_errors(self, cursor, show_errors: int, error_report: str = None) -> None:
+        """Print the first rejected rows and optionally write all of them to a CSV file."""
+        cursor.execute(
+            f"SELECT row_no, name, error FROM {STAGING_TABLE} WHERE error IS NOT NULL ORDER BY row_no LIMIT %s",
+            [show_errors]
+        )
+        for row_no, name, error in cursor.fetchall():
+            self.stdout.write(self.style.ERROR(f"Row {row_no} ({name}): {error}"))
+
+        if error_report:
+            with open(error_report, 'w', encoding='utf-8', newline='') as report:
+                cursor.copy_expert(
+                    f"COPY (SELECT row_no, {', '.join(IMPORT_COLUMNS)}, error FROM {STAGING_TABLE} "
+                    f"WHERE error IS NOT NULL ORDER BY row_no) TO STDOUT WITH (FORMAT csv, HEADER true)",
+                    report
+                )
+
+    def _progress(self, started: float, message: str) -> None:
+        self.stdout.write(f"[{time.perf_counter() - started:7.2f}s] {message}")
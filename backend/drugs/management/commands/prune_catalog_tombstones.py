@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from drugs.services import catalog_sync_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete catalog tombstones older than the retention period. Clients whose "
+        "sync version predates a deleted tombstone get a full snapshot instead of a delta."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=settings.CATALOG_TOMBSTONE_RETENTION_DAYS,
+            help="Keep tombstones written within this many days"
+        )
+
+    def handle(self, *args, **options):
+        pruned = catalog_sync_service.prune_tombstones(options['retention_days'])
+        self.stdout.write(f"Pruned {pruned} catalog tombstone(s)")
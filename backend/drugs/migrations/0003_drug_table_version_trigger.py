@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0003_tableversion"),
+        ("drugs", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TRIGGER drug_table_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON drug
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+            """,
+            "DROP TRIGGER IF EXISTS drug_table_version ON drug;",
+        ),
+    ]
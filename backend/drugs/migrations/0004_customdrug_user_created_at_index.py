@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("drugs", "0003_drug_table_version_trigger"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customdrug",
+            index=models.Index(
+                fields=["user", "-created_at"], name="custom_drug_user_id_fe75fd_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0005_catalog_change_seq"),
+        ("drugs", "0004_customdrug_user_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="drug",
+            name="change_seq",
+            field=models.BigIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Catalog change sequence, assigned by a database trigger on every write",
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            CREATE TRIGGER drug_change_seq
+            BEFORE INSERT OR UPDATE ON drug
+            FOR EACH ROW EXECUTE FUNCTION assign_catalog_change_seq();
+
+            CREATE TRIGGER drug_tombstone
+            AFTER DELETE ON drug
+            FOR EACH ROW EXECUTE FUNCTION record_catalog_tombstone();
+
+            UPDATE drug SET change_seq = 0;
+            """,
+            """
+            DROP TRIGGER IF EXISTS drug_tombstone ON drug;
+            DROP TRIGGER IF EXISTS drug_change_seq ON drug;
+            """,
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("drugs", "0005_drug_change_seq"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customdrug",
+            index=models.Index(
+                fields=["user", "species", "name"],
+                name="custom_drug_user_id_afc0b4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="drug",
+            index=models.Index(
+                fields=["species", "name"], name="drug_species_e7dc76_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0007_catalog_change_xid"),
+        ("drugs", "0006_drug_species_name_indexes"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="drug",
+            old_name="change_seq",
+            new_name="change_xid",
+        ),
+        migrations.AlterField(
+            model_name="drug",
+            name="change_xid",
+            field=models.BigIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Id of the transaction that last wrote the row, assigned by a database trigger",
+            ),
+        ),
+        # The drug table was the last user of the catalog change sequence
+        migrations.RunSQL(
+            """
+            DROP TRIGGER drug_change_seq ON drug;
+            CREATE TRIGGER drug_change_xid
+            BEFORE INSERT OR UPDATE ON drug
+            FOR EACH ROW EXECUTE FUNCTION assign_catalog_change_xid();
+
+            UPDATE drug SET change_xid = 0;
+
+            DROP FUNCTION assign_catalog_change_seq();
+            DROP SEQUENCE catalog_change_seq;
+            """,
+            """
+            CREATE SEQUENCE catalog_change_seq;
+            CREATE FUNCTION assign_catalog_change_seq() RETURNS trigger AS $$
+            BEGIN
+                NEW.change_seq := nextval('catalog_change_seq');
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER drug_change_xid ON drug;
+            CREATE TRIGGER drug_change_seq
+            BEFORE INSERT OR UPDATE ON drug
+            FOR EACH ROW EXECUTE FUNCTION assign_catalog_change_seq();
+            """,
+        ),
+    ]
@@ -61,6 +61,12 @@ class Drug(BaseDrugModel):
     """
     Model for standard drugs.
     """
+    change_xid = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Id of the transaction that last wrote the row, assigned by a database trigger"
+    )
 
     class Meta:
         db_table = 'drug'
@@ -68,7 +74,8 @@ class Drug(BaseDrugModel):
         verbose_name_plural = 'Drugs'
         indexes = [
             models.Index(fields=['name']),
-            models.Index(fields=['active_ingredient'])
+            models.Index(fields=['active_ingredient']),
+            models.Index(fields=['species', 'name'])
         ]
 
     def __str__(self) -> str:
@@ -90,7 +97,9 @@ class CustomDrug(BaseDrugModel):
         verbose_name = 'Custom Drug'
         verbose_name_plural = 'Custom Drugs'
         indexes = [
-            models.Index(fields=['user'])
+            models.Index(fields=['user']),
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'species', 'name'])
         ]
 
     def __str__(self) -> str:
@@ -1,12 +1,20 @@
 from django.forms import ValidationError
+from django.conf import settings
 from django.utils import timezone
 from rest_framework import serializers
 from decimal import ROUND_HALF_UP, Decimal
 
 from common.models import Unit, Species
-from drugs.services.dosage_calculator_service import DosageCalculatorService
+from drugs.services.dosage_calculator_service import DRUG_FIELDS, DosageCalculatorService
 from .models import Drug, CustomDrug
-from common.serializers import SpeciesSerializer, UnitSerializer
+from common.serializers import (
+    CachedPrimaryKeyRelatedField,
+    SparseFieldsetMixin,
+    cached_species_field,
+    cached_unit_field,
+)
+from common.services.reference_cache import species_cache, unit_cache
+from common.services.unit_conversion_matrix import get_conversion_matrix
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 
@@ -15,14 +23,14 @@ from django.contrib.auth.models import AnonymousUser
 # 1. DRUG SERIALIZERS
 # ==========================
 
-class DrugSerializer(serializers.ModelSerializer):
+class DrugSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Format the measurement_value as a string with fixed precision
     measurement_value = serializers.DecimalField(max_digits=10, decimal_places=5, coerce_to_string=True)
-    # Add nested serializers for related fields
-    species = SpeciesSerializer(read_only=True)
-    measurement_unit = UnitSerializer(read_only=True)
+    # Nested species and units are served from the reference cache
+    species = cached_species_field()
+    measurement_unit = cached_unit_field()
     per_weight_value = serializers.DecimalField(max_digits=10, decimal_places=5, coerce_to_string=True)
-    per_weight_unit = UnitSerializer(read_only=True)
+    per_weight_unit = cached_unit_field()
 
     class Meta:
         model = Drug
@@ -39,16 +47,23 @@ class DrugSerializer(serializers.ModelSerializer):
         ]
 
 
+class CompactDrugSerializer(DrugSerializer):
+    """Drug representation with species and units as ids, used by `?format=compact`."""
+    species = serializers.PrimaryKeyRelatedField(read_only=True)
+    measurement_unit = serializers.PrimaryKeyRelatedField(read_only=True)
+    per_weight_unit = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
 # ==========================
 # 2. CUSTOM DRUG SERIALIZERS
 # ==========================
-class CustomDrugSerializer(serializers.ModelSerializer):
+class CustomDrugSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(read_only=True)
     measurement_value = serializers.DecimalField(max_digits=10, decimal_places=5, coerce_to_string=True)
-    species = SpeciesSerializer(read_only=True)
-    measurement_unit = UnitSerializer(read_only=True)
+    species = cached_species_field()
+    measurement_unit = cached_unit_field()
     per_weight_value = serializers.DecimalField(max_digits=10, decimal_places=5, coerce_to_string=True)
-    per_weight_unit = UnitSerializer(read_only=True)
+    per_weight_unit = cached_unit_field()
 
     class Meta:
         model = CustomDrug
@@ -64,6 +79,12 @@ class CustomDrugSerializer(serializers.ModelSerializer):
             'per_weight_unit'
         ]
 
+class CompactCustomDrugSerializer(CustomDrugSerializer):
+    """Custom drug representation with species and units as ids, used by `?format=compact`."""
+    species = serializers.PrimaryKeyRelatedField(read_only=True)
+    measurement_unit = serializers.PrimaryKeyRelatedField(read_only=True)
+    per_weight_unit = serializers.PrimaryKeyRelatedField(read_only=True)
+
 class UpdateCustomDrugSerializer(serializers.ModelSerializer):
     """
     Serializer for updating custom drugs. All fields are optional.
@@ -79,8 +100,8 @@ class UpdateCustomDrugSerializer(serializers.ModelSerializer):
         required=False,
         help_text="Active ingredient in the drug"
     )
-    species= serializers.PrimaryKeyRelatedField(
-        queryset=Species.objects.all(),
+    species= CachedPrimaryKeyRelatedField(
+        species_cache,
         required=False,
         help_text="ID of the species this drug is for"
     )
@@ -97,8 +118,8 @@ class UpdateCustomDrugSerializer(serializers.ModelSerializer):
         required=False,
         help_text="Measurement value with 5 decimal precision"
     )
-    measurement_unit = serializers.PrimaryKeyRelatedField(
-        queryset=Unit.objects.all(),
+    measurement_unit = CachedPrimaryKeyRelatedField(
+        unit_cache,
         required=False,
         help_text="ID of the measurement unit"
     )
@@ -109,8 +130,8 @@ class UpdateCustomDrugSerializer(serializers.ModelSerializer):
         required=False,
         help_text="Per weight value with 5 decimal precision"
     )
-    per_weight_unit = serializers.PrimaryKeyRelatedField(
-        queryset=Unit.objects.all(),
+    per_weight_unit = CachedPrimaryKeyRelatedField(
+        unit_cache,
         required=False,
         help_text="ID of the per weight unit"
     )
@@ -138,8 +159,8 @@ class CreateCustomDrugSerializer(UpdateCustomDrugSerializer):
         max_length=20,
         help_text="Active ingredient in the drug"
     )
-    species= serializers.PrimaryKeyRelatedField(
-        queryset=Species.objects.all(),
+    species= CachedPrimaryKeyRelatedField(
+        species_cache,
         help_text="ID of the species this drug is for"
     )
     contraindications = serializers.CharField(
@@ -155,8 +176,8 @@ class CreateCustomDrugSerializer(UpdateCustomDrugSerializer):
         coerce_to_string=True,
         help_text="Measurement value with 5 decimal precision"
     )
-    measurement_unit = serializers.PrimaryKeyRelatedField(
-        queryset=Unit.objects.all(),
+    measurement_unit = CachedPrimaryKeyRelatedField(
+        unit_cache,
         help_text="ID of the measurement unit"
     )
 
@@ -167,8 +188,8 @@ class CreateCustomDrugSerializer(UpdateCustomDrugSerializer):
         required=False,
         help_text="Per weight value with 5 decimal precision"
     )
-    per_weight_unit = serializers.PrimaryKeyRelatedField(
-        queryset=Unit.objects.all(),
+    per_weight_unit = CachedPrimaryKeyRelatedField(
+        unit_cache,
         required=False,
         help_text="ID of the per weight unit"
     )
@@ -186,17 +207,14 @@ class CreateCustomDrugSerializer(UpdateCustomDrugSerializer):
 # 3. DOSAGE CALCULATOR SERIALIZERS
 # ==========================
 
-class DosageCalcInputSerializer(serializers.Serializer):
+class DosageCalcItemSerializer(serializers.Serializer):
+    """Drug, weight and target unit of one dosage calculation."""
     drug_id = serializers.IntegerField(
         help_text="ID of the drug or custom drug"
     )
     weight = serializers.DecimalField(max_digits=5, decimal_places=2, rounding=ROUND_HALF_UP)  # Allow up to 999.99
-    species= serializers.PrimaryKeyRelatedField(
-        queryset=Species.objects.all(),
-        help_text="ID of the species this drug is for"
-    )
-    target_unit = serializers.PrimaryKeyRelatedField(
-        queryset=Unit.objects.all(),
+    target_unit = CachedPrimaryKeyRelatedField(
+        unit_cache,
         help_text="ID of the target unit for dosage calculation"
     )
 
@@ -213,21 +231,29 @@ class DosageCalcInputSerializer(serializers.Serializer):
             raise serializers.ValidationError("Weight must be less than 1000")
         return value
 
+
+class DosageCalcInputSerializer(DosageCalcItemSerializer):
+    species= CachedPrimaryKeyRelatedField(
+        species_cache,
+        help_text="ID of the species this drug is for"
+    )
+
     def validate(self, attrs):
         drug_id = attrs['drug_id']
         drug_type = attrs['drug_type']
         
-        # Get the appropriate drug model based on type
+        # Get the appropriate drug model based on type, loading only the columns the
+        # calculation needs; species and units come from the reference caches
         try:
             if drug_type == 'standard':
-                drug = Drug.objects.get(pk=drug_id)
+                drug = Drug.objects.only(*DRUG_FIELDS).get(pk=drug_id)
             else:  # custom
-                drug = CustomDrug.objects.get(pk=drug_id)
+                drug = CustomDrug.objects.only(*DRUG_FIELDS, 'user_id').get(pk=drug_id)
                 
                 # Check if user has access to this custom drug if needed
                 request = self.context.get('request')
                 if request and request.user and not isinstance(request.user, AnonymousUser):
-                    if drug.user != request.user:
+                    if drug.user_id != request.user.id:
                         raise serializers.ValidationError(
                             {"drug_id": "You don't have access to this custom drug"}
                         )
@@ -244,10 +270,9 @@ class DosageCalcInputSerializer(serializers.Serializer):
 
         # Verify target unit exists and is compatible
         target_unit = attrs['target_unit']
-        source_unit = drug.measurement_unit
+        source_unit = unit_cache.get(drug.measurement_unit_id)
             
-        from common.services.unit_conversion_service import UnitConversionService
-        if not UnitConversionService.is_compatible(source_unit.short_name, target_unit.short_name):
+        if not get_conversion_matrix().is_compatible(source_unit.id, target_unit.id):
             raise ValidationError(
                 {"target_unit": f"Unit {target_unit.short_name} is not compatible with drug unit {source_unit.short_name}"}
             )
@@ -262,12 +287,12 @@ class DosageCalcInputSerializer(serializers.Serializer):
         target_unit = validated_data['target_unit_obj']
             
         # Calculate dosage
-        result = DosageCalculatorService.calculate_dosage(
+        result = DosageCalculatorService.calculate_dosage_memoized(
             drug_base_value=drug.measurement_value,
             per_weight_value=drug.per_weight_value or Decimal('1'),
             weight=weight,
-            source_unit=drug.measurement_unit.short_name,
-            target_unit=target_unit.short_name,
+            source_unit_id=drug.measurement_unit_id,
+            target_unit_id=target_unit.id,
         )
 
         response_data = {
@@ -292,4 +317,61 @@ class DosageCalcResultSerializer(serializers.Serializer):
         raise NotImplementedError("Create not supported")
 
     def update(self, instance, validated_data):
-        raise NotImplementedError("Update not supported")
\ No newline at end of file
+        raise NotImplementedError("Update not supported")
+
+
+class DosageCalcBatchInputSerializer(serializers.Serializer):
+    """
+    Envelope of a batch calculation. Items are validated one by one with
+    DosageCalcItemSerializer so a bad item is reported without failing the batch.
+    """
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=settings.DOSAGE_BATCH_MAX_ITEMS,
+        help_text="List of {drug_id, drug_type, weight, target_unit} items"
+    )
+
+
+class DosageChartDrugSerializer(serializers.Serializer):
+    drug_id = serializers.IntegerField(help_text="ID of the drug or custom drug")
+    drug_type = serializers.ChoiceField(
+        choices=[('standard', 'Standard'), ('custom', 'Custom')],
+        default='standard',
+        help_text="Type of drug: standard or custom"
+    )
+
+
+class DosageChartInputSerializer(serializers.Serializer):
+    drugs = DosageChartDrugSerializer(many=True, allow_empty=False, max_length=settings.DOSAGE_CHART_MAX_DRUGS)
+    weight_from = serializers.DecimalField(max_digits=5, decimal_places=2, help_text="Lightest weight in the chart")
+    weight_to = serializers.DecimalField(max_digits=5, decimal_places=2, help_text="Heaviest weight in the chart")
+    weight_step = serializers.DecimalField(max_digits=5, decimal_places=2, help_text="Weight increment between rows")
+    target_units = serializers.ListField(
+        child=CachedPrimaryKeyRelatedField(unit_cache),
+        required=False,
+        max_length=settings.DOSAGE_CHART_MAX_UNITS,
+        help_text="IDs of the units to report doses in (defaults to each drug's unit)"
+    )
+
+    def validate(self, attrs):
+        if attrs['weight_from'] <= 0:
+            raise serializers.ValidationError({"weight_from": "Weight must be greater than 0"})
+        if attrs['weight_to'] >= 1000:
+            raise serializers.ValidationError({"weight_to": "Weight must be less than 1000"})
+        if attrs['weight_to'] < attrs['weight_from']:
+            raise serializers.ValidationError({"weight_to": "Weight range end must not be below its start"})
+        if attrs['weight_step'] <= 0:
+            raise serializers.ValidationError({"weight_step": "Weight step must be greater than 0"})
+
+        rows = int((attrs['weight_to'] - attrs['weight_from']) / attrs['weight_step']) + 1
+        if rows > settings.DOSAGE_CHART_MAX_ROWS:
+            raise serializers.ValidationError(
+                {"weight_step": f"Chart would have {rows} rows, the maximum is {settings.DOSAGE_CHART_MAX_ROWS}"}
+            )
+        cells = rows * len(attrs['drugs']) * (len(attrs.get('target_units') or []) or 1)
+        if cells > settings.DOSAGE_CHART_MAX_CELLS:
+            raise serializers.ValidationError(
+                {"non_field_errors": f"Chart would have {cells} doses, the maximum is {settings.DOSAGE_CHART_MAX_CELLS}"}
+            )
+        return attrs
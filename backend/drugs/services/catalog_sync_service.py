@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from common.fast_read import build_row_mapper
+from common.models import CatalogTombstone, Species, Unit
+from common.serializers import SpeciesSerializer, UnitSerializer
+from ..models import Drug
+from ..serializers import CompactDrugSerializer
+
+# Response key -> (model, serializer); drugs reference species and units by id
+CATALOG_SECTIONS = {
+    'species': (Species, SpeciesSerializer),
+    'units': (Unit, UnitSerializer),
+    'drugs': (Drug, CompactDrugSerializer),
+}
+
+
+@contextmanager
+def _consistent_read():
+    """
+    Run the catalog reads against one snapshot, so the returned version matches
+    the returned rows. REPEATABLE READ can only be set on an outermost transaction.
+    """
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        yield
+
+
+# Versions are transaction ids shifted by VERSION_OFFSET, which keeps them above
+# every version handed out while versions were sequence values; clients still
+# holding one of those fall below the sync horizon and get a full snapshot.
+VERSION_OFFSET = 10 ** 12
+
+
+def _current_version() -> int:
+    """
+    Oldest transaction still in flight when the snapshot was taken, as a version.
+
+    Every transaction with a lower id has finished, so its changes are in this
+    snapshot; everything missing from it has a transaction id at or above the
+    version and is picked up by the next delta. Rows written by transactions
+    that were already visible but not older may be sent twice, which is harmless
+    for clients that upsert.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0] + VERSION_OFFSET
+
+
+def _horizon() -> int:
+    """Oldest version a delta is complete from; older clients need a full snapshot."""
+    pruned_before = (
+        CatalogTombstone.objects
+        .filter(table_name=CatalogTombstone.HORIZON_TABLE)
+        .aggregate(horizon=Max('change_xid'))['horizon']
+    )
+    return VERSION_OFFSET + (pruned_before or 0)
+
+
+def get_catalog(since: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get the drug catalog (species, units and drugs) as a snapshot or a delta.
+
+    Every insert and update stamps the row with the id of its transaction and
+    every delete writes a tombstone, so a client holding version N only needs
+    rows and tombstones written by transactions from N on. A `since` older
+    than the tombstone retention allows gets a full snapshot instead.
+
+    Args:
+        since: Version the client already has; None for a full snapshot
+
+    Returns:
+        Dict with `version`, `full` (True for a snapshot that replaces the
+        client's copy), the changed rows per section and, for deltas, the ids
+        deleted per section under `deleted`
+    """
+    with _consistent_read():
+        version = _current_version()
+        if since is not None and since < _horizon():
+            since = None
+        catalog: Dict[str, Any] = {'version': version, 'full': since is None}
+        for section, (model, serializer_class) in CATALOG_SECTIONS.items():
+            mapper = build_row_mapper(serializer_class)
+            queryset = model.objects.order_by('id')
+            if since is not None:
+                queryset = queryset.filter(change_xid__gte=since - VERSION_OFFSET)
+            catalog[section] = mapper.map_rows(queryset.values(*mapper.columns))
+
+        if since is not None:
+            table_sections = {model._meta.db_table: section for section, (model, _) in CATALOG_SECTIONS.items()}
+            catalog['deleted'] = {section: [] for section in CATALOG_SECTIONS}
+            tombstones = (
+                CatalogTombstone.objects
+                .filter(change_xid__gte=since - VERSION_OFFSET)
+                .order_by('change_xid', 'id')
+                .values_list('table_name', 'object_id')
+            )
+            for table_name, object_id in tombstones:
+                if table_name in table_sections:
+                    catalog['deleted'][table_sections[table_name]].append(object_id)
+
+    return catalog
+
+
+# Deletes expired tombstones and writes a horizon row: deltas stay complete only for
+# versions past every pruned tombstone's transaction and at or past any pruned
+# (expired) earlier horizon
+PRUNE_TOMBSTONES_SQL = f"""
+    WITH pruned AS (
+        DELETE FROM {CatalogTombstone._meta.db_table}
+        WHERE deleted_at < %s
+        RETURNING table_name, change_xid
+    )
+    INSERT INTO {CatalogTombstone._meta.db_table} (table_name, object_id, change_xid, deleted_at)
+    SELECT %s, 0, max(CASE WHEN table_name = %s THEN change_xid ELSE change_xid + 1 END), now()
+    FROM pruned
+    HAVING count(*) > 0
+    RETURNING (SELECT count(*) FROM pruned WHERE table_name <> %s)
+"""
+
+
+def prune_tombstones(retention_days: Optional[int] = None) -> int:
+    """
+    Delete tombstones older than `retention_days` (CATALOG_TOMBSTONE_RETENTION_DAYS
+    by default). Clients whose version predates a pruned tombstone get a full
+    snapshot from then on.
+
+    Returns:
+        The number of tombstones deleted
+    """
+    if retention_days is None:
+        retention_days = settings.CATALOG_TOMBSTONE_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    horizon_table = CatalogTombstone.HORIZON_TABLE
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(PRUNE_TOMBSTONES_SQL, [cutoff, horizon_table, horizon_table, horizon_table])
+        row = cursor.fetchone()
+    return row[0] if row else 0
@@ -6,6 +6,7 @@ from django.db import transaction
 from django.core.exceptions import ValidationError
 from ..models import CustomDrug, Unit
 from common.models import Species
+from common.services.reference_cache import species_cache, unit_cache
 
 logger = logging.getLogger(__name__)
 
@@ -56,9 +57,9 @@ def create_custom_drug(data: Dict[str, Any], user: 'AbstractUser') -> CustomDrug
         validate_custom_drug_data(data)
         
         # Get related objects
-        species: Species = Species.objects.get(id=data['species'])
-        measurement_unit: Unit = Unit.objects.get(id=data['measurement_unit'])
-        per_weight_unit: Unit = Unit.objects.get(id=data['per_weight_unit'])
+        species: Species = species_cache.get(data['species'])
+        measurement_unit: Unit = unit_cache.get(data['measurement_unit'])
+        per_weight_unit: Unit = unit_cache.get(data['per_weight_unit'])
         
         # Create custom drug in transaction
         with transaction.atomic():
@@ -128,17 +129,17 @@ def update_custom_drug(
         with transaction.atomic():
             # Update species if provided
             if 'species' in data:
-                species = Species.objects.get(id=data['species'])
+                species = species_cache.get(data['species'])
                 custom_drug.species = species
                 
             # Update measurement unit if provided
             if 'measurement_unit' in data:
-                measurement_unit = Unit.objects.get(id=data['measurement_unit'])
+                measurement_unit = unit_cache.get(data['measurement_unit'])
                 custom_drug.measurement_unit = measurement_unit
 
             # Update per weight unit if provided
             if 'per_weight_unit' in data:
-                per_weight_unit = Unit.objects.get(id=data['per_weight_unit'])
+                per_weight_unit = unit_cache.get(data['per_weight_unit'])
                 custom_drug.per_weight_unit = per_weight_unit
             
             # Update scalar fields
@@ -0,0 +1,103 @@
+import logging
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from common.services.reference_cache import unit_cache
+from common.services.unit_conversion_matrix import get_conversion_matrix
+from ..models import CustomDrug, Drug
+from .dosage_calculator_service import DRUG_FIELDS, DosageCalculationError, DosageCalculatorService
+
+logger = logging.getLogger('drugs')
+
+
+def load_drugs(items: List[Dict[str, Any]]) -> Dict[str, Dict[int, Any]]:
+    """
+    Load every drug referenced by a batch with one query per drug type.
+
+    Args:
+        items: Validated batch items with drug_id and drug_type
+
+    Returns:
+        Dict of drug_type -> {drug_id: drug}
+    """
+    ids = {'standard': set(), 'custom': set()}
+    for item in items:
+        ids[item['drug_type']].add(item['drug_id'])
+
+    return {
+        'standard': Drug.objects.only(*DRUG_FIELDS).in_bulk(ids['standard']) if ids['standard'] else {},
+        'custom': CustomDrug.objects.only(*DRUG_FIELDS, 'user_id').in_bulk(ids['custom']) if ids['custom'] else {},
+    }
+
+
+def resolve_drug(drugs: Dict[str, Dict[int, Any]], drug_id: int, drug_type: str, user):
+    """
+    Pick a preloaded drug, checking that custom drugs belong to the user.
+
+    Raises:
+        DosageCalculationError: If the drug is missing or inaccessible
+    """
+    drug = drugs[drug_type].get(drug_id)
+    if drug is None:
+        raise DosageCalculationError(f"{drug_type.capitalize()} drug with ID {drug_id} does not exist")
+    if drug_type == 'custom' and drug.user_id != user.id:
+        raise DosageCalculationError("You don't have access to this custom drug")
+    return drug
+
+
+def calculate_item(item: Dict[str, Any], drugs: Dict[str, Dict[int, Any]], user) -> Dict[str, Any]:
+    """
+    Calculate the dose for one batch item against preloaded drugs.
+
+    Raises:
+        DosageCalculationError: If the drug is missing, inaccessible or the units are incompatible
+    """
+    drug_id = item['drug_id']
+    drug = resolve_drug(drugs, drug_id, item['drug_type'], user)
+
+    source_unit = unit_cache.get(drug.measurement_unit_id)
+    target_unit = item['target_unit']
+    if not get_conversion_matrix().is_compatible(source_unit.id, target_unit.id):
+        raise DosageCalculationError(
+            f"Unit {target_unit.short_name} is not compatible with drug unit {source_unit.short_name}"
+        )
+
+    result = DosageCalculatorService.calculate_dosage_memoized(
+        drug_base_value=drug.measurement_value,
+        per_weight_value=drug.per_weight_value or Decimal('1'),
+        weight=item['weight'],
+        source_unit_id=source_unit.id,
+        target_unit_id=target_unit.id,
+    )
+    return {
+        'drug_id': drug_id,
+        'calculated_dose': result['calculated_dose'],
+        'unit': result['unit'],
+    }
+
+
+def calculate_batch(items: List[Dict[str, Any]], user) -> List[Dict[str, Any]]:
+    """
+    Calculate doses for many (drug, weight, target unit) items at once.
+
+    Drugs are loaded in at most two queries and units come from the reference
+    cache, so the cost no longer grows by several queries per item. A failing
+    item does not stop the others.
+
+    Args:
+        items: Validated batch items (drug_id, drug_type, weight, target_unit)
+        user: The user requesting the calculation, for custom drug access checks
+
+    Returns:
+        One dict per item, in input order, with either the result or `errors`
+    """
+    drugs = load_drugs(items)
+
+    results = []
+    for item in items:
+        try:
+            results.append(calculate_item(item, drugs, user))
+        except DosageCalculationError as exc:
+            logger.warning("Batch dosage item for drug %s failed: %s", item['drug_id'], exc)
+            results.append({'drug_id': item['drug_id'], 'errors': {'non_field_errors': [str(exc)]}})
+    return results
@@ -1,14 +1,22 @@
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 import logging
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from ..models import Drug, Unit
 from common.models import Species
 from typing import Dict
+from common.services import fixed_point
+from common.services.reference_cache import unit_cache
+from common.services.unit_conversion_matrix import get_conversion_matrix
 from common.services.unit_conversion_service import UnitConversionService, UnitConversionError
 
 logger = logging.getLogger('drugs')
 
+# Only the drug columns a dosage calculation needs
+DRUG_FIELDS = ('id', 'name', 'measurement_value', 'measurement_unit_id', 'per_weight_value')
+
 class DosageCalculationError(Exception):
     """Custom exception for dosage calculation errors."""
 
@@ -37,6 +45,30 @@ class DosageCalculatorService:
         Raises:
             DosageCalculationError: If calculation fails or units are incompatible
         """
+        factor = fixed_point.ONE
+        if source_unit != target_unit:
+            try:
+                factor = UnitConversionService.get_factor(source_unit, target_unit)
+            except UnitConversionError as e:
+                raise DosageCalculationError(f"Unit conversion error: {str(e)}")
+        return {
+            'calculated_dose': DosageCalculatorService.calculate_dose(drug_base_value, per_weight_value, weight, factor),
+            'unit': target_unit
+        }
+
+    @staticmethod
+    def calculate_dose(
+        drug_base_value: Decimal,
+        per_weight_value: Decimal,
+        weight: Decimal,
+        factor: Decimal = fixed_point.ONE,
+    ) -> Decimal:
+        """
+        Dose for an animal weight, multiplied by a unit conversion factor and rounded to 5 places.
+
+        Raises:
+            DosageCalculationError: If a value is not positive or the calculation fails
+        """
         try:
             # Validate input values
             if weight <= 0:
@@ -46,38 +78,69 @@ class DosageCalculatorService:
             if per_weight_value <= 0:
                 raise DosageCalculationError("Per weight value must be positive")
 
+            if settings.DOSAGE_FIXED_POINT:
+                return fixed_point.to_decimal(fixed_point.dose(drug_base_value, per_weight_value, weight, factor))
+
             # Calculate the weight factor (e.g., if drug is 100mg per 10kg and weight is 25kg, factor is 2.5)
             weight_factor = weight / per_weight_value if per_weight_value else weight
             
-            # Calculate the basic dosage
-            calculated_dose = drug_base_value * weight_factor
-            
-            # If target unit is different from source unit, convert it
-            if source_unit != target_unit:
-                try:
-                    calculated_dose = UnitConversionService.convert(
-                        calculated_dose,
-                        source_unit,
-                        target_unit
-                    )
-                except UnitConversionError as e:
-                    raise DosageCalculationError(f"Unit conversion error: {str(e)}")
-            else:
-                # Even if no conversion is needed, ensure consistent rounding
-                calculated_dose = calculated_dose.quantize(
-                    Decimal('0.00001'),
-                    rounding=ROUND_HALF_UP
-                )
-
-            return {
-                'calculated_dose': calculated_dose,
-                'unit': target_unit
-            }
+            # Calculate the basic dosage and convert it to the target unit
+            calculated_dose = drug_base_value * weight_factor * factor
+
+            # Round to 5 decimal places using ROUND_HALF_UP
+            return calculated_dose.quantize(Decimal('0.00001'), rounding=ROUND_HALF_UP)
         except DosageCalculationError:
             raise
         except Exception as e:
             raise DosageCalculationError(f"Error calculating dosage: {str(e)}")
 
+    @staticmethod
+    def calculate_dosage_memoized(
+        drug_base_value: Decimal,
+        per_weight_value: Decimal,
+        weight: Decimal,
+        source_unit_id: int,
+        target_unit_id: int,
+    ) -> Dict[str, Decimal]:
+        """
+        Dose between two units by id, behind a bounded LRU memo.
+
+        The factor comes from the id-keyed conversion matrix that request
+        validation and the dosage chart use, so any unit that validates also
+        converts. The memo key holds every input of the calculation, the drug's
+        current values and the factor included, so an edited drug or unit can
+        never be served a dose computed from its old values. Failed calculations
+        are not memoized.
+
+        Raises:
+            DosageCalculationError: If the units are unknown or incompatible, or the calculation fails
+        """
+        try:
+            factor = get_conversion_matrix().factor(source_unit_id, target_unit_id)
+        except UnitConversionError as e:
+            raise DosageCalculationError(f"Unit conversion error: {str(e)}")
+        return {
+            'calculated_dose': _memoized_dose(drug_base_value, per_weight_value, weight, factor),
+            'unit': unit_cache.get(target_unit_id).short_name
+        }
+
+    @staticmethod
+    def memo_metrics() -> Dict[str, float]:
+        """Hit/miss counters of the dosage memo for request metrics."""
+        info = _memoized_dose.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'dosage_memo_hits': info.hits,
+            'dosage_memo_misses': info.misses,
+            'dosage_memo_size': info.currsize,
+            'dosage_memo_hit_ratio': info.hits / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache(maxsize=settings.DOSAGE_MEMO_SIZE)
+def _memoized_dose(drug_base_value, per_weight_value, weight, factor) -> Decimal:
+    return DosageCalculatorService.calculate_dose(drug_base_value, per_weight_value, weight, factor)
+
 @transaction.atomic
 def calculate_dosage(drug_id: int, weight: int, species: int, target_unit: int) -> dict:
     """
@@ -0,0 +1,106 @@
+import logging
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from common.models import Unit
+from common.services.fixed_point import DoseFormula, FixedPointOverflowError
+from common.services.reference_cache import unit_cache
+from common.services.unit_conversion_matrix import get_conversion_matrix
+from common.services.unit_conversion_service import UnitConversionError
+from .dosage_batch_service import load_drugs, resolve_drug
+from .dosage_calculator_service import DosageCalculationError
+
+logger = logging.getLogger('drugs')
+
+# Doses are reported with 5 decimal places, weights are given in hundredths of a kilogram
+DOSE_SCALE = 10 ** 5
+WEIGHT_PLACES = 2
+WEIGHT_SCALE = 10 ** WEIGHT_PLACES
+
+
+def weight_steps(weight_from: Decimal, weight_to: Decimal, weight_step: Decimal) -> List[int]:
+    """Weights of the chart rows as integer hundredths, from `weight_from` up to and including `weight_to`."""
+    start, stop, step = (int(value * WEIGHT_SCALE) for value in (weight_from, weight_to, weight_step))
+    return list(range(start, stop + 1, step))
+
+
+def format_fixed(value: int, scale: int) -> str:
+    """Render a non-negative fixed-point integer with the decimal places of `scale`."""
+    places = len(str(scale)) - 1
+    return f"{value // scale}.{value % scale:0{places}d}"
+
+
+def dose_column(drug, target_unit: Unit, weights: List[int]) -> List[str]:
+    """
+    Doses of one drug in one unit for every weight, in a single integer pass.
+
+    The dose is weight * measurement_value / per_weight_value * conversion factor,
+    computed by a DoseFormula with the same results as DosageCalculatorService.
+
+    Raises:
+        DosageCalculationError: If the drug values are invalid or the units are incompatible
+    """
+    measurement_value = drug.measurement_value
+    per_weight_value = drug.per_weight_value or Decimal('1')
+    if measurement_value <= 0 or per_weight_value <= 0:
+        raise DosageCalculationError("Drug values must be positive")
+
+    try:
+        conversion = get_conversion_matrix().factor(drug.measurement_unit_id, target_unit.id)
+    except UnitConversionError as exc:
+        raise DosageCalculationError(f"Unit conversion error: {exc}") from exc
+
+    try:
+        doses = DoseFormula(measurement_value, per_weight_value, conversion).doses(weights, WEIGHT_PLACES)
+    except FixedPointOverflowError as exc:
+        raise DosageCalculationError(f"Error calculating dosage: {exc}") from exc
+    return [format_fixed(dose, DOSE_SCALE) for dose in doses]
+
+def generate_chart(
+    drugs: List[Dict[str, Any]],
+    weight_from: Decimal,
+    weight_to: Decimal,
+    weight_step: Decimal,
+    target_units: Optional[List[Any]],
+    user,
+) -> Dict[str, Any]:
+    """
+    Generate a printable dosage chart for drugs over a weight range.
+
+    Args:
+        drugs: Validated {drug_id, drug_type} items
+        weight_from: Lightest weight in the chart
+        weight_to: Heaviest weight in the chart (included when on a step)
+        weight_step: Weight increment between rows
+        target_units: Units to report doses in; each drug's own unit if empty
+        user: The requesting user, for custom drug access checks
+
+    Returns:
+        Dict with the `weights` column and one entry per drug and unit in `columns`,
+        holding either the `doses` or the `errors` for that column
+    """
+    weights = weight_steps(weight_from, weight_to, weight_step)
+    loaded = load_drugs(drugs)
+
+    columns = []
+    for item in drugs:
+        try:
+            drug = resolve_drug(loaded, item['drug_id'], item['drug_type'], user)
+        except DosageCalculationError as exc:
+            columns.append({**item, 'errors': {'non_field_errors': [str(exc)]}})
+            continue
+
+        units = target_units or [unit_cache.get(drug.measurement_unit_id)]
+        for unit in units:
+            column = {'drug_id': drug.id, 'drug_type': item['drug_type'], 'name': drug.name, 'unit': unit.short_name}
+            try:
+                column['doses'] = dose_column(drug, unit, weights)
+            except DosageCalculationError as exc:
+                logger.warning("Dosage chart column for drug %s in %s failed: %s", drug.id, unit.short_name, exc)
+                column['errors'] = {'non_field_errors': [str(exc)]}
+            columns.append(column)
+
+    return {
+        'weights': [format_fixed(weight, WEIGHT_SCALE) for weight in weights],
+        'columns': columns,
+    }
@@ -0,0 +1,121 @@
+import logging
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from common.services.table_version_service import get_table_version
+from ..models import Drug
+
+logger = logging.getLogger('drugs')
+
+
+class DrugAutocompleteIndex:
+    """
+    In-process prefix index over Drug.name and Drug.active_ingredient.
+
+    Keys are case-folded and kept in sorted arrays, so a lookup is a bisect
+    followed by a short forward scan. The index is rebuilt lazily whenever the
+    'drug' table version changes or a local model signal marks it stale.
+    """
+
+    def __init__(self):
+        # (name keys, active ingredient keys, entries by id), swapped as one unit on rebuild
+        self._snapshot: Tuple[List[Tuple[str, int]], List[Tuple[str, int]], Dict[int, Dict[str, object]]] = ([], [], {})
+        self._version: Optional[int] = None
+        # Bumped by invalidate(), so a rebuild can tell it was invalidated while loading
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Mark the index as stale so the next search rebuilds it."""
+        self._invalidations += 1
+        self._version = None
+
+    def rebuild(self) -> None:
+        """Load all drugs and rebuild the sorted key arrays."""
+        with self._lock:
+            self._rebuild()
+
+    def _is_stale(self) -> bool:
+        return self._version is None or self._version != get_table_version('drug').version
+
+    def _rebuild(self) -> None:
+        # Called with the lock held
+        invalidations = self._invalidations
+        version = get_table_version('drug').version
+        rows = Drug.objects.values_list('id', 'name', 'active_ingredient')
+
+        name_keys = []
+        ingredient_keys = []
+        entries = {}
+        for drug_id, name, active_ingredient in rows:
+            entries[drug_id] = {
+                'id': drug_id,
+                'name': name,
+                'active_ingredient': active_ingredient,
+            }
+            name_keys.extend((key, drug_id) for key in self._keys_for(name))
+            ingredient_keys.extend((key, drug_id) for key in self._keys_for(active_ingredient))
+
+        name_keys.sort()
+        ingredient_keys.sort()
+        self._snapshot = (name_keys, ingredient_keys, entries)
+        # The rows may predate a write that invalidated the index meanwhile; leave it stale then
+        if self._invalidations == invalidations:
+            self._version = version
+
+        logger.info("Rebuilt drug autocomplete index: %d drugs (version %d)", len(entries), version)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, object]]:
+        """
+        Find drugs whose name or active ingredient (or any word in them) starts with the query.
+        Name matches are returned before active ingredient matches.
+
+        Args:
+            query: Prefix typed by the user
+            limit: Maximum number of results
+
+        Returns:
+            List of dicts with id, name and active_ingredient
+        """
+        prefix = query.strip().casefold()
+        if not prefix or limit < 1:
+            return []
+
+        if self._is_stale():
+            with self._lock:
+                # Searches that saw the same stale version queue on the lock; only the first rebuilds
+                if self._is_stale():
+                    self._rebuild()
+
+        name_keys, ingredient_keys, entries = self._snapshot
+        results = []
+        seen = set()
+        for keys in (name_keys, ingredient_keys):
+            position = bisect_left(keys, (prefix,))
+            while position < len(keys) and len(results) < limit:
+                key, drug_id = keys[position]
+                if not key.startswith(prefix):
+                    break
+                if drug_id not in seen:
+                    seen.add(drug_id)
+                    results.append(entries[drug_id])
+                position += 1
+        return results
+
+    @staticmethod
+    def _keys_for(value: Optional[str]) -> List[str]:
+        """Return the full case-folded value plus each of its later words."""
+        if not value:
+            return []
+        folded = value.casefold()
+        words = folded.split()
+        return [folded] + words[1:]
+
+
+drug_autocomplete_index = DrugAutocompleteIndex()
+
+
+def autocomplete(query: str, limit: int = 10) -> List[Dict[str, object]]:
+    """Return top matching drugs for an autocomplete query."""
+    return drug_autocomplete_index.search(query, limit)
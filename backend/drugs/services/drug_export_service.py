@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import Iterator
+
+from django.db.models import QuerySet
+
+# Same columns (plus id) as the import_drugs command, so exports can be re-imported
+EXPORT_COLUMNS = [
+    'id',
+    'name',
+    'active_ingredient',
+    'species',
+    'contraindications',
+    'measurement_value',
+    'measurement_unit',
+    'per_weight_value',
+    'per_weight_unit',
+]
+
+# Lean projection resolving references to their human-readable keys
+EXPORT_PROJECTION = [
+    'id',
+    'name',
+    'active_ingredient',
+    'species__name',
+    'contraindications',
+    'measurement_value',
+    'measurement_unit__short_name',
+    'per_weight_value',
+    'per_weight_unit__short_name',
+]
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _iter_rows(queryset: QuerySet) -> Iterator[tuple]:
+    """Iterate export rows over a server-side cursor without caching model instances."""
+    return queryset.order_by('id').values_list(*EXPORT_PROJECTION).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _format_value(value):
+    """Export decimals as strings to keep their full precision, like the API does."""
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_ndjson(queryset: QuerySet) -> Iterator[str]:
+    """
+    Stream drugs as newline-delimited JSON, one batch of lines per chunk.
+
+    Args:
+        queryset: Drug or CustomDrug queryset to export
+
+    Yields:
+        Chunks of NDJSON text
+    """
+    lines = []
+    for row in _iter_rows(queryset):
+        record = dict(zip(EXPORT_COLUMNS, map(_format_value, row)))
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def iter_csv(queryset: QuerySet) -> Iterator[str]:
+    """
+    Stream drugs as CSV with a header row, one batch of rows per chunk.
+
+    Args:
+        queryset: Drug or CustomDrug queryset to export
+
+    Yields:
+        Chunks of CSV text
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    rows_in_buffer = 0
+    for row in _iter_rows(queryset):
+        writer.writerow(row)
+        rows_in_buffer += 1
+        if rows_in_buffer >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows_in_buffer = 0
+    yield buffer.getvalue()
@@ -0,0 +1,93 @@
+from typing import List, Optional, Tuple, Union
+
+from django.db.models import Case, CharField, IntegerField, Q, QuerySet, Value, When
+
+from drugs.models import CustomDrug, Drug
+
+STANDARD = 'standard'
+CUSTOM = 'custom'
+
+# Rank buckets shared by both halves of the UNION: lower is better
+RANK_EXACT_NAME = 0
+RANK_NAME_PREFIX = 1
+RANK_INGREDIENT_PREFIX = 2
+RANK_CONTAINS = 3
+
+SEARCH_ORDERING = ('rank', 'name', 'drug_type', 'id')
+
+
+def _ranked(queryset: QuerySet, drug_type: str, query: str) -> QuerySet:
+    """Project a drug queryset to the columns shared by the UNION, tagged and ranked."""
+    if query:
+        queryset = queryset.filter(Q(name__icontains=query) | Q(active_ingredient__icontains=query))
+        rank = Case(
+            When(name__iexact=query, then=Value(RANK_EXACT_NAME)),
+            When(name__istartswith=query, then=Value(RANK_NAME_PREFIX)),
+            When(active_ingredient__istartswith=query, then=Value(RANK_INGREDIENT_PREFIX)),
+            default=Value(RANK_CONTAINS),
+            output_field=IntegerField(),
+        )
+    else:
+        rank = Value(RANK_CONTAINS, output_field=IntegerField())
+
+    return (
+        queryset
+        .order_by()
+        .annotate(drug_type=Value(drug_type, output_field=CharField()), rank=rank)
+        .values('id', 'name', 'drug_type', 'rank')
+    )
+
+
+def search_drugs(user, query: str = '', species_id: Optional[int] = None) -> QuerySet:
+    """
+    Build a single UNION ALL query over standard drugs and the user's custom drugs.
+
+    Rows are ranked exact name > name prefix > ingredient prefix > substring match,
+    then ordered by name, so both drug types share one ordering and can be
+    paginated together with LIMIT/OFFSET.
+
+    Args:
+        user: The user whose custom drugs are included
+        query: Case-insensitive text matched against name and active ingredient
+        species_id: Optional species to restrict both drug types to
+
+    Returns:
+        QuerySet of dicts with id, name, drug_type and rank
+    """
+    query = query.strip()
+    drugs = Drug.objects.all()
+    custom_drugs = CustomDrug.objects.filter(user=user)
+    if species_id is not None:
+        drugs = drugs.filter(species_id=species_id)
+        custom_drugs = custom_drugs.filter(species_id=species_id)
+
+    standard = _ranked(drugs, STANDARD, query)
+    custom = _ranked(custom_drugs, CUSTOM, query)
+    return standard.union(custom, all=True).order_by(*SEARCH_ORDERING)
+
+
+def load_search_results(rows: List[dict]) -> List[Tuple[str, Union[Drug, CustomDrug]]]:
+    """
+    Load the drugs for a page of search rows, preserving the ranked order.
+
+    Uses one query per drug type; species and units come from the reference cache.
+
+    Args:
+        rows: Page of rows returned by `search_drugs`
+
+    Returns:
+        List of (drug_type, drug) pairs in ranked order
+    """
+    ids = {STANDARD: [], CUSTOM: []}
+    for row in rows:
+        ids[row['drug_type']].append(row['id'])
+
+    loaded = {
+        STANDARD: Drug.objects.in_bulk(ids[STANDARD]) if ids[STANDARD] else {},
+        CUSTOM: CustomDrug.objects.in_bulk(ids[CUSTOM]) if ids[CUSTOM] else {},
+    }
+    return [
+        (row['drug_type'], loaded[row['drug_type']][row['id']])
+        for row in rows
+        if row['id'] in loaded[row['drug_type']]
+    ]
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.services.table_version_service import invalidate_table_version
+from .models import Drug
+from .services.drug_autocomplete_service import drug_autocomplete_index
+
+
+@receiver(post_save, sender=Drug)
+@receiver(post_delete, sender=Drug)
+def drug_changed(sender, **kwargs) -> None:
+    """Make drug catalog changes visible in-process without waiting for the version check."""
+    invalidate_table_version(Drug._meta.db_table)
+    drug_autocomplete_index.invalidate()
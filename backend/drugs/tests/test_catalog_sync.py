@@ -0,0 +1,112 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from common.models import CatalogTombstone
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def drug(drug_factory):
+    return drug_factory()
+
+
+# Versions are transaction watermarks, so every request must commit like in production
+@pytest.mark.django_db(transaction=True)
+class TestCatalogSync:
+    def test_snapshot_contains_catalog_and_version(self, authenticated_client, drug, species):
+        """Test that the snapshot returns every section with compact drug references."""
+        response = authenticated_client.get(reverse('catalog-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['version'] > 0
+        assert [row['name'] for row in response.data['species']] == ["Dog"]
+        assert len(response.data['units']) == 2
+        assert response.data['drugs'][0]['species'] == species.id
+
+    def test_changes_since_version_return_only_updates_and_deletions(self, authenticated_client, drug, drug_factory):
+        """Test that a delta contains rows written and deleted after the client's version."""
+        version = authenticated_client.get(reverse('catalog-list')).data['version']
+        drug.contraindications = "Liver disease"
+        drug.save()
+        removed = drug_factory(
+            name="Metacam", active_ingredient="Meloxicam",
+            measurement_value=Decimal("1.50"), per_weight_value=Decimal("1.00")
+        )
+        removed_id = removed.id
+        removed.delete()
+
+        response = authenticated_client.get(reverse('catalog-changes'), {'since': version})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['contraindications'] for row in response.data['drugs']] == ["Liver disease"]
+        assert response.data['species'] == []
+        assert response.data['deleted'] == {'species': [], 'units': [], 'drugs': [removed_id]}
+        assert response.data['version'] > version
+
+        up_to_date = authenticated_client.get(reverse('catalog-changes'), {'since': response.data['version']})
+        assert up_to_date.data['drugs'] == []
+        assert up_to_date.data['deleted']['drugs'] == []
+
+    def test_changes_require_valid_since(self, authenticated_client):
+        """Test that a missing or malformed version is rejected."""
+        response = authenticated_client.get(reverse('catalog-changes'), {'since': 'yesterday'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_version_stays_below_transactions_still_in_flight(self, authenticated_client, drug, user):
+        """Test that rows committed after a sync by a transaction open during it are in the next delta."""
+        other = connection.get_new_connection(connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO species (name, created_at, updated_at, created_by_id) VALUES ('Cat', now(), now(), %s)",
+                    [user.id]
+                )
+            drug.contraindications = "Liver disease"
+            drug.save()
+
+            version = authenticated_client.get(reverse('catalog-list')).data['version']
+            other.commit()
+        finally:
+            other.close()
+
+        response = authenticated_client.get(reverse('catalog-changes'), {'since': version})
+
+        assert [row['name'] for row in response.data['species']] == ["Cat"]
+        assert response.data['full'] is False
+
+    def test_pruned_tombstones_force_a_full_snapshot(self, authenticated_client, drug, drug_factory):
+        """Test that clients older than the pruned tombstones get a full snapshot, newer ones a delta."""
+        old_version = authenticated_client.get(reverse('catalog-list')).data['version']
+        drug_factory(name="Metacam").delete()
+        CatalogTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=100))
+        call_command('prune_catalog_tombstones', retention_days=90, stdout=StringIO())
+        new_version = authenticated_client.get(reverse('catalog-list')).data['version']
+
+        stale = authenticated_client.get(reverse('catalog-changes'), {'since': old_version})
+        current = authenticated_client.get(reverse('catalog-changes'), {'since': new_version})
+
+        assert not CatalogTombstone.objects.exclude(table_name=CatalogTombstone.HORIZON_TABLE).exists()
+        assert stale.data['full'] is True
+        assert 'deleted' not in stale.data
+        assert [row['name'] for row in stale.data['drugs']] == ["Rimadyl"]
+        assert current.data['full'] is False
+
+    def test_expired_horizon_is_carried_forward(self, drug_factory):
+        """Test that pruning an expired horizon row keeps the horizon."""
+        drug_factory().delete()
+        CatalogTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=100))
+        call_command('prune_catalog_tombstones', retention_days=90, stdout=StringIO())
+        horizon = CatalogTombstone.objects.get().change_xid
+
+        CatalogTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=100))
+        call_command('prune_catalog_tombstones', retention_days=90, stdout=StringIO())
+
+        assert CatalogTombstone.objects.get().change_xid == horizon
@@ -0,0 +1,84 @@
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from common.models import Unit
+from drugs.models import CustomDrug
+from users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def gram_unit(user):
+    return Unit.objects.create(name="Gram", short_name="g", created_by=user)
+
+
+@pytest.fixture
+def drug(drug_factory):
+    return drug_factory()
+
+
+@pytest.fixture
+def custom_drug(drug_factory):
+    return drug_factory(
+        CustomDrug, name="My Mix", measurement_value=Decimal("50.00"), per_weight_value=Decimal("1.00")
+    )
+
+
+@pytest.mark.django_db
+class TestDosageCalcBatch:
+    def test_batch_returns_results_in_order(self, authenticated_client, drug, custom_drug, measurement_unit, gram_unit):
+        """Test that standard and custom items are calculated and returned in input order."""
+        response = authenticated_client.post(reverse('calculate-dosage-batch'), {'items': [
+            {'drug_id': drug.id, 'weight': '25', 'target_unit': measurement_unit.id},
+            {'drug_id': custom_drug.id, 'drug_type': 'custom', 'weight': '4', 'target_unit': gram_unit.id},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [
+            {'index': 0, 'drug_id': drug.id, 'calculated_dose': "250.00000", 'unit': "mg"},
+            {'index': 1, 'drug_id': custom_drug.id, 'calculated_dose': "0.20000", 'unit': "g"},
+        ]
+
+    def test_failing_items_do_not_fail_the_batch(self, authenticated_client, drug, drug_factory, measurement_unit, user):
+        """Test that invalid, missing, foreign and incompatible items get per-item errors."""
+        millilitre = Unit.objects.create(name="Millilitre", short_name="ml", created_by=user)
+        other_user = UserFactory(email='other@example.com')
+        foreign = drug_factory(
+            CustomDrug, name="Theirs", user=other_user,
+            measurement_value=Decimal("1.00"), per_weight_value=Decimal("1.00")
+        )
+
+        response = authenticated_client.post(reverse('calculate-dosage-batch'), {'items': [
+            {'drug_id': drug.id, 'weight': '0', 'target_unit': measurement_unit.id},
+            {'drug_id': drug.id + 1000, 'weight': '5', 'target_unit': measurement_unit.id},
+            {'drug_id': foreign.id, 'drug_type': 'custom', 'weight': '5', 'target_unit': measurement_unit.id},
+            {'drug_id': drug.id, 'weight': '5', 'target_unit': millilitre.id},
+            {'drug_id': drug.id, 'weight': '5', 'target_unit': measurement_unit.id},
+        ]}, format='json')
+
+        results = response.data['results']
+        assert response.status_code == status.HTTP_200_OK
+        assert 'weight' in results[0]['errors']
+        assert "does not exist" in results[1]['errors']['non_field_errors'][0]
+        assert "don't have access" in results[2]['errors']['non_field_errors'][0]
+        assert "not compatible" in results[3]['errors']['non_field_errors'][0]
+        assert results[4]['calculated_dose'] == "50.00000"
+
+    def test_batch_resolves_drugs_in_bulk(self, authenticated_client, drug, custom_drug, measurement_unit, django_assert_max_num_queries):
+        """Test that the query count does not grow with the number of items."""
+        items = [{'drug_id': drug.id, 'weight': str(weight), 'target_unit': measurement_unit.id} for weight in range(1, 30)]
+        items.append({'drug_id': custom_drug.id, 'drug_type': 'custom', 'weight': '3', 'target_unit': measurement_unit.id})
+        authenticated_client.post(reverse('calculate-dosage-batch'), {'items': items[:1]}, format='json')
+
+        with django_assert_max_num_queries(2):
+            response = authenticated_client.post(reverse('calculate-dosage-batch'), {'items': items}, format='json')
+
+        assert len(response.data['results']) == 30
+
+    def test_empty_batch_is_rejected(self, authenticated_client):
+        """Test that a batch needs at least one item."""
+        response = authenticated_client.post(reverse('calculate-dosage-batch'), {'items': []}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
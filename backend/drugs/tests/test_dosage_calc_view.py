@@ -0,0 +1,101 @@
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from common.models import Unit
+from drugs.models import CustomDrug
+from drugs.services.dosage_calculator_service import DosageCalculatorService, _memoized_dose
+from users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def drug(drug_factory):
+    return drug_factory()
+
+
+@pytest.fixture
+def custom_drug(drug_factory):
+    return drug_factory(
+        CustomDrug, name="My Mix", measurement_value=Decimal("50.00"), per_weight_value=Decimal("1.00")
+    )
+
+
+@pytest.mark.django_db
+class TestDosageCalcView:
+    def payload(self, drug, species, unit, drug_type='standard'):
+        return {
+            'drug_id': drug.id,
+            'drug_type': drug_type,
+            'weight': '25.00',
+            'species': species.id,
+            'target_unit': unit.id,
+        }
+
+    @pytest.mark.parametrize('drug_type', ['standard', 'custom'])
+    def test_calculation_runs_one_query(
+        self, authenticated_client, drug, custom_drug, species, measurement_unit, drug_type, django_assert_num_queries
+    ):
+        """Test that a calculation needs only the drug query once references are cached."""
+        url = reverse('calculate-dosage-list')
+        payload = self.payload(drug if drug_type == 'standard' else custom_drug, species, measurement_unit, drug_type)
+        # Warm the species and unit reference caches
+        authenticated_client.post(url, payload, format='json')
+
+        with django_assert_num_queries(1):
+            response = authenticated_client.post(url, payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        expected = "250.00000" if drug_type == 'standard' else "1250.00000"
+        assert response.data['calculated_dose'] == expected
+        assert response.data['unit'] == measurement_unit.short_name
+
+    def test_other_users_custom_drug_is_rejected(self, api_client, custom_drug, species, measurement_unit):
+        """Test that the custom drug access check still applies."""
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.post(
+            reverse('calculate-dosage-list'),
+            self.payload(custom_drug, species, measurement_unit, 'custom'),
+            format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "don't have access" in str(response.data)
+
+    def test_repeated_calculation_hits_memo(self, authenticated_client, drug, species, measurement_unit):
+        """Test that repeating a calculation is served from the dosage memo."""
+        _memoized_dose.cache_clear()
+        url = reverse('calculate-dosage-list')
+        for _ in range(2):
+            response = authenticated_client.post(url, self.payload(drug, species, measurement_unit), format='json')
+            assert response.data['calculated_dose'] == "250.00000"
+
+        metrics = DosageCalculatorService.memo_metrics()
+        assert metrics['dosage_memo_hits'] == 1
+        assert metrics['dosage_memo_misses'] == 1
+        assert metrics['dosage_memo_hit_ratio'] == 0.5
+
+    def test_edited_custom_drug_is_recalculated(self, authenticated_client, custom_drug, species, measurement_unit):
+        """Test that an edit to a custom drug is never answered from the memo, even without updated_at changing."""
+        url = reverse('calculate-dosage-list')
+        payload = self.payload(custom_drug, species, measurement_unit, 'custom')
+        assert authenticated_client.post(url, payload, format='json').data['calculated_dose'] == "1250.00000"
+
+        CustomDrug.objects.filter(pk=custom_drug.pk).update(measurement_value=Decimal("20.00"))
+
+        assert authenticated_client.post(url, payload, format='json').data['calculated_dose'] == "500.00000"
+
+    def test_unit_known_only_to_the_unit_table_converts(self, authenticated_client, drug, species, user):
+        """Test that a unit with a dimension and base factor but no built-in short name validates and converts."""
+        grain = Unit.objects.create(
+            name="Grain", short_name="gr", dimension=Unit.DIMENSION_MASS,
+            base_factor=Decimal("0.06479891"), created_by=user
+        )
+
+        response = authenticated_client.post(
+            reverse('calculate-dosage-list'), self.payload(drug, species, grain), format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['calculated_dose'] == "3.85809"
+        assert response.data['unit'] == "gr"
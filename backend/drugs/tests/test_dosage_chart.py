@@ -0,0 +1,101 @@
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from common.models import Unit
+from drugs.services.dosage_calculator_service import DosageCalculatorService
+from drugs.services.dosage_chart_service import dose_column, weight_steps
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def gram_unit(user):
+    return Unit.objects.create(name="Gram", short_name="g", created_by=user)
+
+
+@pytest.fixture
+def drug(drug_factory):
+    return drug_factory(
+        name="Metacam", active_ingredient="Meloxicam",
+        measurement_value=Decimal("0.13"), per_weight_value=Decimal("3.00")
+    )
+
+
+@pytest.mark.django_db
+class TestDosageChart:
+    @pytest.mark.parametrize('target_unit', ["mg", "g", "μg"])
+    def test_doses_match_dosage_calculator(self, drug, measurement_unit, user, target_unit):
+        """Test that the fixed-point chart agrees with DosageCalculatorService at every weight."""
+        unit = measurement_unit if target_unit == "mg" else Unit.objects.create(
+            name=f"Unit {target_unit}", short_name=target_unit, created_by=user
+        )
+        weights = weight_steps(Decimal("0.50"), Decimal("80.00"), Decimal("0.25"))
+
+        doses = dose_column(drug, unit, weights)
+
+        for weight, dose in zip(weights, doses):
+            expected = DosageCalculatorService.calculate_dosage(
+                drug_base_value=drug.measurement_value,
+                per_weight_value=drug.per_weight_value,
+                weight=Decimal(weight) / 100,
+                source_unit="mg",
+                target_unit=target_unit,
+            )['calculated_dose']
+            assert Decimal(dose) == expected
+
+    def test_chart_endpoint(self, authenticated_client, drug, measurement_unit, gram_unit):
+        """Test that the endpoint returns the weight column and one dose column per drug and unit."""
+        response = authenticated_client.post(reverse('calculate-dosage-chart'), {
+            'drugs': [{'drug_id': drug.id}, {'drug_id': drug.id + 1000}],
+            'weight_from': '1',
+            'weight_to': '3',
+            'weight_step': '1',
+            'target_units': [measurement_unit.id, gram_unit.id],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['weights'] == ["1.00", "2.00", "3.00"]
+        mg_column, g_column, missing = response.data['columns']
+        assert mg_column['doses'] == ["0.04333", "0.08667", "0.13000"]
+        assert g_column['doses'] == ["0.00004", "0.00009", "0.00013"]
+        assert "does not exist" in missing['errors']['non_field_errors'][0]
+
+    def test_chart_row_limit(self, authenticated_client, drug, settings):
+        """Test that charts with too many rows are rejected."""
+        settings.DOSAGE_CHART_MAX_ROWS = 10
+
+        response = authenticated_client.post(reverse('calculate-dosage-chart'), {
+            'drugs': [{'drug_id': drug.id}],
+            'weight_from': '0.5',
+            'weight_to': '80',
+            'weight_step': '0.5',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_chart_dose_limit(self, authenticated_client, drug, settings):
+        """Test that rows times drug/unit columns is capped, not only the rows."""
+        settings.DOSAGE_CHART_MAX_CELLS = 50
+
+        response = authenticated_client.post(reverse('calculate-dosage-chart'), {
+            'drugs': [{'drug_id': drug.id}] * 3,
+            'weight_from': '1',
+            'weight_to': '20',
+            'weight_step': '1',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "60 doses" in str(response.data)
+
+    def test_chart_drug_limit(self, authenticated_client, drug):
+        """Test that a chart may not list more than DOSAGE_CHART_MAX_DRUGS drugs."""
+        response = authenticated_client.post(reverse('calculate-dosage-chart'), {
+            'drugs': [{'drug_id': drug.id}] * 21,
+            'weight_from': '1',
+            'weight_to': '2',
+            'weight_step': '1',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'drugs' in response.data['error']['details']
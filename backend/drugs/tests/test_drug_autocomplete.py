@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+from common.services.table_version_service import get_table_version
+from drugs.services.drug_autocomplete_service import DrugAutocompleteIndex
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.django_db
+class TestDrugAutocompleteIndex:
+    def test_prefix_match_is_case_insensitive(self, drug_factory):
+        """Test that prefixes match names regardless of case."""
+        amoxicillin = drug_factory(name="Amoxicillin", active_ingredient="Amox trihydrate")
+        drug_factory(name="Metacam", active_ingredient="Meloxicam")
+        index = DrugAutocompleteIndex()
+
+        results = index.search("AMO")
+
+        assert [result['id'] for result in results] == [amoxicillin.id]
+        assert results[0]['name'] == "Amoxicillin"
+
+    def test_matches_active_ingredient_words_after_names(self, drug_factory):
+        """Test that later words of the active ingredient are indexed and ranked after name matches."""
+        meloxidyl = drug_factory(name="Meloxidyl", active_ingredient="Meloxicam")
+        metacam = drug_factory(name="Metacam", active_ingredient="Meloxicam")
+        index = DrugAutocompleteIndex()
+
+        results = index.search("melox")
+        assert [result['id'] for result in results] == [meloxidyl.id, metacam.id]
+
+        amoxicillin = drug_factory(name="Amoxicillin", active_ingredient="Amox trihydrate")
+        index.invalidate()
+        assert [result['id'] for result in index.search("trihyd")] == [amoxicillin.id]
+
+    def test_limit_and_empty_query(self, drug_factory):
+        """Test that limit caps the results and blank queries return nothing."""
+        for i in range(5):
+            drug_factory(name=f"Drug {i}", active_ingredient="Ingredient")
+        index = DrugAutocompleteIndex()
+
+        assert len(index.search("drug", limit=3)) == 3
+        assert index.search("   ") == []
+
+    def test_index_refreshes_after_drug_change(self, drug_factory):
+        """Test that saving a drug makes it visible to the next search."""
+        drug_factory(name="Metacam", active_ingredient="Meloxicam")
+        from drugs.services.drug_autocomplete_service import drug_autocomplete_index
+        assert drug_autocomplete_index.search("rim") == []
+
+        rimadyl = drug_factory(name="Rimadyl", active_ingredient="Carprofen")
+
+        assert [result['id'] for result in drug_autocomplete_index.search("rim")] == [rimadyl.id]
+
+    def test_invalidation_during_rebuild_keeps_index_stale(self, drug_factory, django_assert_max_num_queries):
+        """Test that a rebuild overlapping an invalidation does not mark the index as current."""
+        drug_factory(name="Metacam", active_ingredient="Meloxicam")
+        index = DrugAutocompleteIndex()
+
+        def invalidated_while_loading(table_name):
+            index.invalidate()
+            return get_table_version(table_name)
+
+        with patch('drugs.services.drug_autocomplete_service.get_table_version', invalidated_while_loading):
+            index.rebuild()
+
+        assert index._version is None
+        index.search("met")
+        with django_assert_max_num_queries(0):
+            index.search("met")
+
+
+@pytest.mark.django_db
+class TestDrugAutocompleteView:
+    def test_autocomplete_endpoint(self, authenticated_client, drug_factory):
+        """Test that the endpoint returns matching ids and names."""
+        rimadyl = drug_factory(name="Rimadyl", active_ingredient="Carprofen")
+
+        response = authenticated_client.get(reverse('drug-autocomplete'), {'q': 'rim'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [
+            {'id': rimadyl.id, 'name': "Rimadyl", 'active_ingredient': "Carprofen"}
+        ]
+
+    def test_autocomplete_invalid_limit(self, authenticated_client):
+        """Test that an out-of-range limit is rejected."""
+        response = authenticated_client.get(reverse('drug-autocomplete'), {'q': 'rim', 'limit': 0})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from drugs.models import CustomDrug, Drug
+from users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def drug(drug_factory):
+    return drug_factory()
+
+
+def streamed_text(response) -> str:
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.django_db
+class TestDrugExport:
+    def test_ndjson_export_is_default(self, authenticated_client, drug):
+        """Test that the catalog streams as NDJSON with resolved references."""
+        response = authenticated_client.get(reverse('drug-export'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        records = [json.loads(line) for line in streamed_text(response).splitlines()]
+        assert records == [{
+            'id': drug.id,
+            'name': "Rimadyl",
+            'active_ingredient': "Carprofen",
+            'species': "Dog",
+            'contraindications': None,
+            'measurement_value': "100.00000",
+            'measurement_unit': "mg",
+            'per_weight_value': "10.00000",
+            'per_weight_unit': "kg",
+        }]
+
+    def test_csv_export_round_trips_through_import(self, authenticated_client, drug, user, tmp_path):
+        """Test that a CSV export can be fed back to import_drugs unchanged."""
+        response = authenticated_client.get(reverse('drug-export'), {'format': 'csv'})
+
+        assert response['Content-Type'].startswith('text/csv')
+        content = streamed_text(response)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert rows[0]['name'] == "Rimadyl"
+
+        path = tmp_path / "drugs.csv"
+        path.write_text(content)
+        call_command('import_drugs', str(path), created_by=user.email, stdout=io.StringIO())
+        assert Drug.objects.count() == 1
+
+    def test_custom_drug_export_only_includes_own_drugs(self, authenticated_client, user, drug_factory):
+        """Test that custom drug exports are limited to the authenticated user."""
+        other_user = UserFactory(email='other@example.com')
+        for owner, name in ((user, "Mine"), (other_user, "Theirs")):
+            drug_factory(CustomDrug, name=name, user=owner)
+
+        response = authenticated_client.get(reverse('custom-drug-export'))
+
+        names = [json.loads(line)['name'] for line in streamed_text(response).splitlines()]
+        assert names == ["Mine"]
@@ -0,0 +1,71 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from common.models import Species
+from drugs.models import Drug
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def drugs(drug_factory):
+    return [drug_factory(name=f"Drug {i}", active_ingredient="Ingredient") for i in range(3)]
+
+
+@pytest.mark.django_db
+class TestDrugListRepresentation:
+    def test_sparse_fieldset(self, authenticated_client, drugs):
+        """Test that ?fields= limits each row to the requested fields."""
+        response = authenticated_client.get(reverse('drug-list'), {'fields': 'id,name'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0] == {'id': drugs[0].id, 'name': "Drug 0"}
+
+    def test_unknown_sparse_field_is_rejected(self, authenticated_client, drugs):
+        """Test that requesting a field the serializer does not have returns 400."""
+        response = authenticated_client.get(reverse('drug-list'), {'fields': 'id,price'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_compact_format_side_loads_references(self, authenticated_client, drugs, species, measurement_unit, weight_unit):
+        """Test that compact mode emits ids and a single dictionary of referenced objects."""
+        response = authenticated_client.get(reverse('drug-list'), {'format': 'compact'})
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        first = body['results'][0]
+        assert first['species'] == species.id
+        assert first['measurement_unit'] == measurement_unit.id
+        assert first['per_weight_unit'] == weight_unit.id
+        assert body['included']['species'] == {
+            str(species.id): {'id': species.id, 'name': "Dog", 'description': "Domestic dog"}
+        }
+        assert set(body['included']['units']) == {str(measurement_unit.id), str(weight_unit.id)}
+
+    def test_compact_format_with_sparse_fieldset(self, authenticated_client, drugs):
+        """Test that compact mode only side-loads references for requested fields."""
+        response = authenticated_client.get(reverse('drug-list'), {'format': 'compact', 'fields': 'id,species'})
+
+        body = response.json()
+        assert set(body['results'][0]) == {'id', 'species'}
+        assert body['included']['units'] == {}
+
+    def test_nested_references_do_not_add_queries(self, authenticated_client, drugs, django_assert_max_num_queries):
+        """Test that species and units are embedded from the reference cache, not per-row queries."""
+        authenticated_client.get(reverse('drug-list'))
+
+        with django_assert_max_num_queries(4):
+            response = authenticated_client.get(reverse('drug-list'), {'search': 'Drug'})
+
+        assert response.data['results'][0]['measurement_unit']['short_name'] == "mg"
+
+    def test_filter_by_species_and_measurement_unit(self, authenticated_client, drugs, drug_factory, user, weight_unit):
+        """Test that ?species= and ?measurement_unit= restrict the list to matching drugs."""
+        cat = Species.objects.create(name="Cat", created_by=user)
+        drug_factory(name="Cat Drug", species=cat)
+
+        by_species = authenticated_client.get(reverse('drug-list'), {'species': cat.id})
+        by_unit = authenticated_client.get(reverse('drug-list'), {'measurement_unit': weight_unit.id})
+
+        assert [row['name'] for row in by_species.data['results']] == ["Cat Drug"]
+        assert by_unit.data['results'] == []
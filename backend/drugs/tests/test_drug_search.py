@@ -0,0 +1,62 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from drugs.models import CustomDrug, Drug
+from users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+class TestUnifiedDrugSearch:
+    def test_results_merge_both_drug_types_in_rank_order(self, authenticated_client, drug_factory, user):
+        """Test that standard and custom drugs share one ranking: exact, name prefix, ingredient prefix, substring."""
+        drug_factory(Drug, name="Metacam", active_ingredient="Meloxicam")
+        drug_factory(Drug, name="Meta", active_ingredient="Other")
+        drug_factory(CustomDrug, name="Metacam Oral", active_ingredient="Meloxicam")
+        drug_factory(CustomDrug, name="Loxicom", active_ingredient="Metaloxicam")
+        drug_factory(Drug, name="Xmeta", active_ingredient="Other")
+
+        response = authenticated_client.get(reverse('drug-search'), {'q': 'meta'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [(row['name'], row['drug_type']) for row in response.data['results']] == [
+            ("Meta", 'standard'),
+            ("Metacam", 'standard'),
+            ("Metacam Oral", 'custom'),
+            ("Loxicom", 'custom'),
+            ("Xmeta", 'standard'),
+        ]
+        assert response.data['count'] == 5
+        assert response.data['results'][0]['species']['name'] == "Dog"
+
+    def test_other_users_custom_drugs_are_excluded(self, authenticated_client, drug_factory):
+        """Test that only the caller's custom drugs are searched."""
+        other_user = UserFactory(email='other@example.com')
+        drug_factory(CustomDrug, name="Rimadyl Mix", active_ingredient="Carprofen", user=other_user)
+        drug_factory(Drug, name="Rimadyl", active_ingredient="Carprofen")
+
+        response = authenticated_client.get(reverse('drug-search'), {'q': 'rimadyl'})
+
+        assert [row['name'] for row in response.data['results']] == ["Rimadyl"]
+
+    def test_search_uses_a_single_union_query(self, authenticated_client, drug_factory, user, django_assert_max_num_queries):
+        """Test that ranking and pagination run in one query, plus one load per drug type."""
+        drug_factory(Drug, name="Metacam", active_ingredient="Meloxicam")
+        drug_factory(CustomDrug, name="Metacam Oral", active_ingredient="Meloxicam")
+        authenticated_client.get(reverse('drug-search'))
+
+        with django_assert_max_num_queries(5):
+            response = authenticated_client.get(reverse('drug-search'), {'q': 'metacam', 'count': 'false'})
+
+        assert len(response.data['results']) == 2
+        assert 'count' not in response.data
+
+    def test_species_filter_applies_to_both_drug_types(self, authenticated_client, drug_factory, user):
+        """Test that ?species= restricts standard and custom drugs alike."""
+        drug_factory(Drug, name="Metacam", active_ingredient="Meloxicam")
+        drug_factory(CustomDrug, name="Metacam Oral", active_ingredient="Meloxicam")
+
+        response = authenticated_client.get(reverse('drug-search'), {'q': 'metacam', 'species': 0})
+
+        assert response.data['results'] == []
@@ -0,0 +1,94 @@
+import json
+import time
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework.utils.encoders import JSONEncoder
+from common.fast_read import build_row_mapper
+from drugs.models import Drug
+from drugs.serializers import CompactDrugSerializer, DrugSerializer
+from users.models import UserSearchHistory
+
+pytestmark = pytest.mark.integration
+
+
+def as_json(data) -> str:
+    return json.dumps(data, cls=JSONEncoder)
+
+
+@pytest.fixture
+def drug_catalog(species, measurement_unit, weight_unit, user):
+    def _create(count):
+        return Drug.objects.bulk_create([
+            Drug(
+                name=f"Drug {i:04d}",
+                active_ingredient="Ingredient",
+                species=species,
+                contraindications=None if i % 2 else "Pregnancy",
+                measurement_value=Decimal("12.5") + i,
+                measurement_unit=measurement_unit,
+                per_weight_value=Decimal("0.33333"),
+                per_weight_unit=weight_unit,
+                created_by=user
+            )
+            for i in range(count)
+        ])
+    return _create
+
+
+@pytest.mark.django_db
+class TestFastReadPath:
+    @pytest.mark.parametrize('serializer_class', [DrugSerializer, CompactDrugSerializer])
+    def test_row_mapper_matches_serializer_output(self, drug_catalog, serializer_class):
+        """Test that row mappers produce exactly the serializer's JSON."""
+        drug_catalog(5)
+        mapper = build_row_mapper(serializer_class)
+
+        fast = mapper.map_rows(Drug.objects.order_by('id').values(*mapper.columns))
+        slow = serializer_class(Drug.objects.order_by('id'), many=True).data
+
+        assert as_json(fast) == as_json(slow)
+
+    def test_history_list_matches_serializer_path(self, authenticated_client, user, settings):
+        """Test that the search history endpoint returns the same body with the fast path on and off."""
+        UserSearchHistory.objects.create(module='dosage-calc', query="Rimadyl 10 kg", created_by=user)
+        url = reverse('search-history-list')
+
+        fast = authenticated_client.get(url).content
+        settings.FAST_READ_PATH = False
+        slow = authenticated_client.get(url).content
+
+        assert fast == slow
+
+    def test_drug_list_sparse_cursor_page_matches_serializer_path(self, authenticated_client, drug_catalog, settings):
+        """Test that sparse fieldsets and cursor pagination behave the same on both paths."""
+        drug_catalog(3)
+        params = {'fields': 'name', 'pagination': 'cursor', 'page_size': 2}
+
+        fast = authenticated_client.get(reverse('drug-list'), params).content
+        settings.FAST_READ_PATH = False
+        slow = authenticated_client.get(reverse('drug-list'), params).content
+
+        assert fast == slow
+
+    @pytest.mark.slow
+    def test_row_mapper_is_faster_than_serializer(self, drug_catalog):
+        """Benchmark: mapping values() rows beats DrugSerializer on the same page of drugs."""
+        drug_catalog(500)
+        mapper = build_row_mapper(DrugSerializer)
+        rows = list(Drug.objects.values(*mapper.columns))
+        instances = list(Drug.objects.all())
+        DrugSerializer(instances[:1], many=True).data  # warm the reference cache
+
+        def best_of(func, repeat=5):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        fast = best_of(lambda: mapper.map_rows(rows))
+        slow = best_of(lambda: DrugSerializer(instances, many=True).data)
+
+        assert slow / fast > 3
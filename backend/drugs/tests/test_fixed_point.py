@@ -0,0 +1,74 @@
+import pytest
+from decimal import Decimal
+from django.test import override_settings
+from hypothesis import example, given, settings as hypothesis_settings, strategies as st
+from common.services import fixed_point
+from common.services.unit_conversion_service import UnitConversionService
+from drugs.services.dosage_calculator_service import DosageCalculationError, DosageCalculatorService
+
+pytestmark = pytest.mark.unit
+
+MASS_UNITS = list(UnitConversionService.MASS_CONVERSIONS)
+
+drug_values = st.decimals(min_value=Decimal("0.00001"), max_value=Decimal("99999.99999"), places=5)
+weights = st.decimals(min_value=Decimal("0.01"), max_value=Decimal("999.99"), places=2)
+mass_units = st.sampled_from(MASS_UNITS)
+
+
+def calculate(fixed_point_enabled, *args):
+    with override_settings(DOSAGE_FIXED_POINT=fixed_point_enabled):
+        return DosageCalculatorService.calculate_dosage(*args)['calculated_dose']
+
+
+class TestFixedPointEngine:
+    @hypothesis_settings(max_examples=500, deadline=None)
+    @given(drug_values, drug_values, weights, mass_units, mass_units)
+    # Exact ties the Decimal engine rounds down through its 28-digit intermediates
+    @example(Decimal("0.00035"), Decimal("0.7"), Decimal("0.71"), "mg", "mg")
+    @example(Decimal("0.00045"), Decimal("3"), Decimal("6.1"), "mg", "mg")
+    @example(Decimal("0.5"), Decimal("1"), Decimal("0.01"), "μg", "mg")
+    # A dose beyond the Decimal precision fails in both engines
+    @example(Decimal("12298.23445"), Decimal("1"), Decimal("81.32"), "kg", "ng")
+    def test_dose_matches_decimal_engine(self, base, per_weight, weight, source_unit, target_unit):
+        """Test that the fixed-point dose is identical to the Decimal dose, including its exponent."""
+        try:
+            expected = calculate(False, base, per_weight, weight, source_unit, target_unit)
+        except DosageCalculationError:
+            with pytest.raises(DosageCalculationError):
+                calculate(True, base, per_weight, weight, source_unit, target_unit)
+            return
+        result = calculate(True, base, per_weight, weight, source_unit, target_unit)
+        assert result == expected
+        assert str(result) == str(expected)
+
+    @hypothesis_settings(max_examples=500, deadline=None)
+    @given(
+        st.decimals(min_value=Decimal("-99999.99999"), max_value=Decimal("99999.99999"), places=7),
+        mass_units,
+        mass_units,
+    )
+    @example(Decimal("0.0000005"), "mg", "mg")
+    @example(Decimal("-0.000015"), "g", "g")
+    def test_convert_matches_decimal_engine(self, value, from_unit, to_unit):
+        """Test that fixed-point unit conversion is identical to Decimal conversion."""
+        with override_settings(DOSAGE_FIXED_POINT=False):
+            expected = UnitConversionService.convert(value, from_unit, to_unit)
+        with override_settings(DOSAGE_FIXED_POINT=True):
+            result = UnitConversionService.convert(value, from_unit, to_unit)
+        assert str(result) == str(expected)
+
+    @hypothesis_settings(max_examples=200, deadline=None)
+    @given(drug_values, drug_values, mass_units, st.lists(st.integers(min_value=1, max_value=99999), min_size=1))
+    @example(Decimal("0.00035"), Decimal("0.7"), "mg", [71, 70, 140])
+    def test_dose_formula_matches_decimal_engine(self, base, per_weight, target_unit, weight_steps):
+        """Test that a prepared DoseFormula gives the Decimal dose for every weight."""
+        formula = fixed_point.DoseFormula(base, per_weight, UnitConversionService.get_factor("mg", target_unit))
+        doses = formula.doses(weight_steps, 2)
+        for weight, dose in zip(weight_steps, doses):
+            expected = calculate(False, base, per_weight, Decimal(weight).scaleb(-2), "mg", target_unit)
+            assert fixed_point.to_decimal(dose) == expected
+
+    def test_overflow_raises(self):
+        """Test that a dose beyond the Decimal precision raises like the Decimal engine."""
+        with pytest.raises(fixed_point.FixedPointOverflowError):
+            fixed_point.dose(Decimal("99999.99999"), Decimal("0.00001"), Decimal("999.99"), Decimal("1E+18"))
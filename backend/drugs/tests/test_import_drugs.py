@@ -0,0 +1,85 @@
+import json
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from drugs.models import Drug
+
+pytestmark = pytest.mark.integration
+
+CSV_HEADER = "name,active_ingredient,species,measurement_value,measurement_unit,per_weight_value,per_weight_unit,contraindications\n"
+
+
+def run_import(path, user, **options):
+    out = StringIO()
+    call_command('import_drugs', str(path), created_by=user.email, stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportDrugsCommand:
+    def test_csv_import_inserts_and_updates(self, tmp_path, user, species, measurement_unit, weight_unit, drug_factory):
+        """Test that new rows are inserted and rows matching an existing drug update it."""
+        existing = drug_factory(measurement_value=Decimal("50.00"))
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            CSV_HEADER
+            + "Rimadyl,Carprofen,Dog,100,mg,10,kg,Liver disease\n"
+            + f"Metacam,Meloxicam,{species.id},1.5,{measurement_unit.id},1,Kilogram,\n"
+        )
+
+        output = run_import(path, user)
+
+        existing.refresh_from_db()
+        assert existing.measurement_value == Decimal("100.00000")
+        assert existing.contraindications == "Liver disease"
+        metacam = Drug.objects.get(name="Metacam")
+        assert metacam.per_weight_unit == weight_unit
+        assert metacam.contraindications is None
+        assert "1 inserted, 1 updated, 0 rejected" in output
+
+    def test_invalid_rows_are_rejected_with_reasons(self, tmp_path, user, species, measurement_unit, weight_unit):
+        """Test that set-based validation rejects bad rows without aborting the import."""
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            CSV_HEADER
+            + "Metacam,Meloxicam,Dog,-1,mg,1,kg,\n"
+            + "Metacam,Meloxicam,Unicorn,1,mg,1,kg,\n"
+            + "Metacam,Meloxicam,Dog,abc,mg,1,kg,\n"
+            + "Rimadyl,Carprofen,Dog,100,mg,10,kg,\n"
+        )
+        report_path = tmp_path / "errors.csv"
+
+        output = run_import(path, user, error_report=str(report_path))
+
+        assert list(Drug.objects.values_list('name', flat=True)) == ["Rimadyl"]
+        assert "Measurement value must be positive" in output
+        assert "Invalid species: Unicorn" in output
+        assert "1 inserted, 0 updated, 3 rejected" in output
+        assert len(report_path.read_text().splitlines()) == 4
+
+    def test_ndjson_import(self, tmp_path, user, species, measurement_unit, weight_unit):
+        """Test that NDJSON records are streamed through the same pipeline."""
+        path = tmp_path / "catalog.ndjson"
+        records = [
+            {"name": "Metacam", "active_ingredient": "Meloxicam", "species": "Dog",
+             "measurement_value": 1.5, "measurement_unit": "mg", "per_weight_value": 1, "per_weight_unit": "kg"},
+            {"name": "Rimadyl", "active_ingredient": "Carprofen", "species": "Dog",
+             "measurement_value": "100", "measurement_unit": "mg", "per_weight_value": "10", "per_weight_unit": "kg",
+             "contraindications": "Liver disease"},
+        ]
+        path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+        run_import(path, user)
+
+        assert Drug.objects.count() == 2
+        assert Drug.objects.get(name="Metacam").measurement_value == Decimal("1.50000")
+
+    def test_dry_run_writes_nothing(self, tmp_path, user, species, measurement_unit, weight_unit):
+        """Test that --dry-run validates without touching the drug table."""
+        path = tmp_path / "catalog.csv"
+        path.write_text(CSV_HEADER + "Rimadyl,Carprofen,Dog,100,mg,10,kg,\n")
+
+        run_import(path, user, dry_run=True)
+
+        assert not Drug.objects.exists()
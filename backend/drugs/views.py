@@ -1,40 +1,193 @@
 from decimal import Decimal, InvalidOperation
-from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.filters import SearchFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin, CreateModelMixin
 from rest_framework import status
 from rest_framework.views import APIView
+from django.http import StreamingHttpResponse
 from django.views.decorators.gzip import gzip_page
 from django.utils.decorators import method_decorator
+from common.conditional import table_version_condition
+from common.fast_read import FastListMixin
 from common.metrics import track_metrics
+from common.pagination import CountOptionalPageNumberPagination
+from common.renderers import CompactJSONRenderer, CSVRenderer, NDJSONRenderer
+from common.serializers import SpeciesSerializer, UnitSerializer
+from common.services.reference_cache import species_cache, unit_cache
+from .filters import CustomDrugFilter, DrugFilter
 from .models import Drug, CustomDrug
 from .serializers import (
     DrugSerializer,
+    CompactDrugSerializer,
+    CompactCustomDrugSerializer,
     CreateCustomDrugSerializer,
     CustomDrugSerializer,
     UpdateCustomDrugSerializer,
+    DosageCalcBatchInputSerializer,
     DosageCalcInputSerializer,
+    DosageCalcItemSerializer,
     DosageCalcResultSerializer,
+    DosageChartInputSerializer,
 )
 from .services.dosage_calculator_service import DosageCalculatorService
+from .services import catalog_sync_service, dosage_batch_service, dosage_chart_service, drug_autocomplete_service, drug_export_service, drug_search_service
 import logging
 
 logger = logging.getLogger('drugs')
 
+
+def export_drugs_response(request, queryset, filename: str) -> StreamingHttpResponse:
+    """Stream a drug queryset as NDJSON or CSV depending on the negotiated renderer."""
+    if request.accepted_renderer.format == CSVRenderer.format:
+        content = drug_export_service.iter_csv(queryset)
+        extension = 'csv'
+    else:
+        content = drug_export_service.iter_ndjson(queryset)
+        extension = 'ndjson'
+
+    renderer = request.accepted_renderer
+    response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
+
+
+class DrugListingMixin(FastListMixin):
+    """
+    List support for sparse fieldsets (`?fields=id,name`) and a compact
+    representation (`?format=compact`) that emits species and units as ids
+    with each referenced object side-loaded once under `included`.
+    Rows are built by the fast read path unless FAST_READ_PATH is disabled.
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactJSONRenderer]
+    compact_serializer_class = None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'list':
+            context['fields'] = self.get_requested_fields()
+        return context
+
+    def get_requested_fields(self):
+        """Parse `?fields=` into a list of field names, rejecting unknown ones."""
+        raw_fields = self.request.query_params.get('fields')
+        if not raw_fields:
+            return None
+
+        requested = [name.strip() for name in raw_fields.split(',') if name.strip()]
+        unknown = set(requested) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+        return requested
+
+    def is_compact(self) -> bool:
+        return getattr(self.request.accepted_renderer, 'format', None) == CompactJSONRenderer.format
+
+    def get_list_serializer_class(self):
+        return self.compact_serializer_class if self.is_compact() else self.get_serializer_class()
+
+    def get_list_response(self, data, paginated: bool) -> Response:
+        if not self.is_compact():
+            return super().get_list_response(data, paginated)
+
+        included = self.get_included(data)
+        if not paginated:
+            return Response({'results': data, 'included': included})
+        response = self.get_paginated_response(data)
+        response.data['included'] = included
+        return response
+
+    def get_included(self, data) -> dict:
+        """Collect the species and units referenced by compact drug rows from the reference cache."""
+        species_ids = set()
+        unit_ids = set()
+        for row in data:
+            if row.get('species') is not None:
+                species_ids.add(row['species'])
+            for unit_field in ('measurement_unit', 'per_weight_unit'):
+                if row.get(unit_field) is not None:
+                    unit_ids.add(row[unit_field])
+
+        return {
+            'species': {pk: species_cache.representation(pk, SpeciesSerializer) for pk in sorted(species_ids)},
+            'units': {pk: unit_cache.representation(pk, UnitSerializer) for pk in sorted(unit_ids)},
+        }
+
+
 @method_decorator(gzip_page, name='list')
 @method_decorator(track_metrics('drug_list'), name='list')
-class DrugListView(GenericViewSet, ListModelMixin):
+@method_decorator(table_version_condition('drug', 'species', 'unit'), name='list')
+class DrugListView(DrugListingMixin, GenericViewSet, ListModelMixin):
     """
     API endpoint for retrieving a paginated list of drugs.
-    Supports filtering by name or active ingredient.
+    Supports searching by name or active ingredient and filtering by species and measurement unit.
     """
     serializer_class = DrugSerializer
-    queryset = Drug.objects.all().select_related('species', 'measurement_unit', 'per_weight_unit')
-    filter_backends = [SearchFilter]
+    compact_serializer_class = CompactDrugSerializer
+    queryset = Drug.objects.order_by('name', 'id')
+    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filterset_class = DrugFilter
     search_fields = ['name', 'active_ingredient']
+    cursor_ordering = ('name', 'id')
+
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    @method_decorator(track_metrics('drug_autocomplete'))
+    def autocomplete(self, request):
+        """
+        Return top drugs whose name or active ingredient starts with `q`.
+        Served from an in-process prefix index instead of the database.
+        """
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', settings.DRUG_AUTOCOMPLETE_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'Limit must be a valid number'})
+        if limit < 1 or limit > settings.DRUG_AUTOCOMPLETE_MAX_LIMIT:
+            raise ValidationError({'limit': f'Limit must be between 1 and {settings.DRUG_AUTOCOMPLETE_MAX_LIMIT}'})
+
+        results = drug_autocomplete_service.autocomplete(query, limit)
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='search', pagination_class=CountOptionalPageNumberPagination)
+    @method_decorator(gzip_page)
+    @method_decorator(track_metrics('drug_search'))
+    def search(self, request):
+        """
+        Search standard drugs and the user's custom drugs in one ranked, paginated list,
+        optionally restricted to one species (`?species=<id>`).
+        Each result carries `drug_type` ('standard' or 'custom'), matching the dosage calculator input.
+        """
+        query = request.query_params.get('q', '')
+        species_id = request.query_params.get('species')
+        if species_id is not None:
+            try:
+                species_id = int(species_id)
+            except ValueError:
+                raise ValidationError({'species': 'Species must be a valid id'})
+
+        page = self.paginate_queryset(drug_search_service.search_drugs(request.user, query, species_id))
+        serializer_classes = {'standard': DrugSerializer, 'custom': CustomDrugSerializer}
+        results = [
+            {**serializer_classes[drug_type](drug).data, 'drug_type': drug_type}
+            for drug_type, drug in drug_search_service.load_search_results(page)
+        ]
+        return self.get_paginated_response(results)
+
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[NDJSONRenderer, CSVRenderer])
+    @method_decorator(gzip_page)
+    @method_decorator(track_metrics('drug_export'))
+    def export(self, request):
+        """
+        Stream the full drug catalog as NDJSON (default) or CSV (`?format=csv`).
+        Rows are read through a server-side cursor, so memory use does not grow with the catalog.
+        """
+        return export_drugs_response(request, Drug.objects.all(), 'drugs')
 
 
 @method_decorator(gzip_page, name='list')
@@ -43,15 +196,18 @@ class DrugListView(GenericViewSet, ListModelMixin):
 @method_decorator(track_metrics('custom_drug_detail_retrieve'), name='retrieve')
 @method_decorator(track_metrics('custom_drug_detail_update'), name='update')
 @method_decorator(track_metrics('custom_drug_detail_destroy'), name='destroy')
-class CustomDrugDetailView(GenericViewSet, ListModelMixin, RetrieveModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin):
+class CustomDrugDetailView(DrugListingMixin, GenericViewSet, ListModelMixin, RetrieveModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin):
     """List
     API endpoint for managing a specific custom drug.
     Supports GET, PUT, PATCH, and DELETE operations.
     Only the owner can access or modify their custom drugs.
     """
-    queryset = CustomDrug.objects.select_related('species', 'measurement_unit', 'per_weight_unit')
-    filter_backends = [SearchFilter]
+    queryset = CustomDrug.objects.all()
+    compact_serializer_class = CompactCustomDrugSerializer
+    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filterset_class = CustomDrugFilter
     search_fields = ['name', 'active_ingredient']
+    cursor_ordering = ('-created_at', '-id')
 
     def get_serializer_class(self):
         """Use different serializers for different operations."""
@@ -86,6 +242,13 @@ class CustomDrugDetailView(GenericViewSet, ListModelMixin, RetrieveModelMixin, C
         
         return queryset
 
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[NDJSONRenderer, CSVRenderer])
+    @method_decorator(gzip_page)
+    @method_decorator(track_metrics('custom_drug_export'))
+    def export(self, request):
+        """Stream the authenticated user's custom drugs as NDJSON (default) or CSV (`?format=csv`)."""
+        return export_drugs_response(request, CustomDrug.objects.filter(user=request.user), 'custom-drugs')
+
     def perform_update(self, serializer):   
         instance = self.get_object()
         if instance.user != self.request.user:
@@ -97,7 +260,37 @@ class CustomDrugDetailView(GenericViewSet, ListModelMixin, RetrieveModelMixin, C
             raise PermissionDenied("You do not have permission to delete this drug.")
         instance.delete()
 
-@method_decorator(track_metrics('calculate_dosage'), name='create')
+@method_decorator(gzip_page, name='list')
+@method_decorator(gzip_page, name='changes')
+@method_decorator(track_metrics('catalog_snapshot'), name='list')
+@method_decorator(track_metrics('catalog_changes'), name='changes')
+@method_decorator(table_version_condition('drug', 'species', 'unit'), name='list')
+@method_decorator(table_version_condition('drug', 'species', 'unit'), name='changes')
+class CatalogSyncView(GenericViewSet):
+    """
+    API endpoint for keeping a client-side copy of the drug catalog in sync.
+    GET returns a versioned snapshot of species, units and drugs;
+    GET changes/?since=<version> returns only rows changed or deleted since that version,
+    or a full snapshot (`full` true) when the version predates the tombstone retention.
+    """
+
+    def list(self, request):
+        return Response(catalog_sync_service.get_catalog(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        raw_since = request.query_params.get('since')
+        try:
+            since = int(raw_since)
+        except (TypeError, ValueError):
+            raise ValidationError({'since': 'Since must be a catalog version number'})
+        if since < 0:
+            raise ValidationError({'since': 'Since must not be negative'})
+
+        return Response(catalog_sync_service.get_catalog(since=since), status=status.HTTP_200_OK)
+
+
+@method_decorator(track_metrics('calculate_dosage', DosageCalculatorService.memo_metrics), name='create')
 class DosageCalculatorView(GenericViewSet, CreateModelMixin):
     """
     API view for calculating drug dosage based on input parameters.
@@ -119,4 +312,53 @@ class DosageCalculatorView(GenericViewSet, CreateModelMixin):
         output_serializer.is_valid(raise_exception=True)
         return Response(output_serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'], url_path='batch', serializer_class=DosageCalcBatchInputSerializer)
+    @method_decorator(track_metrics('calculate_dosage_batch', DosageCalculatorService.memo_metrics))
+    def batch(self, request):
+        """
+        Calculate many doses in one request.
+        Returns one result per item, in order; invalid items carry `errors` instead of a dose.
+        """
+        input_serializer = self.get_serializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+
+        results = [None] * len(input_serializer.validated_data['items'])
+        valid_indexes = []
+        valid_items = []
+        for index, raw_item in enumerate(input_serializer.validated_data['items']):
+            item_serializer = DosageCalcItemSerializer(data=raw_item)
+            if item_serializer.is_valid():
+                valid_indexes.append(index)
+                valid_items.append(item_serializer.validated_data)
+            else:
+                results[index] = {'index': index, 'drug_id': raw_item.get('drug_id'), 'errors': item_serializer.errors}
+
+        for index, result in zip(valid_indexes, dosage_batch_service.calculate_batch(valid_items, request.user)):
+            if 'errors' not in result:
+                output_serializer = DosageCalcResultSerializer(data=result)
+                output_serializer.is_valid(raise_exception=True)
+                result = output_serializer.data
+            results[index] = {'index': index, **result}
+
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='chart', serializer_class=DosageChartInputSerializer)
+    @method_decorator(gzip_page)
+    @method_decorator(track_metrics('calculate_dosage_chart'))
+    def chart(self, request):
+        """
+        Generate a dosage chart for one or more drugs over a weight range and set of target units.
+        """
+        input_serializer = self.get_serializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        data = input_serializer.validated_data
 
+        chart = dosage_chart_service.generate_chart(
+            drugs=data['drugs'],
+            weight_from=data['weight_from'],
+            weight_to=data['weight_to'],
+            weight_step=data['weight_step'],
+            target_units=data.get('target_units'),
+            user=request.user,
+        )
+        return Response(chart, status=status.HTTP_200_OK)
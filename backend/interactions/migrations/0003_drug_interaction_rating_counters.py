@@ -0,0 +1,43 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+# Start the counters from the ratings given so far
+BACKFILL_SQL = """
+UPDATE drug_interaction t SET
+    rating_up = c.up,
+    rating_down = c.down
+FROM (
+    SELECT r.object_id,
+           count(*) FILTER (WHERE r.rating = 'up') AS up,
+           count(*) FILTER (WHERE r.rating = 'down') AS down
+    FROM rating r
+    JOIN django_content_type ct ON ct.id = r.content_type_id
+    WHERE ct.app_label = 'interactions' AND ct.model = 'druginteraction'
+    GROUP BY r.object_id
+) c
+WHERE t.id = c.object_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interactions", "0002_initial"),
+        ("common", "0002_initial"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="druginteraction",
+            name="rating_down",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="druginteraction",
+            name="rating_up",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interactions", "0003_drug_interaction_rating_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="druginteraction",
+            name="regeneration_requested_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
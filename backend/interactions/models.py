@@ -1,9 +1,9 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericRelation
-from common.models import BaseAuditModel, Rating
+from common.models import BaseAuditModel, RatedContentModel, Rating
 from drugs.models import Drug
 
-class DrugInteraction(BaseAuditModel):
+class DrugInteraction(BaseAuditModel, RatedContentModel):
     """
     Model to store drug interaction queries and AI-generated results.
     """
@@ -21,5 +21,9 @@ class DrugInteraction(BaseAuditModel):
             models.Index(fields=['created_by'])
         ]
 
+    def regenerate(self) -> 'DrugInteraction':
+        from .services.drug_interaction_service import create_interaction
+        return create_interaction(drugs=list(self.drugs.all()), user=self.created_by, context=self.context)
+
     def __str__(self) -> str:
         return str(f"Drug Interaction {self.pk} - {self.query[:50]}...")
@@ -37,6 +37,8 @@ class DrugInteractionSerializer(serializers.ModelSerializer):
             'id',
             'query',
             'result',
+            'rating_up',
+            'rating_down',
         ]
     
     def to_representation(self, instance):
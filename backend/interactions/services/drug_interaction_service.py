@@ -8,9 +8,10 @@ import json
 from common.services.openrouter_service import OpenRouterService
 from ..models import DrugInteraction
 from drugs.models import Drug
-from common.services import rating_service
+from common.services import ai_result_policy, rating_service
 from django.db import models
 from django.db.models import Q, Count
+from django.db.models.expressions import RawSQL
 from functools import reduce
 from operator import and_
 
@@ -21,43 +22,32 @@ class DrugInteractionValidationError(Exception):
 
 
 
-def find_interaction_with_same_drugs(drug_ids: list[int]) -> Optional[DrugInteraction]:
+def interaction_variants(drug_ids: list[int]) -> models.QuerySet:
     """
-    Find interaction with exactly the same drugs using raw SQL.
+    All cached interactions generated for exactly the same set of drugs.
     """
-    
     sql = """
-    WITH drug_counts AS (
-        SELECT 
-            di.id,
-            COUNT(*) as drug_count,
-            ARRAY_AGG(d.id ORDER BY d.id) as drug_ids
-        FROM drug_interaction di
-        JOIN drug_interaction_drugs did ON di.id = did.druginteraction_id
-        JOIN drug d ON did.drug_id = d.id
-        GROUP BY di.id
-        HAVING COUNT(*) = %s
-    )
-    SELECT di.*
-    FROM drug_counts dc
-    JOIN drug_interaction di ON di.id = dc.id
-    WHERE dc.drug_ids = (
-        SELECT ARRAY_AGG(id ORDER BY id)
-        FROM unnest(%s::bigint[]) AS id
-    )
-    LIMIT 1;
+    SELECT did.druginteraction_id
+    FROM drug_interaction_drugs did
+    GROUP BY did.druginteraction_id
+    HAVING COUNT(*) = %s
+       AND ARRAY_AGG(did.drug_id ORDER BY did.drug_id) = (
+           SELECT ARRAY_AGG(id ORDER BY id)
+           FROM unnest(%s::bigint[]) AS id
+       )
     """
-    
-    # Use list() to execute the query and get results
-    results = list(DrugInteraction.objects.raw(
-        sql, 
-        [len(drug_ids), drug_ids]
-    ))
+    return DrugInteraction.objects.filter(id__in=RawSQL(sql, [len(drug_ids), drug_ids]))
 
-    logger.info(f"Found existing interaction for drugs: {drug_ids}")
-    
-    # Return first result if exists, otherwise None
-    return results[0] if results else None
+
+def find_interaction_with_same_drugs(drug_ids: list[int]) -> Optional[DrugInteraction]:
+    """
+    Find the cached interaction to serve for exactly the same drugs: the
+    best-rated variant, queued for regeneration if users rejected it.
+    """
+    interaction = ai_result_policy.select_cached_result(interaction_variants(drug_ids))
+    if interaction is not None:
+        logger.info(f"Found existing interaction {interaction.id} for drugs: {drug_ids}")
+    return interaction
 
 
 def create_interaction(*, drugs: List[Drug], user: 'AbstractUser', context: str = None) -> DrugInteraction:
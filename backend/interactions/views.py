@@ -8,6 +8,7 @@ from rest_framework import status
 from django.utils.decorators import method_decorator
 from rest_framework.viewsets import GenericViewSet
 from common.metrics import track_metrics
+from common.services import rating_service
 from .models import DrugInteraction
 from .serializers import (
     CreateDrugInteractionSerializer,
@@ -47,15 +48,19 @@ class DrugInteractionView(GenericViewSet, CreateModelMixin):
 
     @action(
         detail=True, 
-        methods=['patch'],
+        methods=['patch', 'delete'],
         url_path='rate',
         serializer_class=RateDrugInteractionSerializer,
         queryset=DrugInteraction.objects.all(),
     )
     @method_decorator(track_metrics('rate_drug_interaction'))
     def rate(self, request: Request, pk=None) -> Response:
-        """Rate a drug interaction with thumbs up/down."""
+        """Rate a drug interaction with thumbs up/down, or remove your rating with DELETE."""
         instance = self.get_object()
+        if request.method == 'DELETE':
+            rating_service.remove_rating(content_object=instance, user=request.user)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
         serializer = self.get_serializer(
             instance=instance,
             data=request.data,
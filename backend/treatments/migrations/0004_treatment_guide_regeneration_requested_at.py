@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("treatments", "0003_treatment_guide_rating_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="treatmentguide",
+            name="regeneration_requested_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,9 +1,9 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.indexes import GinIndex
-from common.models import BaseAuditModel, Rating
+from common.models import BaseAuditModel, RatedContentModel, Rating
 
-class TreatmentGuide(BaseAuditModel):
+class TreatmentGuide(BaseAuditModel, RatedContentModel):
     """
     Model to store treatment guide queries and AI-generated results.
     """
@@ -21,5 +21,9 @@ class TreatmentGuide(BaseAuditModel):
             GinIndex(fields=['factors'], name='factors_gin_idx', opclasses=['jsonb_path_ops'])
         ]
 
+    def regenerate(self) -> 'TreatmentGuide':
+        from .services.treatment_guide_service import create_treatment_guide
+        return TreatmentGuide.objects.get(pk=create_treatment_guide(factors=self.factors, user=self.created_by)['id'])
+
     def __str__(self) -> str:
         return str(f"Treatment Guide {self.pk} - {self.query[:50]}...")
@@ -68,7 +68,9 @@ class TreatmentGuideSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'result',
-            'factors'
+            'factors',
+            'rating_up',
+            'rating_down',
         ]
 
 
@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser
 from django.db.models.manager import Manager
 from typing import Optional
 from ..models import TreatmentGuide
+from common.services import ai_result_policy
 from common.services.openrouter_service import OpenRouterService
 
 logger = logging.getLogger('treatments')
@@ -15,7 +16,8 @@ class TreatmentGuideProcessingError(Exception):
 
 def find_existing_treatment_guide(factors: dict) -> Optional[TreatmentGuide]:
     """
-    Find existing treatment guide with the same factors, regardless of their order.
+    Find the cached treatment guide to serve for the same factors, regardless of their order:
+    the best-rated variant, queued for regeneration if users rejected it.
     
     Args:
         factors: Dictionary containing diagnostic factors
@@ -23,27 +25,12 @@ def find_existing_treatment_guide(factors: dict) -> Optional[TreatmentGuide]:
     Returns:
         Existing TreatmentGuide if found, None otherwise
     """
-    try:
-        # Convert factors to a normalized form for comparison
-        # Sort keys and convert to string to ensure consistent comparison
-        normalized_factors = {k: factors[k] for k in sorted(factors.keys())}
-        
-        # Query all guides and compare normalized factors
-        # Note: This is more expensive than direct DB query but ensures order-independent comparison
-        guides = TreatmentGuide.objects.all()
-        for guide in guides:
-            guide_factors = guide.factors
-            if guide_factors:
-                normalized_guide_factors = {k: guide_factors[k] for k in sorted(guide_factors.keys())}
-                if normalized_factors == normalized_guide_factors:
-                    logger.info("Found existing treatment guide with ID: %s", guide.id)
-                    return guide
-        
-        return None
-        
-    except (KeyError, AttributeError, TypeError) as e:
-        logger.warning("Error while searching for existing treatment guide: %s", str(e))
-        return None
+    # jsonb equality ignores key order; containment lets the factors GIN index find the candidates
+    variants = TreatmentGuide.objects.filter(factors__contains=factors).filter(factors=factors)
+    guide = ai_result_policy.select_cached_result(variants)
+    if guide is not None:
+        logger.info("Found existing treatment guide with ID: %s", guide.id)
+    return guide
 
 def create_treatment_guide(*, factors: dict, user: 'AbstractUser') -> dict:
     """
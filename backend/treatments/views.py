@@ -69,15 +69,19 @@ class TreatmentGuideCreateView(GenericViewSet, CreateModelMixin):
 
     @action(
         detail=True, 
-        methods=['patch'],
+        methods=['patch', 'delete'],
         url_path='rate',
         serializer_class=RateTreatmentGuideSerializer,
         queryset=TreatmentGuide.objects.all(),
     )
     @method_decorator(track_metrics('rate_treatment_guid'))
     def rate(self, request: Request, pk=None) -> Response:
-        """Rate a treatment guide with thumbs up/down."""
+        """Rate a treatment guide with thumbs up/down, or remove your rating with DELETE."""
         instance = self.get_object()
+        if request.method == 'DELETE':
+            rating_service.remove_rating(content_object=instance, user=request.user)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
         serializer = self.get_serializer(
             instance=instance,
             data=request.data,
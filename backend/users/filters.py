@@ -1,11 +1,18 @@
 from django_filters import rest_framework as filters
 from .models import UserSearchHistory
+from .services.search_history_search import search_history
 
 class UserSearchHistoryFilter(filters.FilterSet):
     from_date = filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
     to_date = filters.DateTimeFilter(field_name='created_at', lookup_expr='lte')
     module = filters.CharFilter(field_name='module')
+    q = filters.CharFilter(method='filter_query')
 
     class Meta:
         model = UserSearchHistory
-        fields = ['module', 'from_date', 'to_date']
\ No newline at end of file
+        fields = ['module', 'from_date', 'to_date', 'q']
+
+    def filter_query(self, queryset, name, value):
+        """Full-text search, best matches first."""
+        value = value.strip()
+        return search_history(queryset, value) if value else queryset
\ No newline at end of file
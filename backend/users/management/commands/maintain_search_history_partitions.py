@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.services import search_history_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly partitions of user_search_history and drop (or detach) "
+        "partitions older than SEARCH_HISTORY_RETENTION_MONTHS. Run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3, help="Future months to create partitions for")
+        parser.add_argument('--detach-only', action='store_true', help="Detach expired partitions instead of dropping them")
+
+    def handle(self, *args, **options):
+        created = search_history_partitions.ensure_partitions(options['months_ahead'])
+        removed = search_history_partitions.drop_expired_partitions(detach_only=options['detach_only'])
+        self.stdout.write(f"Partitions present: {', '.join(created)}")
+        self.stdout.write(
+            f"{'Detached' if options['detach_only'] else 'Dropped'} {len(removed)} expired partition(s) "
+            f"(retention {settings.SEARCH_HISTORY_RETENTION_MONTHS} months)"
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from users.services import search_history_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Move search history rows from the pre-partitioning user_search_history_legacy table "
+        "into the partitioned table, then drop the legacy table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help="Rows moved per transaction")
+        parser.add_argument('--keep-legacy', action='store_true', help="Keep the emptied legacy table")
+
+    def handle(self, *args, **options):
+        if not search_history_partitions.legacy_table_exists():
+            self.stdout.write("No legacy search history table; nothing to migrate")
+            return
+        moved = search_history_partitions.migrate_legacy_rows(
+            batch_size=options['batch_size'],
+            drop_legacy=not options['keep_legacy'],
+        )
+        self.stdout.write(f"Moved {moved} search history row(s)")
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The existing table is kept as user_search_history_legacy until the
+# migrate_search_history_legacy command has moved its rows across.
+PARTITION_SQL = """
+ALTER TABLE user_search_history RENAME TO user_search_history_legacy;
+ALTER INDEX user_search_history_pkey RENAME TO user_search_history_legacy_pkey;
+ALTER INDEX user_search_created_08fede_idx RENAME TO user_search_history_legacy_created_idx;
+ALTER INDEX user_search_created_d4cdf2_idx RENAME TO user_search_history_legacy_user_created_idx;
+ALTER INDEX user_search_created_9749cd_idx RENAME TO user_search_history_legacy_user_module_idx;
+
+-- Identity columns are not supported on partitioned tables before PostgreSQL 17
+CREATE SEQUENCE user_search_history_partitioned_id_seq;
+SELECT setval(
+    'user_search_history_partitioned_id_seq',
+    COALESCE((SELECT max(id) FROM user_search_history_legacy), 0) + 1,
+    false
+);
+
+CREATE TABLE user_search_history (
+    id bigint NOT NULL DEFAULT nextval('user_search_history_partitioned_id_seq'),
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    module varchar(20) NOT NULL,
+    query text NOT NULL,
+    created_by_id bigint NOT NULL
+        REFERENCES users_customuser (id) DEFERRABLE INITIALLY DEFERRED,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+ALTER SEQUENCE user_search_history_partitioned_id_seq OWNED BY user_search_history.id;
+
+CREATE INDEX user_search_created_08fede_idx ON user_search_history (created_at DESC);
+CREATE INDEX user_search_created_d4cdf2_idx ON user_search_history (created_by_id, created_at DESC);
+CREATE INDEX user_search_created_9749cd_idx ON user_search_history (created_by_id, module, created_at DESC);
+
+-- Catches rows outside every monthly partition until their month is created
+CREATE TABLE user_search_history_default PARTITION OF user_search_history DEFAULT;
+
+-- Create the partition for the month starting at month_start (UTC), moving any
+-- rows of that month out of the default partition first. Idempotent.
+CREATE FUNCTION create_search_history_partition(month_start date) RETURNS text AS $$
+DECLARE
+    partition_name text := 'user_search_history_' || to_char(month_start, 'YYYY_MM');
+    lower_bound timestamptz := month_start::timestamp AT TIME ZONE 'UTC';
+    upper_bound timestamptz := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE user_search_history INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM user_search_history_default '
+        'WHERE created_at >= %L AND created_at < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        lower_bound, upper_bound, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE user_search_history ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, lower_bound, upper_bound
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_search_history_partition(
+    (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => month))::date
+)
+FROM generate_series(0, 2) AS month;
+"""
+
+REVERSE_SQL = """
+DROP FUNCTION create_search_history_partition(date);
+DROP TABLE user_search_history;
+ALTER TABLE user_search_history_legacy RENAME TO user_search_history;
+ALTER INDEX user_search_history_legacy_pkey RENAME TO user_search_history_pkey;
+ALTER INDEX user_search_history_legacy_created_idx RENAME TO user_search_created_08fede_idx;
+ALTER INDEX user_search_history_legacy_user_created_idx RENAME TO user_search_created_d4cdf2_idx;
+ALTER INDEX user_search_history_legacy_user_module_idx RENAME TO user_search_created_9749cd_idx;
+"""
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunSQL(PARTITION_SQL, REVERSE_SQL)],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="usersearchhistory",
+                    name="created_by",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="%(class)s_created",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="usersearchhistory",
+                    name="module",
+                    field=models.CharField(
+                        help_text="Module identifier (e.g., 'drug-interaction', 'dosage-calc', 'treatment-guide')",
+                        max_length=20,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:51
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# hit_count brings the first CHECK constraint to the partitioned table; ATTACH
+# PARTITION requires new monthly partitions to carry it as well
+PARTITION_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION create_search_history_partition(month_start date) RETURNS text AS $$
+DECLARE
+    partition_name text := 'user_search_history_' || to_char(month_start, 'YYYY_MM');
+    lower_bound timestamptz := month_start::timestamp AT TIME ZONE 'UTC';
+    upper_bound timestamptz := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE user_search_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM user_search_history_default '
+        'WHERE created_at >= %L AND created_at < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        lower_bound, upper_bound, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE user_search_history ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, lower_bound, upper_bound
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_partition_search_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usersearchhistory",
+            name="hit_count",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="usersearchhistory",
+            name="last_seen",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        # Existing entries were seen once, when they were created
+        migrations.RunSQL(
+            sql="UPDATE user_search_history SET last_seen = created_at",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(sql=PARTITION_FUNCTION_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
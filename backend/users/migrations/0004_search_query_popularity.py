@@ -0,0 +1,111 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Seed the rollups from the history written so far, including rows still
+# waiting in user_search_history_legacy for migrate_search_history_legacy
+BACKFILL_SQL = """
+DO $$
+DECLARE
+    history text := 'SELECT created_by_id, module, query, hit_count, last_seen FROM user_search_history';
+BEGIN
+    IF to_regclass('user_search_history_legacy') IS NOT NULL THEN
+        history := history || ' UNION ALL SELECT created_by_id, module, query, 1, created_at'
+                           || ' FROM user_search_history_legacy';
+    END IF;
+    EXECUTE '
+        CREATE TEMPORARY TABLE search_popularity_seed AS
+        SELECT created_by_id AS user_id, module, query, md5(query) AS query_digest,
+               sum(hit_count) AS hit_count, max(last_seen) AS last_seen
+        FROM (' || history || ') AS history
+        GROUP BY created_by_id, module, query';
+END;
+$$;
+
+INSERT INTO user_search_popularity (user_id, module, query, query_digest, hit_count, user_count, last_seen)
+SELECT user_id, module, query, query_digest, hit_count, 0, last_seen
+FROM search_popularity_seed;
+
+INSERT INTO user_search_popularity (user_id, module, query, query_digest, hit_count, user_count, last_seen)
+SELECT NULL, module, min(query), query_digest, sum(hit_count), count(*), max(last_seen)
+FROM search_popularity_seed
+GROUP BY module, query_digest;
+
+DROP TABLE search_popularity_seed;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_search_history_coalescing"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchQueryPopularity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("module", models.CharField(max_length=20)),
+                ("query", models.TextField()),
+                ("query_digest", models.CharField(max_length=32)),
+                ("hit_count", models.PositiveBigIntegerField(default=0)),
+                ("user_count", models.PositiveIntegerField(default=0)),
+                ("last_seen", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_query_popularity",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Query Popularity",
+                "verbose_name_plural": "Search Query Popularity",
+                "db_table": "user_search_popularity",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "module", "-hit_count"],
+                        name="user_search_pop_user_top_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("user__isnull", True)),
+                        fields=["module", "-hit_count"],
+                        name="user_search_pop_global_top_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchquerypopularity",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("user__isnull", False)),
+                fields=("user", "module", "query_digest"),
+                name="user_search_popularity_user_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchquerypopularity",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("user__isnull", True)),
+                fields=("module", "query_digest"),
+                name="user_search_popularity_global_uniq",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import BtreeGinExtension
+from django.db import migrations
+
+# The 'simple' configuration neither stems nor drops stop words, which suits drug
+# names and queries in more than one language. Must match the config used to query
+# in users.services.search_history_search. The trigger on the partitioned table is
+# cloned to every partition, including ones attached later; backfilling before the
+# index is built keeps the index build to a single pass.
+SEARCH_VECTOR_SQL = """
+CREATE FUNCTION user_search_history_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('simple', NEW.query);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_search_history_search_vector
+    BEFORE INSERT OR UPDATE OF query ON user_search_history
+    FOR EACH ROW EXECUTE FUNCTION user_search_history_search_vector();
+
+UPDATE user_search_history SET search_vector = to_tsvector('simple', query);
+"""
+
+REVERSE_SQL = """
+DROP TRIGGER user_search_history_search_vector ON user_search_history;
+DROP FUNCTION user_search_history_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_search_query_popularity"),
+    ]
+
+    operations = [
+        BtreeGinExtension(),
+        migrations.AddField(
+            model_name="usersearchhistory",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, REVERSE_SQL),
+        migrations.AddIndex(
+            model_name="usersearchhistory",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["created_by", "search_vector"],
+                name="user_search_history_fts_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:40
+
+from django.db import migrations
+
+# user_search_history_legacy only waits for migrate_search_history_legacy. Its
+# foreign key to users_customuser made every flush (TRUNCATE of the model
+# tables) fail while it exists; the partitioned table still checks created_by
+# when the rows are moved across.
+DROP_LEGACY_FOREIGN_KEYS_SQL = """
+DO $$
+DECLARE
+    constraint_name text;
+BEGIN
+    IF to_regclass('user_search_history_legacy') IS NULL THEN
+        RETURN;
+    END IF;
+    FOR constraint_name IN
+        SELECT conname FROM pg_constraint
+        WHERE conrelid = 'user_search_history_legacy'::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE user_search_history_legacy DROP CONSTRAINT %I', constraint_name);
+    END LOOP;
+END;
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_search_history_full_text"),
+    ]
+
+    operations = [
+        migrations.RunSQL(DROP_LEGACY_FOREIGN_KEYS_SQL, migrations.RunSQL.noop),
+    ]
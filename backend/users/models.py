@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from common.models import BaseAuditModel
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
@@ -33,15 +37,31 @@ class CustomUser(AbstractUser):
 class UserSearchHistory(BaseAuditModel):
     """
     Model to store user search history across different modules.
+
+    The table is range-partitioned by month on created_at (primary key
+    (id, created_at)); see users.services.search_history_partitions.
+    Only the composite indexes below are kept, to bound per-insert index work.
     """
     module = models.CharField(
         max_length=20,
-        db_index=True,
         help_text="Module identifier (e.g., 'drug-interaction', 'dosage-calc', 'treatment-guide')"
     )
+    # Covered by the (created_by, -created_at) index
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name='%(class)s_created',
+        db_index=False
+    )
     query = models.TextField(
         help_text="The search query or interaction content"
     )
+    # Repeats of the same query within SEARCH_HISTORY_COALESCE_WINDOW of created_at
+    # are folded into this row instead of adding new ones
+    last_seen = models.DateTimeField(default=timezone.now)
+    hit_count = models.PositiveIntegerField(default=1)
+    # to_tsvector of query, set by a database trigger; see users.services.search_history_search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = 'user_search_history'
@@ -50,8 +70,65 @@ class UserSearchHistory(BaseAuditModel):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['created_by', '-created_at']),
-            models.Index(fields=['created_by', 'module', '-created_at'])
+            models.Index(fields=['created_by', 'module', '-created_at']),
+            # btree_gin lets created_by share the GIN index with the search vector
+            GinIndex(fields=['created_by', 'search_vector'], name='user_search_history_fts_idx'),
         ]
 
     def __str__(self) -> str:
         return f"{self.module} search by {self.created_by} at {self.created_at}"
+
+
+class SearchQueryPopularity(models.Model):
+    """
+    Rollup of how often a query was searched in a module, per user and globally.
+
+    Rows with a user count that user's searches; rows without one count
+    everyone's. Maintained incrementally as search history is written (see
+    users.services.search_popularity), so "frequent queries" never aggregate
+    user_search_history. Queries are matched by the md5 digest of their text,
+    which keeps the unique indexes small for long interaction queries.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='search_query_popularity',
+        null=True,
+        blank=True,
+        db_index=False
+    )
+    module = models.CharField(max_length=20)
+    query = models.TextField()
+    query_digest = models.CharField(max_length=32)
+    hit_count = models.PositiveBigIntegerField(default=0)
+    # Distinct users who searched the query; only kept on global rows
+    user_count = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        db_table = 'user_search_popularity'
+        verbose_name = 'Search Query Popularity'
+        verbose_name_plural = 'Search Query Popularity'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'module', 'query_digest'],
+                condition=models.Q(user__isnull=False),
+                name='user_search_popularity_user_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['module', 'query_digest'],
+                condition=models.Q(user__isnull=True),
+                name='user_search_popularity_global_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'module', '-hit_count'], name='user_search_pop_user_top_idx'),
+            models.Index(
+                fields=['module', '-hit_count'],
+                condition=models.Q(user__isnull=True),
+                name='user_search_pop_global_top_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.module} query searched {self.hit_count} times by {self.user or 'everyone'}"
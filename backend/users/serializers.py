@@ -15,7 +15,9 @@ class UserSearchHistorySerializer(serializers.ModelSerializer):
             'id',
             'module',
             'query',
-            'timestamp'
+            'timestamp',
+            'last_seen',
+            'hit_count'
         ]
 
 class UserSerializer(serializers.ModelSerializer):
@@ -0,0 +1,197 @@
+import atexit
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Set
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import UserSearchHistory
+from .search_popularity import EntryKey, record_hits
+
+logger = logging.getLogger('users')
+
+# Folds repeats into the newest entry of the same (user, module, query) created since
+# the window start. The lookup runs on the (created_by, module, -created_at) index and
+# only touches the partitions inside the window; matching on (id, created_at) keeps the
+# update on the row's own partition.
+COALESCE_SQL = f"""
+    UPDATE {UserSearchHistory._meta.db_table} AS history
+    SET hit_count = history.hit_count + repeat.hits, last_seen = %s, updated_at = %s
+    FROM (VALUES {{values}}) AS repeat (created_by_id, module, query, hits)
+    CROSS JOIN LATERAL (
+        SELECT recent.id, recent.created_at
+        FROM {UserSearchHistory._meta.db_table} AS recent
+        WHERE recent.created_by_id = repeat.created_by_id
+          AND recent.module = repeat.module
+          AND recent.created_at >= %s
+          AND recent.query = repeat.query
+        ORDER BY recent.created_at DESC
+        LIMIT 1
+    ) AS latest
+    WHERE history.id = latest.id AND history.created_at = latest.created_at
+    RETURNING repeat.created_by_id, repeat.module, repeat.query
+"""
+COALESCE_VALUES = "(%s::bigint, %s::varchar, %s::text, %s::integer)"
+
+
+def _key(entry: UserSearchHistory) -> EntryKey:
+    return entry.created_by_id, entry.module, entry.query
+
+
+def _coalesce_into_recent(groups: Dict[EntryKey, List[UserSearchHistory]], now, window: int) -> Set[EntryKey]:
+    """Add the hits of each group to its recent entry in one UPDATE. Returns the keys that had one."""
+    params = [now, now]
+    for key, group in groups.items():
+        params.extend((*key, len(group)))
+    params.append(now - timedelta(seconds=window))
+    sql = COALESCE_SQL.format(values=', '.join([COALESCE_VALUES] * len(groups)))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {tuple(row) for row in cursor.fetchall()}
+
+
+def write_entries(entries: List[UserSearchHistory], window: Optional[int] = None) -> int:
+    """
+    Write buffered entries, folding repeated queries into existing rows.
+
+    Entries repeating a (user, module, query) within `window` seconds
+    (SEARCH_HISTORY_COALESCE_WINDOW by default) of the newest matching row
+    bump its hit_count and last_seen; the rest are inserted with one
+    bulk_create, identical entries of the batch merged into one row.
+    A window of 0 inserts every entry. The query popularity rollups are
+    updated in the same transaction.
+
+    Returns:
+        The number of rows inserted
+    """
+    window = settings.SEARCH_HISTORY_COALESCE_WINDOW if window is None else window
+    now = timezone.now()
+    groups: Dict[EntryKey, List[UserSearchHistory]] = {}
+    for entry in entries:
+        groups.setdefault(_key(entry), []).append(entry)
+
+    with transaction.atomic():
+        if window:
+            coalesced = _coalesce_into_recent(groups, now, window)
+            new_entries = []
+            for key, group in groups.items():
+                if key in coalesced:
+                    continue
+                entry = group[0]
+                entry.hit_count = len(group)
+                entry.last_seen = now
+                new_entries.append(entry)
+        else:
+            new_entries = entries
+        UserSearchHistory.objects.bulk_create(new_entries)
+        record_hits({key: len(group) for key, group in groups.items()}, now)
+    return len(new_entries)
+
+
+class SearchHistoryBuffer:
+    """
+    Per-process write-behind buffer for search history entries.
+
+    Entries are collected in memory and written by write_entries once
+    `max_size` entries are waiting or the oldest has waited `max_age` seconds,
+    whichever comes first. Due entries are written by a background thread, so
+    the request that fills the buffer never waits on the database; a timer
+    covers quiet periods and the buffer is flushed at interpreter exit.
+    History is best effort: a failed write is logged and its entries are
+    dropped.
+    """
+
+    def __init__(self, max_size: int, max_age: float):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries: List[UserSearchHistory] = []
+        self._oldest: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._writers: Set[threading.Thread] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: UserSearchHistory) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._entries) >= self.max_size or time.monotonic() - self._oldest >= self.max_age:
+                writer = threading.Thread(target=self._write_in_background, args=(self._take_locked(),))
+                writer.daemon = True
+                self._writers.add(writer)
+                writer.start()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_age, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _take_locked(self) -> List[UserSearchHistory]:
+        entries, self._entries, self._oldest = self._entries, [], None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return entries
+
+    def _take(self) -> List[UserSearchHistory]:
+        with self._lock:
+            return self._take_locked()
+
+    def _write(self, entries: List[UserSearchHistory]) -> int:
+        if not entries:
+            return 0
+        try:
+            write_entries(entries)
+        except Exception as e:
+            logger.error("Dropped %d search history entries: %s", len(entries), str(e), exc_info=True)
+            return 0
+        logger.debug("Flushed %d search history entries", len(entries))
+        return len(entries)
+
+    def flush(self) -> int:
+        """Write all waiting entries in the calling thread. Returns the number of entries taken from the buffer."""
+        return self._write(self._take())
+
+    # Both run in their own thread, which must not keep a database connection open
+    def _write_in_background(self, entries: List[UserSearchHistory]) -> None:
+        try:
+            self._write(entries)
+        finally:
+            connection.close()
+            with self._lock:
+                self._writers.discard(threading.current_thread())
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+    def wait(self) -> None:
+        """Block until the background writes started so far have finished."""
+        with self._lock:
+            writers = list(self._writers)
+        for writer in writers:
+            writer.join()
+
+    def close(self) -> None:
+        """Write all waiting entries and wait for background writes, e.g. at exit."""
+        self.flush()
+        self.wait()
+
+    def clear(self) -> None:
+        """Discard waiting entries without writing them."""
+        self._take()
+
+
+search_history_buffer = SearchHistoryBuffer(
+    max_size=settings.SEARCH_HISTORY_BUFFER_SIZE,
+    max_age=settings.SEARCH_HISTORY_FLUSH_INTERVAL,
+)
+atexit.register(search_history_buffer.close)
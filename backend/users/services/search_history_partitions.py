@@ -0,0 +1,175 @@
+"""
+Maintenance of the monthly range partitions of user_search_history.
+
+Partitions are named user_search_history_YYYY_MM and cover one UTC calendar
+month of created_at; user_search_history_default catches anything else until
+its month is created. Retention drops whole partitions, which is O(1)
+regardless of how many rows they hold.
+"""
+import logging
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .search_popularity import prune_expired
+
+logger = logging.getLogger('users')
+
+PARENT_TABLE = 'user_search_history'
+DEFAULT_PARTITION = 'user_search_history_default'
+LEGACY_TABLE = 'user_search_history_legacy'
+PARTITION_NAME = re.compile(r'^user_search_history_(\d{4})_(\d{2})$')
+
+COLUMNS = 'id, created_at, updated_at, module, query, created_by_id'
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month(now: Optional[datetime] = None) -> date:
+    now = (now or timezone.now()).astimezone(dt_timezone.utc)
+    return date(now.year, now.month, 1)
+
+
+def retention_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest month still kept under SEARCH_HISTORY_RETENTION_MONTHS."""
+    month = add_months(current_month(now), -settings.SEARCH_HISTORY_RETENTION_MONTHS)
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def list_partitions() -> List[date]:
+    """Months that have a partition attached, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_partition(month: date) -> str:
+    """Create the partition for a month (moving its rows out of the default partition). Idempotent."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT create_search_history_partition(%s)", [month])
+        return cursor.fetchone()[0]
+
+
+def ensure_partitions(months_ahead: int = 3, now: Optional[datetime] = None) -> List[str]:
+    """Make sure the current month and the next `months_ahead` months have partitions."""
+    start = current_month(now)
+    return [create_partition(add_months(start, offset)) for offset in range(months_ahead + 1)]
+
+
+def drop_expired_partitions(detach_only: bool = False, now: Optional[datetime] = None) -> List[str]:
+    """
+    Remove partitions entirely older than the retention window, expired rows
+    left in the default partition and expired query popularity rollups.
+
+    Args:
+        detach_only: Detach the partitions but keep them as standalone tables (e.g. for archiving)
+
+    Returns:
+        Names of the detached or dropped partitions
+    """
+    cutoff = retention_cutoff(now)
+    expired = [month for month in list_partitions() if add_months(month, 1) <= cutoff.date()]
+    removed = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for month in expired:
+            name = f'{PARENT_TABLE}_{month:%Y_%m}'
+            cursor.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}')
+            if not detach_only:
+                _drop_table(cursor, name)
+            removed.append(name)
+        cursor.execute(f'DELETE FROM {DEFAULT_PARTITION} WHERE created_at < %s', [cutoff])
+        prune_expired(cutoff)
+    if removed:
+        logger.info("%s search history partitions: %s", "Detached" if detach_only else "Dropped", ", ".join(removed))
+    return removed
+
+
+def _drop_table(cursor, name: str) -> None:
+    # Deferred foreign key checks of rows written earlier in the same transaction
+    # must fire first: PostgreSQL refuses to drop a table with pending trigger events
+    cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    cursor.execute(f'DROP TABLE {name}')
+
+
+def legacy_table_exists() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [LEGACY_TABLE])
+        return cursor.fetchone()[0] is not None
+
+
+def migrate_legacy_rows(batch_size: int = 10000, drop_legacy: bool = True) -> int:
+    """
+    Move rows of the pre-partitioning table into the partitioned table in
+    batches, one transaction per batch, creating the partitions they need.
+    Rows older than the retention window are dropped instead of moved.
+
+    Returns:
+        Number of rows moved
+    """
+    if not legacy_table_exists():
+        return 0
+
+    cutoff = retention_cutoff()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+            FROM {LEGACY_TABLE}
+            WHERE created_at >= %s
+            """,
+            [cutoff]
+        )
+        months = [row[0] for row in cursor.fetchall()]
+    for month in months:
+        create_partition(month)
+
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH batch AS (
+                    DELETE FROM {LEGACY_TABLE}
+                    WHERE id IN (SELECT id FROM {LEGACY_TABLE} ORDER BY id LIMIT %s)
+                    RETURNING {COLUMNS}
+                ), kept AS (
+                    INSERT INTO {PARENT_TABLE} ({COLUMNS}, last_seen, hit_count)
+                    SELECT {COLUMNS}, created_at, 1 FROM batch WHERE created_at >= %s
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM batch), (SELECT count(*) FROM kept)
+                """,
+                [batch_size, cutoff]
+            )
+            taken, kept = cursor.fetchone()
+        moved += kept
+        if taken < batch_size:
+            break
+
+    if drop_legacy:
+        with connection.cursor() as cursor:
+            _drop_table(cursor, LEGACY_TABLE)
+    logger.info("Moved %d legacy search history rows", moved)
+    return moved
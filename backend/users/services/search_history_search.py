@@ -0,0 +1,26 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, QuerySet
+from django.db.models.functions import Cast
+
+# Must match the configuration of the user_search_history_search_vector trigger
+TEXT_SEARCH_CONFIG = 'simple'
+
+# Best match first; cursor pagination continues from the rank of the last row
+SEARCH_ORDERING = ('-rank', '-created_at', '-id')
+
+
+def search_history(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Full-text search over the query of search history entries.
+
+    `text` uses web search syntax ("quoted phrases", OR, -excluded words) and
+    is matched against the trigger-maintained search_vector through the
+    (created_by, search_vector) GIN index.
+
+    Returns:
+        The matching entries annotated with `rank`, ordered by SEARCH_ORDERING
+    """
+    query = SearchQuery(text, config=TEXT_SEARCH_CONFIG, search_type='websearch')
+    # ts_rank returns a float4; as float8 the rank survives the round trip through a cursor exactly
+    rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+    return queryset.filter(search_vector=query).annotate(rank=rank).order_by(*SEARCH_ORDERING)
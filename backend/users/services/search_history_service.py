@@ -1,12 +1,18 @@
 import logging
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from ..models import UserSearchHistory
+from .search_history_buffer import search_history_buffer
 
 logger = logging.getLogger('users')
 
 def add_to_history(*, module: str, query: str, user: 'AbstractUser' = None) -> UserSearchHistory:
     """
     Add a search query to user's search history.
+
+    The entry is handed to the write-behind buffer when the surrounding
+    transaction commits, so a failed request never records history and the
+    request itself pays no insert.
     
     Args:
         module: Name of the module (e.g., 'drug-interaction', 'dosage-calc', 'treatment-guide')
@@ -14,18 +20,19 @@ def add_to_history(*, module: str, query: str, user: 'AbstractUser' = None) -> U
         user: User who performed the search, if None will use mock user
     
     Returns:
-        Created UserSearchHistory instance
+        The UserSearchHistory instance, saved when the buffer is flushed
     """
     try:
         
-        history_entry = UserSearchHistory.objects.create(
+        history_entry = UserSearchHistory(
             module=module,
             query=query,
             created_by=user  # Only created_by is needed from BaseAuditModel
         )
+        transaction.on_commit(lambda: search_history_buffer.add(history_entry))
         
         logger.info(
-            "Added search history entry for user %s in module %s: %s",
+            "Queued search history entry for user %s in module %s: %s",
             user.username,
             module,
             query
@@ -0,0 +1,137 @@
+import hashlib
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from ..models import SearchQueryPopularity
+
+logger = logging.getLogger('users')
+
+# (user id, module, query) of a batch of history entries
+EntryKey = Tuple[int, str, str]
+
+TABLE = SearchQueryPopularity._meta.db_table
+
+# Returns the rows a user searched for the first time, so the global rows can count distinct users
+USER_UPSERT_SQL = f"""
+    INSERT INTO {TABLE} AS popularity (user_id, module, query, query_digest, hit_count, user_count, last_seen)
+    VALUES {{values}}
+    ON CONFLICT (user_id, module, query_digest) WHERE user_id IS NOT NULL
+    DO UPDATE SET hit_count = popularity.hit_count + EXCLUDED.hit_count, last_seen = EXCLUDED.last_seen
+    RETURNING module, query, (xmax = 0) AS inserted
+"""
+GLOBAL_UPSERT_SQL = f"""
+    INSERT INTO {TABLE} AS popularity (user_id, module, query, query_digest, hit_count, user_count, last_seen)
+    VALUES {{values}}
+    ON CONFLICT (module, query_digest) WHERE user_id IS NULL
+    DO UPDATE SET
+        hit_count = popularity.hit_count + EXCLUDED.hit_count,
+        user_count = popularity.user_count + EXCLUDED.user_count,
+        last_seen = EXCLUDED.last_seen
+"""
+ROW_VALUES = "(%s::bigint, %s, %s, %s, %s, %s, %s)"
+# Sets each global row's user_count to the number of per-user rows left for its query
+RECOUNT_USERS_SQL = f"""
+    UPDATE {TABLE} AS popularity
+    SET user_count = coalesce(counted.users, 0)
+    FROM {TABLE} AS global_row
+    LEFT JOIN (
+        SELECT module, query_digest, count(*) AS users
+        FROM {TABLE}
+        WHERE user_id IS NOT NULL
+        GROUP BY module, query_digest
+    ) AS counted USING (module, query_digest)
+    WHERE popularity.id = global_row.id
+      AND global_row.user_id IS NULL
+      AND popularity.user_count <> coalesce(counted.users, 0)
+"""
+
+
+def query_digest(query: str) -> str:
+    """md5 hex digest of a query, the same as PostgreSQL's md5(query)."""
+    return hashlib.md5(query.encode('utf-8')).hexdigest()
+
+
+def _upsert(cursor, sql: str, rows: List[tuple], now) -> None:
+    params = []
+    for user_id, module, query, hits, users in rows:
+        params.extend((user_id, module, query, query_digest(query), hits, users, now))
+    cursor.execute(sql.format(values=', '.join([ROW_VALUES] * len(rows))), params)
+
+
+def record_hits(hits: Dict[EntryKey, int], now) -> None:
+    """
+    Add the hits of a batch of history entries to the per-user and global rollups.
+
+    Two statements whatever the batch size. Must run in the transaction that
+    writes the entries, so the rollups never count history that was not written.
+    Rows are upserted in key order, so concurrent flushes lock them in the
+    same order.
+    """
+    if not hits:
+        return
+    # user_count is only kept on global rows
+    user_rows = [(*key, count, 0) for key, count in sorted(hits.items())]
+
+    with connection.cursor() as cursor:
+        _upsert(cursor, USER_UPSERT_SQL, user_rows, now)
+        new_users = Counter((module, query) for module, query, inserted in cursor.fetchall() if inserted)
+
+        global_hits = Counter()
+        for (_, module, query), count in hits.items():
+            global_hits[module, query] += count
+        global_rows = [
+            (None, module, query, count, new_users[module, query])
+            for (module, query), count in sorted(global_hits.items())
+        ]
+        _upsert(cursor, GLOBAL_UPSERT_SQL, global_rows, now)
+
+
+def prune_expired(cutoff) -> int:
+    """
+    Delete rollup rows last searched before `cutoff`, so query text is not
+    kept longer than the search history it was counted from, and recount the
+    distinct users of the remaining global rows. The recount also drops users
+    whose per-user rows were deleted along with their account.
+
+    Returns:
+        The number of rows deleted
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE last_seen < %s", [cutoff])
+        deleted = cursor.rowcount
+        cursor.execute(RECOUNT_USERS_SQL)
+    return deleted
+
+
+def top_queries(*, user=None, module: Optional[str] = None, limit: int = 10) -> List[dict]:
+    """
+    Most frequent queries of a user, or of everyone when `user` is None.
+
+    Global results only include queries searched by at least
+    SEARCH_POPULARITY_GLOBAL_MIN_USERS distinct users, so one user's
+    searches are never shown to others.
+
+    Args:
+        user: The user whose queries to return, or None for global popularity
+        module: Restrict to one module
+        limit: Number of queries to return
+
+    Returns:
+        Dicts with module, query, hit_count and last_seen, most frequent first
+    """
+    if user is None:
+        queryset = SearchQueryPopularity.objects.filter(
+            user__isnull=True,
+            user_count__gte=settings.SEARCH_POPULARITY_GLOBAL_MIN_USERS
+        )
+    else:
+        queryset = SearchQueryPopularity.objects.filter(user=user)
+    if module:
+        queryset = queryset.filter(module=module)
+    return list(
+        queryset.order_by('-hit_count', '-last_seen').values('module', 'query', 'hit_count', 'last_seen')[:limit]
+    )
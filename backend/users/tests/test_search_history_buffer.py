@@ -0,0 +1,106 @@
+import pytest
+from datetime import timedelta
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from users.models import UserSearchHistory
+from users.services import search_history_service
+from users.services.search_history_buffer import SearchHistoryBuffer, search_history_buffer, write_entries
+
+pytestmark = pytest.mark.integration
+
+
+def entry(user, i=0):
+    return UserSearchHistory(module='drug-interaction', query=f"query {i}", created_by=user)
+
+
+@pytest.mark.django_db
+class TestSearchHistoryBuffer:
+    def test_entry_is_buffered_on_commit(self, user, django_capture_on_commit_callbacks):
+        """Test that add_to_history writes nothing in the request and queues the entry on commit."""
+        with django_capture_on_commit_callbacks(execute=True):
+            search_history_service.add_to_history(module='treatment-guide', query="fever", user=user)
+            assert len(search_history_buffer) == 0
+
+        assert not UserSearchHistory.objects.exists()
+        assert search_history_buffer.flush() == 1
+        assert UserSearchHistory.objects.get().query == "fever"
+
+    def test_rolled_back_request_records_nothing(self, user, django_capture_on_commit_callbacks):
+        """Test that history added in a transaction that rolls back is never queued."""
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    search_history_service.add_to_history(module='treatment-guide', query="fever", user=user)
+                    raise RuntimeError
+
+        assert callbacks == []
+        assert len(search_history_buffer) == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_full_buffer_is_written_in_the_background(self, user):
+        """Test that the add filling the buffer runs no query itself and a writer thread stores every entry."""
+        buffer = SearchHistoryBuffer(max_size=3, max_age=60)
+        buffer.add(entry(user, 1))
+        buffer.add(entry(user, 2))
+
+        with CaptureQueriesContext(connection) as queries:
+            buffer.add(entry(user, 3))
+        buffer.wait()
+
+        assert queries.captured_queries == []
+        assert UserSearchHistory.objects.count() == 3
+        assert len(buffer) == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_flushes_when_oldest_entry_is_due(self, user):
+        """Test that an entry waiting longer than max_age is written once the next add sees it is due."""
+        buffer = SearchHistoryBuffer(max_size=100, max_age=0)
+        buffer.add(entry(user))
+        buffer.wait()
+
+        assert UserSearchHistory.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestSearchHistoryCoalescing:
+    def test_repeats_in_a_batch_become_one_row(self, user):
+        """Test that identical entries written together are stored once with their hit count."""
+        assert write_entries([entry(user, 1), entry(user, 1), entry(user, 2), entry(user, 1)], window=60) == 2
+
+        counts = dict(UserSearchHistory.objects.values_list('query', 'hit_count'))
+        assert counts == {'query 1': 3, 'query 2': 1}
+
+    def test_repeat_within_window_updates_existing_row(self, user):
+        """Test that a repeated query bumps hit_count and last_seen of the recent entry instead of inserting."""
+        write_entries([entry(user)], window=60)
+        first = UserSearchHistory.objects.get()
+
+        assert write_entries([entry(user), entry(user)], window=60) == 0
+
+        repeated = UserSearchHistory.objects.get()
+        assert repeated.id == first.id
+        assert repeated.hit_count == 3
+        assert repeated.last_seen > first.last_seen
+        assert repeated.created_at == first.created_at
+
+    def test_repeat_after_window_adds_new_row(self, user):
+        """Test that a query last recorded before the window starts a new entry."""
+        write_entries([entry(user)], window=60)
+        UserSearchHistory.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+
+        assert write_entries([entry(user)], window=60) == 1
+        assert list(UserSearchHistory.objects.values_list('hit_count', flat=True)) == [1, 1]
+
+    def test_other_user_or_module_is_not_coalesced(self, user, admin_user):
+        """Test that only entries of the same user, module and query are folded together."""
+        write_entries([entry(user)], window=60)
+        other_module = UserSearchHistory(module='treatment-guide', query="query 0", created_by=user)
+
+        assert write_entries([entry(admin_user), other_module], window=60) == 2
+        assert UserSearchHistory.objects.count() == 3
+
+    def test_zero_window_records_every_repeat(self, user):
+        """Test that coalescing is off with a window of 0."""
+        assert write_entries([entry(user), entry(user)], window=0) == 2
+        assert UserSearchHistory.objects.count() == 2
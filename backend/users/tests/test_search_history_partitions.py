@@ -0,0 +1,80 @@
+import pytest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from users.models import UserSearchHistory
+from users.services import search_history_partitions
+from users.services.search_history_partitions import add_months, current_month
+
+pytestmark = pytest.mark.integration
+
+
+def partition_of(entry):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tableoid::regclass::text FROM user_search_history WHERE id = %s", [entry.id])
+        return cursor.fetchone()[0]
+
+
+def create_entry(user, created_at=None):
+    entry = UserSearchHistory.objects.create(module='treatment-guide', query="fever", created_by=user)
+    if created_at is not None:
+        UserSearchHistory.objects.filter(id=entry.id).update(created_at=created_at)
+    return entry
+
+
+def month_start(months):
+    month = add_months(current_month(), months)
+    return datetime(month.year, month.month, 1, 12, tzinfo=dt_timezone.utc)
+
+
+@pytest.mark.django_db
+class TestSearchHistoryPartitions:
+    def test_entries_land_in_monthly_partition(self, user):
+        """Test that new history rows are stored in the current month's partition."""
+        entry = create_entry(user)
+
+        assert partition_of(entry) == f"user_search_history_{current_month():%Y_%m}"
+
+    def test_creating_partition_moves_rows_out_of_default(self, user):
+        """Test that rows parked in the default partition move into their month's new partition."""
+        entry = create_entry(user, created_at=month_start(10))
+        assert partition_of(entry) == 'user_search_history_default'
+
+        name = search_history_partitions.create_partition(add_months(current_month(), 10))
+
+        assert partition_of(entry) == name
+        assert UserSearchHistory.objects.filter(id=entry.id).exists()
+
+    def test_maintenance_drops_expired_partitions(self, user, settings):
+        """Test that partitions older than the retention window are dropped with their rows."""
+        settings.SEARCH_HISTORY_RETENTION_MONTHS = 12
+        search_history_partitions.create_partition(add_months(current_month(), -14))
+        expired = create_entry(user, created_at=month_start(-14))
+        recent = create_entry(user, created_at=timezone.now() - timedelta(days=1))
+
+        call_command('maintain_search_history_partitions', stdout=StringIO())
+
+        assert add_months(current_month(), -14) not in search_history_partitions.list_partitions()
+        assert add_months(current_month(), 3) in search_history_partitions.list_partitions()
+        assert list(UserSearchHistory.objects.values_list('id', flat=True)) == [recent.id]
+        assert not UserSearchHistory.objects.filter(id=expired.id).exists()
+
+    def test_legacy_rows_are_migrated(self, user):
+        """Test that rows of the pre-partitioning table are moved with their ids and the table dropped."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO user_search_history_legacy (id, created_at, updated_at, module, query, created_by_id)
+                VALUES (1, %s, %s, 'treatment-guide', 'recent', %s), (2, %s, %s, 'treatment-guide', 'expired', %s)
+                """,
+                [month_start(-2), month_start(-2), user.id, month_start(-20), month_start(-20), user.id]
+            )
+
+        out = StringIO()
+        call_command('migrate_search_history_legacy', '--batch-size', '1', stdout=out)
+
+        assert "Moved 1 search history row(s)" in out.getvalue()
+        assert list(UserSearchHistory.objects.values_list('id', 'query')) == [(1, 'recent')]
+        assert not search_history_partitions.legacy_table_exists()
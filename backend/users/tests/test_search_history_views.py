@@ -0,0 +1,120 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from users.models import UserSearchHistory
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def history_entries(user):
+    return [
+        UserSearchHistory.objects.create(
+            module='drug-interaction',
+            query=f"Drug interaction query with drugs: {i}",
+            created_by=user
+        )
+        for i in range(25)
+    ]
+
+
+@pytest.mark.django_db
+class TestSearchHistoryPagination:
+    def test_page_number_pagination_is_default(self, authenticated_client, history_entries):
+        """Test that page number pagination with a total count stays the default."""
+        response = authenticated_client.get(reverse('search-history-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 25
+        assert len(response.data['results']) == 20
+
+    def test_count_opt_out(self, authenticated_client, history_entries):
+        """Test that count=false omits the total but keeps navigation links."""
+        url = reverse('search-history-list')
+
+        first = authenticated_client.get(url, {'count': 'false'})
+        second = authenticated_client.get(url, {'count': 'false', 'page': 2})
+
+        assert 'count' not in first.data
+        assert first.data['next'] is not None
+        assert len(second.data['results']) == 5
+        assert second.data['next'] is None
+
+    def test_cursor_pagination_walks_all_entries(self, authenticated_client, history_entries):
+        """Test that cursor pages cover every entry exactly once, newest first."""
+        response = authenticated_client.get(reverse('search-history-list'), {'pagination': 'cursor'})
+        seen = []
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            seen.extend(entry['id'] for entry in response.data['results'])
+            if not response.data['next']:
+                break
+            response = authenticated_client.get(response.data['next'])
+
+        assert seen == [entry.id for entry in reversed(history_entries)]
+
+
+@pytest.mark.django_db
+class TestSearchHistoryFullTextSearch:
+    @pytest.fixture
+    def searchable_entries(self, user, admin_user):
+        entries = {
+            query: UserSearchHistory.objects.create(module='drug-interaction', query=query, created_by=user)
+            for query in (
+                "Drug interaction query with drugs: meloxicam, prednisolone",
+                "Meloxicam dosage for a dog",
+                "Meloxicam and prednisolone together with meloxicam overdose",
+                "Fever in cats",
+            )
+        }
+        UserSearchHistory.objects.create(module='drug-interaction', query="meloxicam", created_by=admin_user)
+        return entries
+
+    def test_search_vector_is_set_by_trigger(self, searchable_entries):
+        """Test that inserted entries get a search vector without the application computing it."""
+        assert not UserSearchHistory.objects.filter(search_vector__isnull=True).exists()
+
+    def test_returns_only_users_matching_entries_ranked(self, authenticated_client, searchable_entries):
+        """Test that q matches the user's own entries only, best match first."""
+        response = authenticated_client.get(reverse('search-history-list'), {'q': 'meloxicam'})
+
+        assert response.status_code == status.HTTP_200_OK
+        queries = [entry['query'] for entry in response.data['results']]
+        assert len(queries) == 3
+        assert queries[0] == "Meloxicam and prednisolone together with meloxicam overdose"
+        assert "Fever in cats" not in queries
+
+    def test_web_search_syntax(self, authenticated_client, searchable_entries):
+        """Test that quoted phrases and excluded words are supported."""
+        response = authenticated_client.get(reverse('search-history-list'), {'q': 'meloxicam -dog "drug interaction"'})
+
+        assert [entry['query'] for entry in response.data['results']] == [
+            "Drug interaction query with drugs: meloxicam, prednisolone"
+        ]
+
+    def test_combines_with_module_filter(self, authenticated_client, user, searchable_entries):
+        """Test that q narrows the module and date filters instead of replacing them."""
+        UserSearchHistory.objects.create(module='treatment-guide', query="meloxicam for arthritis", created_by=user)
+
+        response = authenticated_client.get(reverse('search-history-list'), {'q': 'meloxicam', 'module': 'treatment-guide'})
+
+        assert [entry['query'] for entry in response.data['results']] == ["meloxicam for arthritis"]
+
+    def test_cursor_pagination_walks_ranked_results(self, authenticated_client, user):
+        """Test that cursor pages over equally and differently ranked matches cover each entry once."""
+        for i in range(25):
+            UserSearchHistory.objects.create(
+                module='treatment-guide', query="fever " * (1 + i % 3) + str(i), created_by=user
+            )
+        url = reverse('search-history-list')
+        response = authenticated_client.get(url, {'q': 'fever', 'pagination': 'cursor'})
+        seen = []
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(entry['id'] for entry in response.data['results'])
+            if not response.data['next']:
+                break
+            response = authenticated_client.get(response.data['next'])
+
+        assert len(seen) == len(set(seen)) == 25
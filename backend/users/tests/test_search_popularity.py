@@ -0,0 +1,120 @@
+import importlib
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from users.models import SearchQueryPopularity, UserSearchHistory
+from users.services.search_history_buffer import write_entries
+from users.services import search_history_partitions
+from users.services.search_popularity import query_digest
+
+pytestmark = pytest.mark.integration
+
+popularity_migration = importlib.import_module('users.migrations.0004_search_query_popularity')
+
+
+def entry(user, query="fever", module='treatment-guide'):
+    return UserSearchHistory(module=module, query=query, created_by=user)
+
+
+def counts(**filters):
+    return dict(SearchQueryPopularity.objects.filter(**filters).values_list('query', 'hit_count'))
+
+
+@pytest.mark.django_db
+class TestSearchPopularity:
+    def test_history_writes_update_user_and_global_rollups(self, user, admin_user):
+        """Test that every written entry counts towards its user's and the global rollup."""
+        write_entries([entry(user), entry(user), entry(user, "cough"), entry(admin_user)], window=60)
+        write_entries([entry(user)], window=60)
+
+        assert counts(user=user) == {'fever': 3, 'cough': 1}
+        assert counts(user=admin_user) == {'fever': 1}
+        assert counts(user__isnull=True) == {'fever': 4, 'cough': 1}
+        fever = SearchQueryPopularity.objects.get(user__isnull=True, query="fever")
+        assert fever.user_count == 2
+        assert fever.query_digest == query_digest("fever")
+        assert set(SearchQueryPopularity.objects.filter(user__isnull=False).values_list('user_count', flat=True)) == {0}
+
+    def test_modules_are_counted_separately(self, user):
+        """Test that the same query in two modules has its own rollup rows."""
+        write_entries([entry(user), entry(user, module='drug-interaction')], window=0)
+
+        assert SearchQueryPopularity.objects.filter(user__isnull=True).count() == 2
+
+    def test_backfill_seeds_rollups_from_history(self, user, admin_user):
+        """Test that the migration backfill aggregates existing history per user and globally."""
+        write_entries([entry(user), entry(user), entry(admin_user), entry(admin_user, "cough")], window=60)
+        SearchQueryPopularity.objects.all().delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(popularity_migration.BACKFILL_SQL)
+
+        assert counts(user=user) == {'fever': 2}
+        assert counts(user__isnull=True) == {'fever': 3, 'cough': 1}
+        assert SearchQueryPopularity.objects.get(user__isnull=True, query="fever").user_count == 2
+
+    def test_retention_prunes_expired_rollups(self, user, admin_user, settings):
+        """Test that history maintenance deletes rollups last seen before the cutoff and recounts global users."""
+        settings.SEARCH_HISTORY_RETENTION_MONTHS = 12
+        write_entries([entry(user), entry(admin_user), entry(admin_user, "cough")], window=60)
+        expired = search_history_partitions.retention_cutoff() - timedelta(days=1)
+        SearchQueryPopularity.objects.filter(user=user).update(last_seen=expired)
+        SearchQueryPopularity.objects.filter(user__isnull=True, query="cough").update(last_seen=expired)
+
+        search_history_partitions.drop_expired_partitions()
+
+        assert counts(user=user) == {}
+        assert counts(user=admin_user) == {'fever': 1, 'cough': 1}
+        assert counts(user__isnull=True) == {'fever': 2}
+        assert SearchQueryPopularity.objects.get(user__isnull=True, query="fever").user_count == 1
+
+    def test_deleted_users_are_recounted(self, user, admin_user):
+        """Test that pruning recounts global users after a user's rollups were deleted with the account."""
+        write_entries([entry(user), entry(admin_user)], window=60)
+        SearchQueryPopularity.objects.filter(user=user).delete()
+
+        search_history_partitions.drop_expired_partitions()
+
+        assert SearchQueryPopularity.objects.get(user__isnull=True, query="fever").user_count == 1
+
+
+@pytest.mark.django_db
+class TestTopQueriesView:
+    url = reverse('search-history-top')
+
+    def test_returns_users_most_frequent_queries(self, authenticated_client, user, admin_user):
+        """Test that the default scope lists the user's own queries, most frequent first."""
+        write_entries([entry(user, "cough"), entry(user), entry(user), entry(admin_user, "vomiting")], window=60)
+
+        response = authenticated_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [(row['query'], row['hit_count']) for row in response.data['results']] == [('fever', 2), ('cough', 1)]
+
+    def test_module_filter_and_limit(self, authenticated_client, user):
+        """Test that module and limit narrow the results."""
+        write_entries([entry(user), entry(user, "cough"), entry(user, "aspirin", 'drug-interaction')], window=60)
+
+        response = authenticated_client.get(self.url, {'module': 'treatment-guide', 'limit': 1})
+
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['module'] == 'treatment-guide'
+
+    @override_settings(SEARCH_POPULARITY_GLOBAL_MIN_USERS=2)
+    def test_global_scope_hides_queries_of_too_few_users(self, authenticated_client, user, admin_user):
+        """Test that global results only include queries searched by enough distinct users."""
+        write_entries([entry(user), entry(admin_user), entry(user, "private"), entry(user, "private")], window=60)
+
+        response = authenticated_client.get(self.url, {'scope': 'global'})
+
+        assert [row['query'] for row in response.data['results']] == ['fever']
+
+    @pytest.mark.parametrize('params', [{'limit': 0}, {'limit': 'many'}, {'scope': 'team'}])
+    def test_invalid_parameters(self, authenticated_client, params):
+        """Test that invalid limit and scope values are rejected."""
+        response = authenticated_client.get(self.url, params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
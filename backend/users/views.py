@@ -1,15 +1,21 @@
 import logging
 from datetime import datetime
+from django.conf import settings
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
 from rest_framework.request import Request
 from rest_framework.response import Response 
 from rest_framework import status
 from django.db.models import QuerySet
 from django.utils.decorators import method_decorator
+from common.fast_read import FastListMixin
 from common.metrics import track_metrics
 from common.utils import PaginatedResponse
 from users.filters import UserSearchHistoryFilter
 from .models import UserSearchHistory
+from .services import search_history_partitions, search_popularity
+from .services.search_history_search import SEARCH_ORDERING
 from .serializers import UserSearchHistorySerializer, UserSerializer
 from rest_framework.mixins import ListModelMixin
 from rest_framework.viewsets import GenericViewSet
@@ -24,28 +30,63 @@ from django.contrib.auth import authenticate, login, logout
 logger = logging.getLogger('users')
 
 @method_decorator(track_metrics('search_history_list'), name='list')
-class SearchHistoryListView(GenericViewSet, ListModelMixin):
+class SearchHistoryListView(FastListMixin, GenericViewSet, ListModelMixin):
     """
     API endpoint for retrieving a paginated list of user's search history.
     Returns only search history for the authenticated user.
     Uses Row Level Security via UserSearchHistoryManager.
+    Rows are built by the fast read path unless FAST_READ_PATH is disabled.
+    `?q=` runs a full-text search over the queries, ranked best match first.
     """
     serializer_class = UserSearchHistorySerializer
-    # filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend]
     filterset_class = UserSearchHistoryFilter
 
+    @property
+    def cursor_ordering(self):
+        request = getattr(self, 'request', None)
+        if request is not None and request.query_params.get('q', '').strip():
+            return SEARCH_ORDERING
+        return ('-created_at', '-id')
+
     def get_queryset(self) -> QuerySet:
         """
         Override the default queryset to filter by the authenticated user.
         This ensures that users can only see their own search history.
         """
         user = self.request.user
+        # Bounding created_at to the retention window lets PostgreSQL prune older partitions
+        recent = UserSearchHistory.objects.filter(created_at__gte=search_history_partitions.retention_cutoff())
         if user.is_superuser:
-            return UserSearchHistory.objects.order_by('-created_at')
+            return recent.order_by('-created_at')
         if user.is_authenticated:
-            return UserSearchHistory.objects.filter(created_by=user).order_by('-created_at')
+            return recent.filter(created_by=user).order_by('-created_at')
         return UserSearchHistory.objects.none()
 
+    @action(detail=False, methods=['get'], url_path='top')
+    @method_decorator(track_metrics('search_history_top'))
+    def top(self, request: Request) -> Response:
+        """
+        Return the user's most frequent queries, or everyone's with `scope=global`,
+        optionally for one `module`. Served from the precomputed popularity rollups.
+        """
+        scope = request.query_params.get('scope', 'user')
+        if scope not in ('user', 'global'):
+            raise ValidationError({'scope': "Scope must be 'user' or 'global'"})
+        try:
+            limit = int(request.query_params.get('limit', settings.SEARCH_POPULARITY_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'Limit must be a valid number'})
+        if limit < 1 or limit > settings.SEARCH_POPULARITY_MAX_LIMIT:
+            raise ValidationError({'limit': f'Limit must be between 1 and {settings.SEARCH_POPULARITY_MAX_LIMIT}'})
+
+        results = search_popularity.top_queries(
+            user=request.user if scope == 'user' else None,
+            module=request.query_params.get('module'),
+            limit=limit,
+        )
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
 class RegisterView(APIView):
     permission_classes = [] 
     def post(self, request):